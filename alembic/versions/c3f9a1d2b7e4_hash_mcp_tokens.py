@@ -0,0 +1,43 @@
+"""hash_mcp_tokens
+
+Revision ID: c3f9a1d2b7e4
+Revises: 78df465a4bd3
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a1d2b7e4'
+down_revision: Union[str, None] = '78df465a4bd3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema to look MCP tokens up by SHA-256 hash instead of raw value."""
+    op.add_column('mcp_tokens', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_mcp_tokens_token_hash'), 'mcp_tokens', ['token_hash'], unique=True)
+    
+    # Hash existing tokens and drop their raw values
+    connection = op.get_bind()
+    mcp_tokens = sa.table('mcp_tokens', sa.column('id', sa.Integer), sa.column('token', sa.String),
+                          sa.column('token_hash', sa.String))
+    rows = connection.execute(sa.select(mcp_tokens.c.id, mcp_tokens.c.token).where(mcp_tokens.c.token.isnot(None)))
+    for token_id, token in rows.fetchall():
+        connection.execute(
+            mcp_tokens.update()
+            .where(mcp_tokens.c.id == token_id)
+            .values(token_hash=hashlib.sha256(token.encode()).hexdigest(), token=None)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema by dropping MCP token hashes; hashed-only tokens stop working."""
+    op.drop_index(op.f('ix_mcp_tokens_token_hash'), table_name='mcp_tokens')
+    op.drop_column('mcp_tokens', 'token_hash')
@@ -0,0 +1,81 @@
+import os
+import logging
+from typing import Callable, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Bounds for cached per-user app availability
+AVAILABILITY_CACHE_TTL = float(os.getenv("AVAILABILITY_CACHE_TTL", "60"))
+AVAILABILITY_CACHE_MAX_ENTRIES = int(os.getenv("AVAILABILITY_CACHE_MAX_ENTRIES", "10000"))
+
+# Credential-availability probes keyed by app name
+CREDENTIAL_PROBES: Dict[str, Callable] = {}
+
+# App availability keyed by user ID
+availability_cache = LRUCache(max_entries=AVAILABILITY_CACHE_MAX_ENTRIES, ttl=AVAILABILITY_CACHE_TTL)
+
+
+def register_credential_probe(app_name: str, probe: Callable) -> None:
+    """Register how to tell whether a user can use an app
+
+    Args:
+        app_name (str): The name of the app
+        probe (Callable): Function taking a user ID and returning a SQL
+            boolean expression, usually an EXISTS over the app's credentials
+    """
+    CREDENTIAL_PROBES[app_name] = probe
+    availability_cache.clear()
+
+
+async def get_app_availability(db: AsyncSession, user_id: int) -> Dict[str, bool]:
+    """Get whether the user has usable credentials for each registered app
+
+    Every app is checked in one query, and the result is cached per user.
+
+    Args:
+        db (AsyncSession): Database session
+        user_id (int): User ID
+
+    Returns:
+        Dict[str, bool]: Availability keyed by app name
+    """
+    availability = availability_cache.get(user_id)
+    if availability is not None:
+        return availability
+
+    probes = dict(CREDENTIAL_PROBES)
+    if not probes:
+        return {}
+    result = await db.execute(select(*(probe(user_id).label(app) for app, probe in probes.items())))
+    row = result.one()
+    availability = {app: bool(value) for app, value in zip(probes, row)}
+    availability_cache.set(user_id, availability)
+    return availability
+
+
+async def get_available_app_names(db: AsyncSession, user_id: int) -> List[str]:
+    """Get the names of the apps the user has usable credentials for
+
+    Args:
+        db (AsyncSession): Database session
+        user_id (int): User ID
+
+    Returns:
+        List[str]: App names in registration order
+    """
+    availability = await get_app_availability(db, user_id)
+    return [app for app, available in availability.items() if available]
+
+
+def invalidate_availability(user_id: int) -> None:
+    """Drop a user's cached availability, e.g. after they connect an app
+
+    Args:
+        user_id (int): User ID
+    """
+    availability_cache.pop(user_id)
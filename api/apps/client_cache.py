@@ -0,0 +1,162 @@
+import os
+import asyncio
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Bounds for cached, authenticated app clients
+CLIENT_CACHE_TTL = float(os.getenv("CLIENT_CACHE_TTL", "300"))
+CLIENT_CACHE_MAX_ENTRIES = int(os.getenv("CLIENT_CACHE_MAX_ENTRIES", "10000"))
+
+# Seconds between checks for credentials changed by other processes; bounds how long they use stale clients
+CLIENT_CACHE_CHECK_INTERVAL = float(os.getenv("CLIENT_CACHE_CHECK_INTERVAL", "5"))
+
+# User IDs looked up per credential check query
+_CHECK_CHUNK = 500
+
+# Authenticated app clients keyed by (app name, user ID), shared across requests
+client_cache = LRUCache(max_entries=CLIENT_CACHE_MAX_ENTRIES, ttl=CLIENT_CACHE_TTL)
+
+# Credential token queries keyed by app name
+CREDENTIAL_QUERIES: Dict[str, Callable] = {}
+
+_check_task: Optional[asyncio.Task] = None
+
+
+def register_credential_query(app_name: str, query: Callable) -> None:
+    """Register how to read the access tokens of an app's stored credentials
+
+    Args:
+        app_name (str): The name of the app
+        query (Callable): Function taking a list of user IDs and returning a
+            SELECT of (user_id, access_token) over the app's credentials
+    """
+    CREDENTIAL_QUERIES[app_name] = query
+
+
+def get_cached_client(app_name: str, user_id: int) -> Optional[Any]:
+    """Get a user's cached client for an app
+
+    Args:
+        app_name (str): The name of the app
+        user_id (int): User ID
+
+    Returns:
+        Optional[Any]: The client, or None if it must be built from stored credentials
+    """
+    return client_cache.get((app_name, user_id))
+
+
+def cache_client(app_name: str, user_id: int, client: Any) -> Any:
+    """Cache a user's client for an app
+
+    Args:
+        app_name (str): The name of the app
+        user_id (int): User ID
+        client (Any): Client authenticated with the user's credentials
+
+    Returns:
+        Any: The cached client
+    """
+    client_cache.set((app_name, user_id), client)
+    return client
+
+
+def credential_key(access_token: str) -> str:
+    """Get the non-secret identifier clients expose for their access token"""
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+async def sync_clients(db: AsyncSession) -> int:
+    """Drop cached clients whose credentials were changed or removed, possibly by another process
+
+    :func:`invalidate_client` only reaches the process that handled the
+    reconnect. Each cached client's ``credential_key`` is compared with
+    the stored token, one query per app, so other processes stop using the
+    old credential. Result cache entries are keyed by the credential too,
+    so they stop matching along with the client.
+
+    Args:
+        db (AsyncSession): Database session
+
+    Returns:
+        int: Number of clients dropped
+    """
+    by_app: Dict[str, Dict[int, Optional[str]]] = {}
+    for (app_name, user_id), client in client_cache.items():
+        if app_name in CREDENTIAL_QUERIES:
+            by_app.setdefault(app_name, {})[user_id] = getattr(client, "credential_key", None)
+
+    dropped = 0
+    for app_name, cached in by_app.items():
+        user_ids: List[int] = list(cached)
+        stored: Dict[int, str] = {}
+        for start in range(0, len(user_ids), _CHECK_CHUNK):
+            result = await db.execute(CREDENTIAL_QUERIES[app_name](user_ids[start:start + _CHECK_CHUNK]))
+            stored.update({user_id: token for user_id, token in result})
+        for user_id, key in cached.items():
+            token = stored.get(user_id)
+            if token is None or key != credential_key(token):
+                client_cache.pop((app_name, user_id))
+                dropped += 1
+    if dropped:
+        logger.info(f"Dropped {dropped} cached clients with changed credentials")
+    return dropped
+
+
+async def _run_checks(interval: float) -> None:
+    """Check cached clients against stored credentials until cancelled"""
+    from api import database
+    while True:
+        await asyncio.sleep(interval)
+        if not len(client_cache):
+            continue
+        try:
+            async with database.AsyncSessionLocal() as db:
+                await sync_clients(db)
+        except Exception as e:
+            logger.error(f"Failed to check cached client credentials: {str(e)}")
+
+
+def start_credential_checks(interval: float = CLIENT_CACHE_CHECK_INTERVAL) -> None:
+    """Start periodic credential checks on the running event loop"""
+    global _check_task
+    if _check_task is None or _check_task.done():
+        _check_task = asyncio.get_running_loop().create_task(_run_checks(interval))
+
+
+async def stop_credential_checks() -> None:
+    """Stop periodic credential checks"""
+    global _check_task
+    if _check_task is not None:
+        _check_task.cancel()
+        try:
+            await _check_task
+        except asyncio.CancelledError:
+            pass
+        _check_task = None
+
+
+def invalidate_client(app_name: str, user_id: int) -> None:
+    """Drop a user's cached client, e.g. after they reconnect the app
+
+    Other processes drop theirs within CLIENT_CACHE_CHECK_INTERVAL through
+    :func:`sync_clients`.
+
+    Args:
+        app_name (str): The name of the app
+        user_id (int): User ID
+    """
+    if client_cache.pop((app_name, user_id)) is not None:
+        logger.info(f"Invalidated cached {app_name} client for user {user_id}")
+
+
+def stats() -> Dict[str, int]:
+    """Get cache counters for metrics"""
+    return client_cache.stats()
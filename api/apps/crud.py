@@ -1,13 +1,22 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import os
+from sqlalchemy import distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Dict, List, Optional
 from datetime import datetime
 
-from api.models import App, User
+from api.cache import LRUCache
+from api.models import App, Tool, User
 from api.schemas import AppCreate
 
-def get_app(db: Session, app_id: int) -> Optional[App]:
+# Per-user app and tool counts shown on the dashboard
+APP_STATS_CACHE_TTL = float(os.getenv("APP_STATS_CACHE_TTL", "300"))
+app_stats_cache = LRUCache(max_entries=10000, ttl=APP_STATS_CACHE_TTL)
+
+async def get_app(db: AsyncSession, app_id: int) -> Optional[App]:
     """Get app by ID."""
-    return db.query(App).filter(App.id == app_id).first()
+    result = await db.execute(select(App).options(selectinload(App.tools)).filter(App.id == app_id))
+    return result.scalars().first()
 
 def get_available_apps() -> List[dict]:
     """Get list of all available apps that can be registered.
@@ -33,11 +42,14 @@ def get_available_apps() -> List[dict]:
         }
     ]
 
-def get_user_apps(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[App]:
+async def get_user_apps(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[App]:
     """Get all apps registered by a specific user."""
-    return db.query(App).filter(App.owner_id == user_id).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(App).options(selectinload(App.tools)).filter(App.owner_id == user_id).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
 
-def create_app(db: Session, app: AppCreate, user_id: int) -> App:
+async def create_app(db: AsyncSession, app: AppCreate, user_id: int) -> App:
     """Create a new app registration for a user."""
     db_app = App(
         name=app.name,
@@ -47,13 +59,16 @@ def create_app(db: Session, app: AppCreate, user_id: int) -> App:
         created_at=datetime.now()
     )
     db.add(db_app)
-    db.commit()
-    db.refresh(db_app)
+    await db.commit()
+    await db.refresh(db_app)
+    await db.refresh(db_app, attribute_names=["tools"])
+    invalidate_user_app_stats(user_id)
     return db_app
 
-def update_app(db: Session, app_id: int, user_id: int, app_data: dict) -> Optional[App]:
+async def update_app(db: AsyncSession, app_id: int, user_id: int, app_data: dict) -> Optional[App]:
     """Update an existing app."""
-    db_app = db.query(App).filter(App.id == app_id, App.owner_id == user_id).first()
+    result = await db.execute(select(App).filter(App.id == app_id, App.owner_id == user_id))
+    db_app = result.scalars().first()
     if not db_app:
         return None
     
@@ -63,20 +78,48 @@ def update_app(db: Session, app_id: int, user_id: int, app_data: dict) -> Option
             setattr(db_app, key, value)
     
     db_app.updated_at = datetime.now()
-    db.commit()
-    db.refresh(db_app)
+    await db.commit()
+    await db.refresh(db_app)
+    invalidate_user_app_stats(user_id)
     return db_app
 
-def delete_app(db: Session, app_id: int, user_id: int) -> bool:
+async def delete_app(db: AsyncSession, app_id: int, user_id: int) -> bool:
     """Delete an app registration."""
-    db_app = db.query(App).filter(App.id == app_id, App.owner_id == user_id).first()
+    result = await db.execute(select(App).filter(App.id == app_id, App.owner_id == user_id))
+    db_app = result.scalars().first()
     if not db_app:
         return False
     
-    db.delete(db_app)
-    db.commit()
+    await db.delete(db_app)
+    await db.commit()
+    invalidate_user_app_stats(user_id)
     return True
 
-def check_user_has_app(db: Session, user_id: int, app_name: str) -> bool:
+async def check_user_has_app(db: AsyncSession, user_id: int, app_name: str) -> bool:
     """Check if a user has a specific app registered by name."""
-    return db.query(App).filter(App.owner_id == user_id, App.name == app_name).first() is not None
+    result = await db.execute(select(App.id).filter(App.owner_id == user_id, App.name == app_name).limit(1))
+    return result.first() is not None
+
+async def get_user_app_stats(db: AsyncSession, user_id: int) -> Dict[str, int]:
+    """Count a user's registered apps and their tools in one query.
+    
+    Counts are cached per user until the user's apps or tools change.
+    """
+    stats = app_stats_cache.get(user_id)
+    if stats is not None:
+        return stats
+    
+    result = await db.execute(
+        select(func.count(distinct(App.id)), func.count(Tool.id))
+        .select_from(App)
+        .outerjoin(Tool, Tool.app_id == App.id)
+        .filter(App.owner_id == user_id)
+    )
+    apps, tools = result.one()
+    stats = {"apps": apps, "tools": tools}
+    app_stats_cache.set(user_id, stats)
+    return stats
+
+def invalidate_user_app_stats(user_id: int) -> None:
+    """Drop a user's cached app stats; call after adding, changing or removing apps or tools."""
+    app_stats_cache.pop(user_id)
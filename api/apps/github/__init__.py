@@ -1 +1,19 @@
 # This file makes api/apps/github a Python package
+
+
+def register():
+    """Register GitHub tools, handler factory and credential lookups with the tools router"""
+    from api.routers.tools import register_app_handler
+    from .tools import GITHUB_TOOLS, create_github_handler
+    from .utils import github_credential_probe, github_credential_query
+
+    register_app_handler(
+        "github", create_github_handler, tools=GITHUB_TOOLS, credential_probe=github_credential_probe,
+        credential_query=github_credential_query,
+    )
+
+
+def get_router():
+    """Get the router for the GitHub app's own endpoints"""
+    from .routes import router
+    return router
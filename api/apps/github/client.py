@@ -1,70 +1,224 @@
-import requests
+import os
+import httpx
+import hashlib
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+from api.apps.http import get_http_client
+from api.cache import LRUCache
+from api.metrics import metrics
+from api.progress import PageProgress
 
 logger = logging.getLogger(__name__)
 
+# Memory budget for cached GET bodies kept for conditional requests
+GITHUB_ETAG_CACHE_BYTES = int(float(os.getenv("GITHUB_ETAG_CACHE_MB", "64")) * 1024 * 1024)
+
+# Response headers replayed when a cached body is served on 304 Not Modified
+_REPLAYED_HEADERS = ("content-type", "link", "etag", "last-modified")
+
+# Process-wide validator cache; keys include a hash of the credential
+etag_cache = LRUCache(max_entries=100_000, max_size=GITHUB_ETAG_CACHE_BYTES)
+
+# Marker for the default validator_cache argument
+_DEFAULT = object()
+
 class GitHubClient:
     """Client for interacting with GitHub API"""
     BASE_URL = "https://api.github.com"
     
-    def __init__(self, access_token: str):
+    # Largest page size GitHub accepts for list endpoints
+    MAX_PAGE_SIZE = 100
+    
+    def __init__(self, access_token: str, http_client: Optional[httpx.AsyncClient] = None, validator_cache=_DEFAULT):
         """Initialize GitHub client with access token
         
         Args:
             access_token (str): GitHub OAuth access token
+            http_client (Optional[httpx.AsyncClient], optional): HTTP client to use.
+                Defaults to the process-wide shared client.
+            validator_cache (Optional[LRUCache], optional): Cache of validators and bodies used for
+                conditional GET requests. Defaults to the process-wide cache; None disables it.
         """
         self.access_token = access_token
+        self._http_client = http_client
+        self.etag_cache = etag_cache if validator_cache is _DEFAULT else validator_cache
+        self.credential_key = hashlib.sha256(access_token.encode()).hexdigest()
         self.headers = {
             "Authorization": f"Bearer {access_token}",
             "Accept": "application/vnd.github.v3+json"
         }
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make a request to the GitHub API
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP client used for requests, the shared pooled client by default"""
+        return self._http_client or get_http_client(self.BASE_URL)
+    
+    async def _request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send a request to the GitHub API and return the raw response
         
         Args:
             method (str): HTTP method (GET, POST, etc.)
-            endpoint (str): API endpoint path
-            **kwargs: Additional arguments to pass to requests
+            endpoint (str): API endpoint path, or an absolute URL such as a pagination link
+            **kwargs: Additional arguments to pass to httpx
             
         Returns:
-            Dict[str, Any]: JSON response from API
+            httpx.Response: Successful response
             
         Raises:
             Exception: If the request fails
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        url = endpoint if endpoint.startswith("http") else f"{self.BASE_URL}{endpoint}"
+        headers = self.headers
+        cache_key = None
+        cached = None
+        if method.upper() == "GET" and self.etag_cache is not None:
+            cache_key = (self.credential_key, str(httpx.URL(url, params=kwargs.get("params"))))
+            cached = self.etag_cache.get(cache_key)
+            if cached is not None:
+                headers = {**self.headers, **cached["validators"]}
         try:
-            response = requests.request(
+            response = await self.http_client.request(
                 method=method,
                 url=url,
-                headers=self.headers,
+                headers=headers,
                 **kwargs
             )
+            if cached is not None and response.status_code == 304:
+                # Not modified: serve the stored body; 304s do not count against the rate limit
+                metrics.increment("github_etag_revalidated")
+                return httpx.Response(
+                    200,
+                    headers=cached["headers"],
+                    content=cached["content"],
+                    request=response.request
+                )
             response.raise_for_status()
-            return response.json() if response.content else {}
-        except requests.exceptions.RequestException as e:
+            if cache_key is not None and response.status_code == 200:
+                self._store_validators(cache_key, response)
+            return response
+        except httpx.HTTPError as e:
             logger.error(f"GitHub API request failed: {e}")
             raise
     
-    def get_user(self) -> Dict[str, Any]:
+    def _store_validators(self, cache_key: tuple, response: httpx.Response) -> None:
+        """Store a GET response's ETag / Last-Modified validators and body
+        
+        Args:
+            cache_key (tuple): Credential hash and full request URL
+            response (httpx.Response): Successful GET response
+        """
+        validators = {}
+        if response.headers.get("etag"):
+            validators["If-None-Match"] = response.headers["etag"]
+        if response.headers.get("last-modified"):
+            validators["If-Modified-Since"] = response.headers["last-modified"]
+        if not validators:
+            self.etag_cache.pop(cache_key)
+            return
+        
+        content = response.content
+        self.etag_cache.set(cache_key, {
+            "validators": validators,
+            "headers": {name: response.headers[name] for name in _REPLAYED_HEADERS if name in response.headers},
+            "content": content
+        }, size=len(content))
+    
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make a request to the GitHub API
+        
+        Args:
+            method (str): HTTP method (GET, POST, etc.)
+            endpoint (str): API endpoint path
+            **kwargs: Additional arguments to pass to httpx
+            
+        Returns:
+            Dict[str, Any]: JSON response from API
+            
+        Raises:
+            Exception: If the request fails
+        """
+        response = await self._request(method, endpoint, **kwargs)
+        return response.json() if response.content else {}
+    
+    async def paginate(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                       page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate over the pages of a GitHub list endpoint
+        
+        Follows the ``next`` relation of the ``Link`` header until the last
+        page or until ``max_items`` items have been yielded.
+        
+        Args:
+            endpoint (str): API endpoint path
+            params (Optional[Dict[str, Any]], optional): Query parameters for the first page
+            page_size (int, optional): Items per page (at most 100). Defaults to 100.
+            max_items (Optional[int], optional): Stop after this many items. Defaults to no limit.
+            
+        Yields:
+            List[Dict[str, Any]]: Items of each page
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        if max_items is not None:
+            page_size = min(page_size, max_items)
+        url = endpoint
+        request_params = {**(params or {}), "per_page": page_size}
+        remaining = max_items
+        
+        while url and (remaining is None or remaining > 0):
+            response = await self._request("GET", url, params=request_params)
+            items = response.json() if response.content else []
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            if items:
+                yield items
+            
+            # The next link already carries the query string of the first request
+            url = response.links.get("next", {}).get("url")
+            request_params = None
+    
+    async def _collect(self, pages: AsyncIterator[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Collect every item from a page iterator into a single list, reporting progress per page"""
+        items = []
+        progress = PageProgress()
+        async for page in pages:
+            items.extend(page)
+            progress.page(page)
+        return items
+    
+    async def get_user(self) -> Dict[str, Any]:
         """Get authenticated user information
         
         Returns:
             Dict[str, Any]: User information
         """
-        return self._make_request("GET", "/user")
+        return await self._make_request("GET", "/user")
+    
+    def iter_repositories(self, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate over pages of repositories for the authenticated user
+        
+        Args:
+            page_size (int, optional): Items per page. Defaults to 100.
+            max_items (Optional[int], optional): Maximum repositories. Defaults to no limit.
+            
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: Pages of repositories
+        """
+        return self.paginate("/user/repos", page_size=page_size, max_items=max_items)
     
-    def list_repositories(self) -> List[Dict[str, Any]]:
-        """List repositories for the authenticated user
+    async def list_repositories(self, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List repositories for the authenticated user across all pages
         
+        Args:
+            page_size (int, optional): Items per page. Defaults to 100.
+            max_items (Optional[int], optional): Maximum repositories. Defaults to no limit.
+            
         Returns:
             List[Dict[str, Any]]: List of repositories
         """
-        return self._make_request("GET", "/user/repos")
+        return await self._collect(self.iter_repositories(page_size=page_size, max_items=max_items))
     
-    def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
+    async def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
         """Get repository information
         
         Args:
@@ -74,21 +228,37 @@ class GitHubClient:
         Returns:
             Dict[str, Any]: Repository information
         """
-        return self._make_request("GET", f"/repos/{owner}/{repo}")
+        return await self._make_request("GET", f"/repos/{owner}/{repo}")
     
-    def list_issues(self, owner: str, repo: str) -> List[Dict[str, Any]]:
-        """List issues for a repository
+    def iter_issues(self, owner: str, repo: str, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate over pages of issues for a repository
         
         Args:
             owner (str): Repository owner
             repo (str): Repository name
+            page_size (int, optional): Items per page. Defaults to 100.
+            max_items (Optional[int], optional): Maximum issues. Defaults to no limit.
+            
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: Pages of issues
+        """
+        return self.paginate(f"/repos/{owner}/{repo}/issues", page_size=page_size, max_items=max_items)
+    
+    async def list_issues(self, owner: str, repo: str, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List issues for a repository across all pages
+        
+        Args:
+            owner (str): Repository owner
+            repo (str): Repository name
+            page_size (int, optional): Items per page. Defaults to 100.
+            max_items (Optional[int], optional): Maximum issues. Defaults to no limit.
             
         Returns:
             List[Dict[str, Any]]: List of issues
         """
-        return self._make_request("GET", f"/repos/{owner}/{repo}/issues")
+        return await self._collect(self.iter_issues(owner, repo, page_size=page_size, max_items=max_items))
     
-    def create_issue(self, owner: str, repo: str, title: str, body: Optional[str] = None) -> Dict[str, Any]:
+    async def create_issue(self, owner: str, repo: str, title: str, body: Optional[str] = None) -> Dict[str, Any]:
         """Create a new issue
         
         Args:
@@ -104,25 +274,41 @@ class GitHubClient:
         if body:
             data["body"] = body
         
-        return self._make_request(
+        return await self._make_request(
             "POST",
             f"/repos/{owner}/{repo}/issues",
             json=data
         )
     
-    def list_pull_requests(self, owner: str, repo: str) -> List[Dict[str, Any]]:
-        """List pull requests for a repository
+    def iter_pull_requests(self, owner: str, repo: str, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterate over pages of pull requests for a repository
+        
+        Args:
+            owner (str): Repository owner
+            repo (str): Repository name
+            page_size (int, optional): Items per page. Defaults to 100.
+            max_items (Optional[int], optional): Maximum pull requests. Defaults to no limit.
+            
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: Pages of pull requests
+        """
+        return self.paginate(f"/repos/{owner}/{repo}/pulls", page_size=page_size, max_items=max_items)
+    
+    async def list_pull_requests(self, owner: str, repo: str, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List pull requests for a repository across all pages
         
         Args:
             owner (str): Repository owner
             repo (str): Repository name
+            page_size (int, optional): Items per page. Defaults to 100.
+            max_items (Optional[int], optional): Maximum pull requests. Defaults to no limit.
             
         Returns:
             List[Dict[str, Any]]: List of pull requests
         """
-        return self._make_request("GET", f"/repos/{owner}/{repo}/pulls")
+        return await self._collect(self.iter_pull_requests(owner, repo, page_size=page_size, max_items=max_items))
     
-    def create_pull_request(self, owner: str, repo: str, title: str, head: str, base: str, body: Optional[str] = None) -> Dict[str, Any]:
+    async def create_pull_request(self, owner: str, repo: str, title: str, head: str, base: str, body: Optional[str] = None) -> Dict[str, Any]:
         """Create a new pull request
         
         Args:
@@ -144,7 +330,7 @@ class GitHubClient:
         if body:
             data["body"] = body
         
-        return self._make_request(
+        return await self._make_request(
             "POST",
             f"/repos/{owner}/{repo}/pulls",
             json=data
@@ -0,0 +1,374 @@
+import os
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from api.metrics import metrics
+from .client import GitHubClient
+
+logger = logging.getLogger(__name__)
+
+# Opt-in switch and tuning for GraphQL coalescing of GitHub reads
+GITHUB_GRAPHQL_COALESCING = os.getenv("GITHUB_GRAPHQL_COALESCING", "False").lower() == "true"
+GITHUB_COALESCE_WINDOW_MS = float(os.getenv("GITHUB_COALESCE_WINDOW_MS", "5"))
+GITHUB_COALESCE_MAX_BATCH = int(os.getenv("GITHUB_COALESCE_MAX_BATCH", "20"))
+
+# Maximum number of credentials with a live coalescer
+MAX_COALESCERS = 1024
+
+REPOSITORY_FRAGMENT = """
+fragment RepositoryFields on Repository {
+  id databaseId name nameWithOwner description url homepageUrl
+  isPrivate isFork isArchived visibility createdAt updatedAt pushedAt
+  stargazerCount forkCount
+  owner { login }
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  openIssues: issues(states: OPEN) { totalCount }
+}
+"""
+
+ISSUE_FRAGMENT = """
+fragment IssueFields on Issue {
+  id databaseId number title body state url createdAt updatedAt closedAt
+  author { login }
+  labels(first: 20) { nodes { name } }
+  comments { totalCount }
+}
+"""
+
+PULL_REQUEST_FRAGMENT = """
+fragment PullRequestFields on PullRequest {
+  id databaseId number title body state url isDraft
+  createdAt updatedAt closedAt mergedAt headRefName baseRefName
+  author { login }
+}
+"""
+
+
+def _login(actor: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Map a GraphQL actor to the REST ``user`` shape"""
+    return {"login": actor["login"]} if actor else None
+
+
+def repository_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GraphQL Repository node to the REST repository shape
+
+    Args:
+        node (Dict[str, Any]): Repository node selected with RepositoryFields
+
+    Returns:
+        Dict[str, Any]: Repository in the shape returned by GET /repos/{owner}/{repo}
+    """
+    return {
+        "id": node.get("databaseId"),
+        "node_id": node.get("id"),
+        "name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "owner": _login(node.get("owner")),
+        "private": node.get("isPrivate"),
+        "html_url": node.get("url"),
+        "description": node.get("description"),
+        "homepage": node.get("homepageUrl"),
+        "fork": node.get("isFork"),
+        "archived": node.get("isArchived"),
+        "visibility": (node.get("visibility") or "").lower() or None,
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "pushed_at": node.get("pushedAt"),
+        "stargazers_count": node.get("stargazerCount"),
+        "forks_count": node.get("forkCount"),
+        "open_issues_count": (node.get("openIssues") or {}).get("totalCount"),
+        "default_branch": (node.get("defaultBranchRef") or {}).get("name"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+    }
+
+
+def issue_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GraphQL Issue node to the REST issue shape
+
+    Args:
+        node (Dict[str, Any]): Issue node selected with IssueFields
+
+    Returns:
+        Dict[str, Any]: Issue in the shape returned by GET /repos/{owner}/{repo}/issues
+    """
+    return {
+        "id": node.get("databaseId"),
+        "node_id": node.get("id"),
+        "number": node.get("number"),
+        "title": node.get("title"),
+        "body": node.get("body"),
+        "state": (node.get("state") or "").lower(),
+        "html_url": node.get("url"),
+        "user": _login(node.get("author")),
+        "labels": [{"name": label["name"]} for label in (node.get("labels") or {}).get("nodes", [])],
+        "comments": (node.get("comments") or {}).get("totalCount"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "closed_at": node.get("closedAt"),
+    }
+
+
+def pull_request_to_rest(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a GraphQL PullRequest node to the REST pull request shape
+
+    Args:
+        node (Dict[str, Any]): PullRequest node selected with PullRequestFields
+
+    Returns:
+        Dict[str, Any]: Pull request in the shape returned by GET /repos/{owner}/{repo}/pulls
+    """
+    state = (node.get("state") or "").lower()
+    return {
+        "id": node.get("databaseId"),
+        "node_id": node.get("id"),
+        "number": node.get("number"),
+        "title": node.get("title"),
+        "body": node.get("body"),
+        "state": "closed" if state == "merged" else state,
+        "html_url": node.get("url"),
+        "user": _login(node.get("author")),
+        "draft": node.get("isDraft"),
+        "head": {"ref": node.get("headRefName")},
+        "base": {"ref": node.get("baseRefName")},
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "closed_at": node.get("closedAt"),
+        "merged_at": node.get("mergedAt"),
+    }
+
+
+class GraphQLCoalescer:
+    """Merges concurrent GitHub reads for one credential into GraphQL queries
+
+    Reads issued within ``window`` seconds of each other are sent as a
+    single aliased GraphQL v4 query and the result is split back into the
+    REST-shaped dicts GitHubToolHandler returns. List reads only cover open
+    items ordered newest first, matching the REST defaults; unlike REST,
+    issue lists do not include pull requests.
+    """
+
+    # Largest page size GitHub GraphQL connections accept
+    MAX_FIRST = 100
+
+    def __init__(self, client: GitHubClient, window: float = GITHUB_COALESCE_WINDOW_MS / 1000,
+                 max_batch: int = GITHUB_COALESCE_MAX_BATCH):
+        """Initialize the coalescer
+
+        Args:
+            client (GitHubClient): Client used to send GraphQL queries
+            window (float): Seconds to wait for more reads before sending a query
+            max_batch (int): Maximum reads merged into one query
+        """
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks = set()
+
+    async def _enqueue(self, kind: str, args: Dict[str, Any]) -> Any:
+        """Queue a read and wait for the query that carries it"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((kind, args, future))
+        if len(self._pending) >= self.max_batch:
+            batch, self._pending = self._pending, []
+            self._spawn(self._send(batch))
+        elif self._flush_task is None or self._flush_task.get_loop() is not loop:
+            self._flush_task = self._spawn(self._delayed_flush())
+        return await future
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _delayed_flush(self) -> None:
+        """Send pending reads once the coalescing window closes"""
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            await self._send(batch)
+
+    def _build_query(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> Tuple[str, Dict[str, Any]]:
+        """Build one aliased GraphQL query and its variables for a batch"""
+        declarations = []
+        selections = []
+        fragments = set()
+        variables = {}
+        for index, (kind, args, _) in enumerate(batch):
+            alias = f"r{index}"
+            declarations += [f"${alias}_owner: String!", f"${alias}_name: String!"]
+            variables[f"{alias}_owner"] = args["owner"]
+            variables[f"{alias}_name"] = args["repo"]
+            repository = f"{alias}: repository(owner: ${alias}_owner, name: ${alias}_name)"
+            if kind == "repository":
+                fragments.add(REPOSITORY_FRAGMENT)
+                selections.append(f"{repository} {{ ...RepositoryFields }}")
+                continue
+
+            declarations.append(f"${alias}_after: String")
+            variables[f"{alias}_after"] = args.get("after")
+            connection, fragment, fragment_name = (
+                ("issues", ISSUE_FRAGMENT, "IssueFields") if kind == "issues"
+                else ("pullRequests", PULL_REQUEST_FRAGMENT, "PullRequestFields")
+            )
+            fragments.add(fragment)
+            selections.append(
+                f"{repository} {{ {connection}(first: {int(args['first'])}, after: ${alias}_after, "
+                f"states: OPEN, orderBy: {{field: CREATED_AT, direction: DESC}}) "
+                f"{{ pageInfo {{ hasNextPage endCursor }} nodes {{ ...{fragment_name} }} }} }}"
+            )
+
+        query = f"query({', '.join(declarations)}) {{ {' '.join(selections)} }}" + "".join(sorted(fragments))
+        return query, variables
+
+    async def _send(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        """Send a batch as one GraphQL query and resolve each read's future
+
+        Reads cancelled while queued are left out, and the query is aborted
+        if every read waiting on it is cancelled.
+        """
+        batch = [read for read in batch if not read[2].cancelled()]
+        if not batch:
+            return
+        query, variables = self._build_query(batch)
+        metrics.increment("github_graphql_queries")
+        metrics.increment("github_graphql_coalesced_reads", len(batch))
+        request = asyncio.ensure_future(
+            self.client._make_request("POST", "/graphql", json={"query": query, "variables": variables})
+        )
+
+        def abandon(_):
+            if not request.done() and all(future.cancelled() for _, _, future in batch):
+                metrics.increment("github_graphql_queries_abandoned")
+                request.cancel()
+
+        for _, _, future in batch:
+            future.add_done_callback(abandon)
+        try:
+            response = await request
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        data = response.get("data") or {}
+        errors = {}
+        # Errors without a path (rate limits, bad credentials, query too complex) apply to the whole query
+        query_errors = []
+        for error in response.get("errors") or []:
+            path = error.get("path") or []
+            if path:
+                errors[path[0]] = error.get("message", "GraphQL error")
+            else:
+                query_errors.append(error.get("message", "GraphQL error"))
+
+        for index, (kind, args, future) in enumerate(batch):
+            if future.done():
+                continue
+            alias = f"r{index}"
+            node = data.get(alias)
+            if alias in errors or node is None:
+                if alias in errors:
+                    message = errors[alias]
+                elif query_errors:
+                    message = "; ".join(query_errors)
+                else:
+                    message = f"Repository {args['owner']}/{args['repo']} not found"
+                future.set_exception(Exception(f"GitHub GraphQL error: {message}"))
+            elif kind == "repository":
+                future.set_result(repository_to_rest(node))
+            else:
+                connection = node["issues"] if kind == "issues" else node["pullRequests"]
+                mapper = issue_to_rest if kind == "issues" else pull_request_to_rest
+                future.set_result((
+                    [mapper(item) for item in connection.get("nodes", [])],
+                    connection.get("pageInfo", {})
+                ))
+
+    async def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
+        """Get repository information through a coalesced query
+
+        Args:
+            owner (str): Repository owner
+            repo (str): Repository name
+
+        Returns:
+            Dict[str, Any]: REST-shaped repository information
+        """
+        return await self._enqueue("repository", {"owner": owner, "repo": repo})
+
+    async def _list(self, kind: str, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
+        """Collect open issues or pull requests page by page through coalesced queries"""
+        items = []
+        after = None
+        while len(items) < max_items:
+            first = min(self.MAX_FIRST, max_items - len(items))
+            page, page_info = await self._enqueue(kind, {"owner": owner, "repo": repo, "first": first, "after": after})
+            items.extend(page)
+            if not page_info.get("hasNextPage"):
+                break
+            after = page_info.get("endCursor")
+        return items
+
+    async def list_issues(self, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
+        """List open issues for a repository through coalesced queries
+
+        Args:
+            owner (str): Repository owner
+            repo (str): Repository name
+            max_items (int): Maximum issues to return
+
+        Returns:
+            List[Dict[str, Any]]: REST-shaped issues
+        """
+        return await self._list("issues", owner, repo, max_items)
+
+    async def list_pull_requests(self, owner: str, repo: str, max_items: int) -> List[Dict[str, Any]]:
+        """List open pull requests for a repository through coalesced queries
+
+        Args:
+            owner (str): Repository owner
+            repo (str): Repository name
+            max_items (int): Maximum pull requests to return
+
+        Returns:
+            List[Dict[str, Any]]: REST-shaped pull requests
+        """
+        return await self._list("pull_requests", owner, repo, max_items)
+
+
+# Coalescers shared by every handler using the same credential
+_coalescers: "OrderedDict[str, GraphQLCoalescer]" = OrderedDict()
+
+
+def get_coalescer(client: GitHubClient) -> GraphQLCoalescer:
+    """Get the shared coalescer for a client's credential
+
+    Args:
+        client (GitHubClient): Client for the credential
+
+    Returns:
+        GraphQLCoalescer: Coalescer shared by every request using the credential
+    """
+    key = hashlib.sha256(client.access_token.encode()).hexdigest()
+    coalescer = _coalescers.get(key)
+    if coalescer is None:
+        coalescer = GraphQLCoalescer(client)
+        _coalescers[key] = coalescer
+        if len(_coalescers) > MAX_COALESCERS:
+            _coalescers.popitem(last=False)
+    else:
+        _coalescers.move_to_end(key)
+    return coalescer
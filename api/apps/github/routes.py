@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 import logging
@@ -9,6 +9,11 @@ from api.models import User
 from .models import GitHubCredential
 from .schemas import GitHubCredentialCreate, GitHubCredential as GitHubCredentialSchema
 from .client import GitHubClient
+from .tools import DEFAULT_MAX_ITEMS
+
+from api.apps.availability import invalidate_availability
+from api.apps.client_cache import get_cached_client, cache_client, invalidate_client
+from api.tool_cache import tool_result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,10 @@ def get_github_client(db: Session = Depends(get_db), current_user: User = Depend
     Raises:
         HTTPException: If GitHub credentials are not found
     """
+    client = get_cached_client("github", current_user.id)
+    if client is not None:
+        return client
+    
     credentials = db.query(GitHubCredential).filter(GitHubCredential.user_id == current_user.id).first()
     
     if not credentials:
@@ -40,7 +49,7 @@ def get_github_client(db: Session = Depends(get_db), current_user: User = Depend
             detail="GitHub credentials not found. Please connect your GitHub account."
         )
     
-    return GitHubClient(credentials.access_token)
+    return cache_client("github", current_user.id, GitHubClient(credentials.access_token))
 
 
 @router.post("/connect", response_model=GitHubCredentialSchema)
@@ -65,6 +74,9 @@ def connect_github(credentials: GitHubCredentialCreate, db: Session = Depends(ge
         existing_credentials.scope = credentials.scope
         db.commit()
         db.refresh(existing_credentials)
+        invalidate_client("github", current_user.id)
+        invalidate_availability(current_user.id)
+        tool_result_cache.invalidate(current_user.id, "github")
         return existing_credentials
     
     # Create new credentials
@@ -79,22 +91,29 @@ def connect_github(credentials: GitHubCredentialCreate, db: Session = Depends(ge
     db.add(db_credentials)
     db.commit()
     db.refresh(db_credentials)
+    invalidate_client("github", current_user.id)
+    invalidate_availability(current_user.id)
+    tool_result_cache.invalidate(current_user.id, "github")
     
     return db_credentials
 
 
 @router.get("/repositories")
-def list_repositories(github_client: GitHubClient = Depends(get_github_client)):
+async def list_repositories(
+    max_items: int = Query(DEFAULT_MAX_ITEMS, ge=1),
+    github_client: GitHubClient = Depends(get_github_client)
+):
     """List repositories for the authenticated GitHub user.
     
     Args:
+        max_items (int): Maximum repositories to fetch across pages. Defaults to DEFAULT_MAX_ITEMS.
         github_client (GitHubClient): Authenticated GitHub client
         
     Returns:
         Dict[str, Any]: List of repositories
     """
     try:
-        repos = github_client.list_repositories()
+        repos = await github_client.list_repositories(max_items=max_items)
         return {"repositories": repos}
     except Exception as e:
         logger.error(f"Error listing GitHub repositories: {e}")
@@ -105,7 +124,7 @@ def list_repositories(github_client: GitHubClient = Depends(get_github_client)):
 
 
 @router.get("/user")
-def get_user(github_client: GitHubClient = Depends(get_github_client)):
+async def get_user(github_client: GitHubClient = Depends(get_github_client)):
     """Get authenticated GitHub user information.
     
     Args:
@@ -115,7 +134,7 @@ def get_user(github_client: GitHubClient = Depends(get_github_client)):
         Dict[str, Any]: User information
     """
     try:
-        user = github_client.get_user()
+        user = await github_client.get_user()
         return user
     except Exception as e:
         logger.error(f"Error getting GitHub user: {e}")
@@ -126,19 +145,25 @@ def get_user(github_client: GitHubClient = Depends(get_github_client)):
 
 
 @router.get("/repositories/{owner}/{repo}/issues")
-def list_issues(owner: str, repo: str, github_client: GitHubClient = Depends(get_github_client)):
+async def list_issues(
+    owner: str,
+    repo: str,
+    max_items: int = Query(DEFAULT_MAX_ITEMS, ge=1),
+    github_client: GitHubClient = Depends(get_github_client)
+):
     """List issues for a GitHub repository.
     
     Args:
         owner (str): Repository owner
         repo (str): Repository name
+        max_items (int): Maximum issues to fetch across pages. Defaults to DEFAULT_MAX_ITEMS.
         github_client (GitHubClient): Authenticated GitHub client
         
     Returns:
         Dict[str, Any]: List of issues
     """
     try:
-        issues = github_client.list_issues(owner, repo)
+        issues = await github_client.list_issues(owner, repo, max_items=max_items)
         return {"issues": issues}
     except Exception as e:
         logger.error(f"Error listing GitHub issues: {e}")
@@ -149,7 +174,7 @@ def list_issues(owner: str, repo: str, github_client: GitHubClient = Depends(get
 
 
 @router.post("/repositories/{owner}/{repo}/issues")
-def create_issue(owner: str, repo: str, title: str, body: str = None, github_client: GitHubClient = Depends(get_github_client)):
+async def create_issue(owner: str, repo: str, title: str, body: str = None, github_client: GitHubClient = Depends(get_github_client)):
     """Create a new issue in a GitHub repository.
     
     Args:
@@ -163,7 +188,7 @@ def create_issue(owner: str, repo: str, title: str, body: str = None, github_cli
         Dict[str, Any]: Created issue information
     """
     try:
-        issue = github_client.create_issue(owner, repo, title, body)
+        issue = await github_client.create_issue(owner, repo, title, body)
         return issue
     except Exception as e:
         logger.error(f"Error creating GitHub issue: {e}")
@@ -1,24 +1,49 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
 import logging
 from .client import GitHubClient
 
 logger = logging.getLogger(__name__)
 
+# Default cap on items returned by paginated list tools
+DEFAULT_MAX_ITEMS = 1000
+
+# Pagination parameters shared by the paginated list tools
+PAGINATION_PARAMETERS = {
+    "max_items": {
+        "type": "number",
+        "description": f"Maximum number of items to return across all pages (default: {DEFAULT_MAX_ITEMS})",
+        "optional": True
+    },
+    "page_size": {
+        "type": "number",
+        "description": "Number of items fetched per page from GitHub (default: 100, max: 100)",
+        "optional": True
+    }
+}
+
 # Dictionary of GitHub tool definitions to be exposed via MCP
 GITHUB_TOOLS = {
     "github.get_user": {
         "name": "github.get_user",
         "description": "Get authenticated GitHub user information",
+        "read_only": True,
+        "cache_ttl": 300,
         "parameters": {}
     },
     "github.list_repos": {
         "name": "github.list_repos",
         "description": "List GitHub repositories for the authenticated user",
-        "parameters": {}
+        "read_only": True,
+        "cache_ttl": 60,
+        "parameters": {
+            **PAGINATION_PARAMETERS
+        }
     },
     "github.get_repo": {
         "name": "github.get_repo",
         "description": "Get information about a specific GitHub repository",
+        "read_only": True,
+        "cache_ttl": 60,
         "parameters": {
             "owner": {
                 "type": "string",
@@ -33,6 +58,8 @@ GITHUB_TOOLS = {
     "github.list_issues": {
         "name": "github.list_issues",
         "description": "List issues for a GitHub repository",
+        "read_only": True,
+        "cache_ttl": 30,
         "parameters": {
             "owner": {
                 "type": "string",
@@ -41,12 +68,14 @@ GITHUB_TOOLS = {
             "repo": {
                 "type": "string",
                 "description": "Repository name"
-            }
+            },
+            **PAGINATION_PARAMETERS
         }
     },
     "github.create_issue": {
         "name": "github.create_issue",
         "description": "Create a new issue in a GitHub repository",
+        "read_only": False,
         "parameters": {
             "owner": {
                 "type": "string",
@@ -70,6 +99,8 @@ GITHUB_TOOLS = {
     "github.list_pull_requests": {
         "name": "github.list_pull_requests",
         "description": "List pull requests for a GitHub repository",
+        "read_only": True,
+        "cache_ttl": 30,
         "parameters": {
             "owner": {
                 "type": "string",
@@ -78,12 +109,14 @@ GITHUB_TOOLS = {
             "repo": {
                 "type": "string",
                 "description": "Repository name"
-            }
+            },
+            **PAGINATION_PARAMETERS
         }
     },
     "github.create_pull_request": {
         "name": "github.create_pull_request",
         "description": "Create a new pull request in a GitHub repository",
+        "read_only": False,
         "parameters": {
             "owner": {
                 "type": "string",
@@ -116,31 +149,65 @@ GITHUB_TOOLS = {
 
 
 # Factory function to create a GitHub tool handler for a user
-def create_github_handler(user_id: int, db):
+async def create_github_handler(user_id: int, db):
     """Factory function to create a GitHub tool handler for a user
     
     Args:
         user_id (int): User ID
-        db: Database session
+        db: Async database session
         
     Returns:
         GitHubToolHandler: Handler for GitHub tools
     """
     from .utils import get_github_client_for_user
-    client = get_github_client_for_user(user_id, db)
-    return GitHubToolHandler(client)
+    from .coalescer import GITHUB_GRAPHQL_COALESCING, get_coalescer
+    client = await get_github_client_for_user(user_id, db)
+    coalescer = get_coalescer(client) if GITHUB_GRAPHQL_COALESCING else None
+    return GitHubToolHandler(client, coalescer=coalescer)
+
+
+def _pagination_args(parameters: Dict[str, Any]) -> Tuple[int, int]:
+    """Get max_items and page_size from tool parameters
+    
+    Args:
+        parameters (Dict[str, Any]): Tool parameters
+        
+    Returns:
+        Tuple[int, int]: Maximum items and page size
+        
+    Raises:
+        ValueError: If either value is not a positive integer
+    """
+    try:
+        max_items = parameters.get("max_items")
+        max_items = DEFAULT_MAX_ITEMS if max_items is None else int(max_items)
+        page_size = parameters.get("page_size")
+        page_size = GitHubClient.MAX_PAGE_SIZE if page_size is None else int(page_size)
+    except (TypeError, ValueError):
+        raise ValueError("max_items and page_size must be integers")
+    if max_items < 1 or page_size < 1:
+        raise ValueError("max_items and page_size must be positive")
+    return max_items, min(page_size, GitHubClient.MAX_PAGE_SIZE)
 
 
 class GitHubToolHandler:
     """Handler for executing GitHub tools via MCP"""
     
-    def __init__(self, github_client: GitHubClient):
+    def __init__(self, github_client: GitHubClient, coalescer=None):
         """Initialize with GitHub client
         
         Args:
             github_client (GitHubClient): Authenticated GitHub client
+            coalescer (GraphQLCoalescer, optional): Coalescer merging concurrent reads
+                for the same credential into GraphQL queries. Defaults to None (REST only).
         """
         self.client = github_client
+        self.coalescer = coalescer
+    
+    @property
+    def credential_key(self) -> Optional[str]:
+        """Non-secret identifier (SHA-256 of the token) of the GitHub credential in use"""
+        return getattr(self.client, "credential_key", None)
     
     def get_tool_definitions(self) -> List[Dict[str, Any]]:
         """Get all GitHub tool definitions
@@ -150,7 +217,7 @@ class GitHubToolHandler:
         """
         return list(GITHUB_TOOLS.values())
     
-    def get_user(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_user(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get authenticated GitHub user information
         
         Args:
@@ -159,20 +226,21 @@ class GitHubToolHandler:
         Returns:
             Dict[str, Any]: User information
         """
-        return self.client.get_user()
+        return await self.client.get_user()
     
-    def list_repos(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def list_repos(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """List GitHub repositories for the authenticated user
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters (none required)
+            parameters (Dict[str, Any]): Tool parameters including optional max_items and page_size
             
         Returns:
             Dict[str, Any]: Repository list
         """
-        return {"repositories": self.client.list_repositories()}
+        max_items, page_size = _pagination_args(parameters)
+        return {"repositories": await self.client.list_repositories(page_size=page_size, max_items=max_items)}
     
-    def get_repo(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_repo(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get information about a specific GitHub repository
         
         Args:
@@ -189,13 +257,15 @@ class GitHubToolHandler:
         if not owner or not repo:
             raise ValueError("owner and repo parameters are required")
         
-        return self.client.get_repository(owner, repo)
+        if self.coalescer is not None:
+            return await self.coalescer.get_repository(owner, repo)
+        return await self.client.get_repository(owner, repo)
     
-    def list_issues(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def list_issues(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """List issues for a GitHub repository
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters including owner and repo
+            parameters (Dict[str, Any]): Tool parameters including owner, repo and optional max_items and page_size
             
         Returns:
             Dict[str, Any]: Issues list
@@ -208,9 +278,12 @@ class GitHubToolHandler:
         if not owner or not repo:
             raise ValueError("owner and repo parameters are required")
         
-        return {"issues": self.client.list_issues(owner, repo)}
+        max_items, page_size = _pagination_args(parameters)
+        if self.coalescer is not None:
+            return {"issues": await self.coalescer.list_issues(owner, repo, max_items)}
+        return {"issues": await self.client.list_issues(owner, repo, page_size=page_size, max_items=max_items)}
     
-    def create_issue(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_issue(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new issue in a GitHub repository
         
         Args:
@@ -230,13 +303,13 @@ class GitHubToolHandler:
         if not owner or not repo or not title:
             raise ValueError("owner, repo, and title parameters are required")
         
-        return self.client.create_issue(owner, repo, title, body)
+        return await self.client.create_issue(owner, repo, title, body)
     
-    def list_pull_requests(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def list_pull_requests(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """List pull requests for a GitHub repository
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters including owner and repo
+            parameters (Dict[str, Any]): Tool parameters including owner, repo and optional max_items and page_size
             
         Returns:
             Dict[str, Any]: Pull requests list
@@ -249,9 +322,12 @@ class GitHubToolHandler:
         if not owner or not repo:
             raise ValueError("owner and repo parameters are required")
         
-        return {"pull_requests": self.client.list_pull_requests(owner, repo)}
+        max_items, page_size = _pagination_args(parameters)
+        if self.coalescer is not None:
+            return {"pull_requests": await self.coalescer.list_pull_requests(owner, repo, max_items)}
+        return {"pull_requests": await self.client.list_pull_requests(owner, repo, page_size=page_size, max_items=max_items)}
     
-    def create_pull_request(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_pull_request(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new pull request in a GitHub repository
         
         Args:
@@ -273,9 +349,37 @@ class GitHubToolHandler:
         if not owner or not repo or not title or not head or not base:
             raise ValueError("owner, repo, title, head, and base parameters are required")
         
-        return self.client.create_pull_request(owner, repo, title, head, base, body)
+        return await self.client.create_pull_request(owner, repo, title, head, base, body)
+        
+    def stream_tool(self, tool_name: str, parameters: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream the pages of a paginated GitHub list tool as they arrive
         
-    def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        Args:
+            tool_name (str): Name of the tool to stream
+            parameters (Dict[str, Any]): Tool parameters
+            
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: Pages of items
+            
+        Raises:
+            ValueError: If the tool does not support streaming or parameters are missing
+        """
+        max_items, page_size = _pagination_args(parameters)
+        if tool_name == "github.list_repos":
+            return self.client.iter_repositories(page_size=page_size, max_items=max_items)
+        
+        if tool_name in ("github.list_issues", "github.list_pull_requests"):
+            owner = parameters.get("owner")
+            repo = parameters.get("repo")
+            if not owner or not repo:
+                raise ValueError("owner and repo parameters are required")
+            if tool_name == "github.list_issues":
+                return self.client.iter_issues(owner, repo, page_size=page_size, max_items=max_items)
+            return self.client.iter_pull_requests(owner, repo, page_size=page_size, max_items=max_items)
+        
+        raise ValueError(f"GitHub tool {tool_name} does not support streaming")
+    
+    async def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a GitHub tool with the given parameters
         
         Args:
@@ -301,7 +405,7 @@ class GitHubToolHandler:
             # Get the method dynamically and call it with the parameters
             if hasattr(self, method_name):
                 method = getattr(self, method_name)
-                return method(parameters)
+                return await method(parameters)
             else:
                 logger.error(f"Unimplemented GitHub tool: {tool_name}")
                 raise ValueError(f"Unimplemented GitHub tool: {tool_name}")
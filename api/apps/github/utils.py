@@ -1,8 +1,9 @@
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from api.apps.client_cache import get_cached_client, cache_client
 from .client import GitHubClient
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,7 @@ def format_tool_result(result: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-def validate_github_credentials(access_token: str) -> bool:
+async def validate_github_credentials(access_token: str) -> bool:
     """Validate GitHub credentials by making a simple API call
     
     Args:
@@ -41,19 +42,21 @@ def validate_github_credentials(access_token: str) -> bool:
     """
     try:
         client = GitHubClient(access_token)
-        client.get_user()  # Try to get user info
+        await client.get_user()  # Try to get user info
         return True
     except Exception as e:
         logger.error(f"GitHub credential validation failed: {e}")
         return False
 
 
-def get_github_client_for_user(user_id: int, db) -> GitHubClient:
+async def get_github_client_for_user(user_id: int, db) -> GitHubClient:
     """Get an authenticated GitHub client for a specific user
     
+    Clients are cached per user, so warm calls skip the credential lookup.
+    
     Args:
         user_id (int): User ID
-        db: Database session
+        db: Async database session
         
     Returns:
         GitHubClient: Authenticated GitHub client
@@ -62,13 +65,18 @@ def get_github_client_for_user(user_id: int, db) -> GitHubClient:
         HTTPException: If GitHub credentials are not found
     """
     from fastapi import HTTPException, status
-    from sqlalchemy.orm import Session
+    from sqlalchemy import select
     from .models import GitHubCredential
     
+    client = get_cached_client("github", user_id)
+    if client is not None:
+        return client
+    
     # Get credentials from the database
-    credentials = db.query(GitHubCredential).filter(
-        GitHubCredential.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(GitHubCredential).filter(GitHubCredential.user_id == user_id)
+    )
+    credentials = result.scalars().first()
     
     if not credentials:
         raise HTTPException(
@@ -76,5 +84,37 @@ def get_github_client_for_user(user_id: int, db) -> GitHubClient:
             detail="GitHub credentials not found for this user. Please connect to GitHub first."
         )
     
-    # Create and return a GitHub client with the user's access token
-    return GitHubClient(credentials.access_token)
+    # Create, cache and return a GitHub client with the user's access token
+    return cache_client("github", user_id, GitHubClient(credentials.access_token))
+
+
+def github_credential_probe(user_id: int):
+    """Build a SQL expression that is true when the user has GitHub credentials
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        Exists: EXISTS clause over the user's GitHub credentials
+    """
+    from sqlalchemy import exists
+    from .models import GitHubCredential
+    
+    return exists().where(GitHubCredential.user_id == user_id)
+
+
+def github_credential_query(user_ids: List[int]):
+    """Build a query for the stored GitHub access tokens of the given users
+    
+    Args:
+        user_ids (List[int]): User IDs
+        
+    Returns:
+        Select: SELECT of (user_id, access_token) over the users' GitHub credentials
+    """
+    from sqlalchemy import select
+    from .models import GitHubCredential
+    
+    return select(GitHubCredential.user_id, GitHubCredential.access_token).filter(
+        GitHubCredential.user_id.in_(user_ids)
+    )
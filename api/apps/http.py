@@ -0,0 +1,221 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Connection pool configuration for upstream app APIs (applies per upstream host)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_POOL_IDLE_TIMEOUT = float(os.getenv("HTTP_POOL_IDLE_TIMEOUT", "300"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "False").lower() == "true"
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package required for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _pool_key(url: Optional[str]) -> str:
+    """Get the pool key (scheme://host:port) for a URL
+
+    Args:
+        url (Optional[str]): Upstream URL or base URL
+
+    Returns:
+        str: Origin of the URL, or "default" when no URL is given
+    """
+    if not url:
+        return "default"
+    parsed = httpx.URL(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return f"{parsed.scheme}://{parsed.host}:{port}"
+
+
+class ConnectionManager:
+    """Owns one pooled async HTTP client per upstream host
+
+    Every app client asks the manager for the client of the host it talks
+    to, so connections are reused across handlers and requests. Pools that
+    stay unused for longer than ``idle_timeout`` are closed by a background
+    task started with :meth:`start`.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        timeout: float = HTTP_TIMEOUT,
+        http2: bool = HTTP2_ENABLED,
+        idle_timeout: float = HTTP_POOL_IDLE_TIMEOUT,
+    ):
+        """Initialize the manager with default per-host pool settings
+
+        Args:
+            max_connections (int): Maximum open connections per host
+            max_keepalive_connections (int): Maximum idle keep-alive connections per host
+            keepalive_expiry (float): Seconds an idle keep-alive connection is kept
+            timeout (float): Default request timeout in seconds
+            http2 (bool): Whether to negotiate HTTP/2 where the host supports it
+            idle_timeout (float): Seconds without use after which a host pool is closed
+        """
+        self.defaults = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+            "timeout": timeout,
+            "http2": http2,
+        }
+        self.idle_timeout = idle_timeout
+        self._host_settings: Dict[str, Dict[str, Any]] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._last_used: Dict[str, float] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    def configure_host(self, url: str, **settings) -> None:
+        """Override pool settings for a single upstream host
+
+        Settings take effect the next time the host's pool is created.
+
+        Args:
+            url (str): Any URL on the upstream host
+            **settings: Any of max_connections, max_keepalive_connections,
+                keepalive_expiry, timeout or http2
+        """
+        unknown = set(settings) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"Unknown pool settings: {', '.join(sorted(unknown))}")
+        self._host_settings.setdefault(_pool_key(url), {}).update(settings)
+
+    def _create_client(self, key: str) -> httpx.AsyncClient:
+        """Create the pooled client for a host"""
+        settings = {**self.defaults, **self._host_settings.get(key, {})}
+        http2 = settings["http2"]
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+        logger.info(f"Creating upstream connection pool for {key}")
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_keepalive_connections"],
+                keepalive_expiry=settings["keepalive_expiry"],
+            ),
+            timeout=settings["timeout"],
+            http2=http2,
+        )
+
+    def get_client(self, url: Optional[str] = None) -> httpx.AsyncClient:
+        """Get the pooled client for the host of a URL
+
+        Args:
+            url (Optional[str], optional): Any URL on the upstream host
+
+        Returns:
+            httpx.AsyncClient: Pooled client for the host
+        """
+        key = _pool_key(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client(key)
+            self._clients[key] = client
+        self._last_used[key] = time.monotonic()
+        return client
+
+    async def evict_idle(self) -> int:
+        """Close host pools that have not been used within the idle timeout
+
+        Returns:
+            int: Number of pools closed
+        """
+        now = time.monotonic()
+        expired = [
+            key for key, last_used in self._last_used.items()
+            if now - last_used > self.idle_timeout
+        ]
+        for key in expired:
+            client = self._clients.pop(key, None)
+            self._last_used.pop(key, None)
+            if client is not None:
+                logger.info(f"Closing idle upstream connection pool for {key}")
+                await client.aclose()
+        return len(expired)
+
+    async def _eviction_loop(self) -> None:
+        """Periodically close idle host pools"""
+        interval = max(self.idle_timeout / 2, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Error evicting idle connection pools: {e}")
+
+    async def start(self) -> None:
+        """Start background eviction of idle host pools"""
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._eviction_loop())
+
+    async def close(self) -> None:
+        """Stop eviction and close every host pool"""
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+            self._eviction_task = None
+        clients = list(self._clients.items())
+        self._clients.clear()
+        self._last_used.clear()
+        for key, client in clients:
+            logger.info(f"Closing upstream connection pool for {key}")
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the state of every host pool for metrics
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Open, idle and waiting counts keyed by host
+        """
+        stats = {}
+        for key, client in self._clients.items():
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            requests = list(getattr(pool, "_requests", []))
+            settings = {**self.defaults, **self._host_settings.get(key, {})}
+            stats[key] = {
+                "open": len(connections),
+                "idle": sum(1 for connection in connections if connection.is_idle()),
+                "waiting": sum(1 for request in requests if request.is_queued()),
+                "max_connections": settings["max_connections"],
+            }
+        return stats
+
+
+# Process-wide connection manager shared by every app client
+connection_manager = ConnectionManager()
+
+
+def get_http_client(url: Optional[str] = None) -> httpx.AsyncClient:
+    """Get the pooled async HTTP client for an upstream host
+
+    Args:
+        url (Optional[str], optional): Any URL on the upstream host, usually
+            the app client's base URL
+
+    Returns:
+        httpx.AsyncClient: Pooled client shared by every caller for that host
+    """
+    return connection_manager.get_client(url)
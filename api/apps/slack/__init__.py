@@ -0,0 +1,19 @@
+# This file makes api/apps/slack a Python package
+
+
+def register():
+    """Register Slack tools, handler factory and credential lookups with the tools router"""
+    from api.routers.tools import register_app_handler
+    from .tools import SLACK_TOOLS, create_slack_handler
+    from .utils import slack_credential_probe, slack_credential_query
+
+    register_app_handler(
+        "slack", create_slack_handler, tools=SLACK_TOOLS, credential_probe=slack_credential_probe,
+        credential_query=slack_credential_query,
+    )
+
+
+def get_router():
+    """Get the router for the Slack app's own endpoints"""
+    from .routes import router
+    return router
@@ -1,27 +1,94 @@
+import os
+import httpx
+import hashlib
 import logging
-import requests
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Callable, Tuple
+
+from api.apps.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_method_timeouts(value: Optional[str]) -> Dict[str, float]:
+    """Parse per-method timeouts from a "method=seconds,..." string
+    
+    Args:
+        value (Optional[str]): Timeout specification, e.g. "users.list=30,chat.postMessage=5"
+        
+    Returns:
+        Dict[str, float]: Timeout in seconds keyed by Slack method
+    """
+    timeouts = {}
+    if not value:
+        return timeouts
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        method, seconds = item.split("=", 1)
+        try:
+            timeouts[method.strip()] = float(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring invalid Slack timeout for {method.strip()}: {seconds}")
+    return timeouts
+
 class SlackClient:
     """Client for interacting with Slack API"""
     
     BASE_URL = "https://slack.com/api"
     
-    def __init__(self, token: str):
+    # Default timeout in seconds for Slack methods without a specific entry
+    DEFAULT_TIMEOUT = float(os.getenv("SLACK_DEFAULT_TIMEOUT", "10"))
+    
+    # Per-method timeouts in seconds; list and history calls can be slow on large workspaces
+    METHOD_TIMEOUTS = {
+        "conversations.list": 30.0,
+        "conversations.history": 30.0,
+        "conversations.replies": 30.0,
+        "users.list": 30.0,
+        "chat.postMessage": 10.0,
+        "reactions.add": 5.0,
+        "users.info": 5.0,
+        **_parse_method_timeouts(os.getenv("SLACK_METHOD_TIMEOUTS")),
+    }
+    
+    # Largest page size Slack recommends for cursor-paginated methods
+    MAX_PAGE_SIZE = 200
+    
+    def __init__(self, token: str, http_client: Optional[httpx.AsyncClient] = None, timeouts: Optional[Dict[str, float]] = None):
         """Initialize with Slack API token
         
         Args:
             token (str): Slack API token
+            http_client (Optional[httpx.AsyncClient], optional): HTTP client to use.
+                Defaults to the process-wide shared client.
+            timeouts (Optional[Dict[str, float]], optional): Per-method timeout overrides in seconds.
         """
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
+        self._http_client = http_client
+        self.credential_key = hashlib.sha256(token.encode()).hexdigest()
+        self.timeouts = {**self.METHOD_TIMEOUTS, **(timeouts or {})}
     
-    def _make_request(self, method: str, endpoint: str, params: Dict = None, json_data: Dict = None) -> Dict[str, Any]:
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP client used for requests, the shared pooled client by default"""
+        return self._http_client or get_http_client(self.BASE_URL)
+    
+    def get_timeout(self, endpoint: str) -> float:
+        """Get the timeout for a Slack method
+        
+        Args:
+            endpoint (str): Slack method, e.g. "conversations.list"
+            
+        Returns:
+            float: Timeout in seconds
+        """
+        return self.timeouts.get(endpoint, self.DEFAULT_TIMEOUT)
+    
+    async def _make_request(self, method: str, endpoint: str, params: Dict = None, json_data: Dict = None) -> Dict[str, Any]:
         """Make a request to the Slack API
         
         Args:
@@ -41,10 +108,11 @@ class SlackClient:
         try:
             logger.info(f"Making {method} request to {url}")
             
+            timeout = self.get_timeout(endpoint)
             if method.upper() == "GET":
-                response = requests.get(url, headers=self.headers, params=params)
+                response = await self.http_client.get(url, headers=self.headers, params=params, timeout=timeout)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, json=json_data)
+                response = await self.http_client.post(url, headers=self.headers, json=json_data, timeout=timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
@@ -62,7 +130,114 @@ class SlackClient:
             logger.error(f"Error making request to Slack API: {str(e)}")
             raise
     
-    def list_channels(self, limit: int = 100, cursor: str = None) -> Dict[str, Any]:
+    async def iter_cursor(self, endpoint: str, items_key: str, params: Optional[Dict[str, Any]] = None,
+                          page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None,
+                          stop: Optional[Callable[[List[Dict[str, Any]]], bool]] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Iterate over the pages of a cursor-paginated Slack method
+        
+        Follows ``response_metadata.next_cursor`` until Slack returns no
+        cursor, ``max_items`` items have been yielded, or ``stop`` returns
+        True for a page.
+        
+        Args:
+            endpoint (str): Slack method, e.g. "users.list"
+            items_key (str): Response key holding the items, e.g. "members"
+            params (Optional[Dict[str, Any]], optional): Method parameters, may include a starting "cursor"
+            page_size (int, optional): Items requested per call. Defaults to 200.
+            max_items (Optional[int], optional): Item budget across pages. Defaults to no limit.
+            stop (Optional[Callable], optional): Called with each page; iteration ends after a page for which it returns True
+            
+        Yields:
+            Tuple[List[Dict[str, Any]], str]: Items of each page and the cursor for the following page ("" after the last page)
+        """
+        params = dict(params or {})
+        cursor = params.pop("cursor", None)
+        remaining = max_items
+        
+        while remaining is None or remaining > 0:
+            limit = page_size if remaining is None else min(page_size, remaining)
+            page_params = {**params, "limit": limit}
+            if cursor:
+                page_params["cursor"] = cursor
+            data = await self._make_request("GET", endpoint, params=page_params)
+            
+            items = data.get(items_key, [])
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            cursor = data.get("response_metadata", {}).get("next_cursor", "")
+            
+            yield items, cursor
+            
+            if not cursor or (stop is not None and stop(items)):
+                break
+    
+    def iter_channels(self, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None, cursor: str = None,
+                      stop: Optional[Callable[[List[Dict[str, Any]]], bool]] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Iterate over pages of public channels in the workspace
+        
+        Args:
+            page_size (int, optional): Channels per call. Defaults to 200.
+            max_items (Optional[int], optional): Maximum channels. Defaults to no limit.
+            cursor (str, optional): Cursor to resume from. Defaults to None.
+            stop (Optional[Callable], optional): Stop condition evaluated per page
+            
+        Returns:
+            AsyncIterator[Tuple[List[Dict[str, Any]], str]]: Pages of channels and next cursors
+        """
+        return self.iter_cursor("conversations.list", "channels", {"cursor": cursor},
+                                page_size=page_size, max_items=max_items, stop=stop)
+    
+    def iter_users(self, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None, cursor: str = None,
+                   stop: Optional[Callable[[List[Dict[str, Any]]], bool]] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Iterate over pages of workspace users
+        
+        Args:
+            page_size (int, optional): Users per call. Defaults to 200.
+            max_items (Optional[int], optional): Maximum users. Defaults to no limit.
+            cursor (str, optional): Cursor to resume from. Defaults to None.
+            stop (Optional[Callable], optional): Stop condition evaluated per page
+            
+        Returns:
+            AsyncIterator[Tuple[List[Dict[str, Any]], str]]: Pages of users and next cursors
+        """
+        return self.iter_cursor("users.list", "members", {"cursor": cursor},
+                                page_size=page_size, max_items=max_items, stop=stop)
+    
+    def iter_channel_history(self, channel_id: str, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None,
+                             stop: Optional[Callable[[List[Dict[str, Any]]], bool]] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Iterate over pages of a channel's message history, newest first
+        
+        Args:
+            channel_id (str): Channel ID
+            page_size (int, optional): Messages per call. Defaults to 200.
+            max_items (Optional[int], optional): Maximum messages. Defaults to no limit.
+            stop (Optional[Callable], optional): Stop condition evaluated per page
+            
+        Returns:
+            AsyncIterator[Tuple[List[Dict[str, Any]], str]]: Pages of messages and next cursors
+        """
+        return self.iter_cursor("conversations.history", "messages", {"channel": channel_id},
+                                page_size=page_size, max_items=max_items, stop=stop)
+    
+    def iter_thread_replies(self, channel_id: str, thread_ts: str, page_size: int = MAX_PAGE_SIZE, max_items: Optional[int] = None,
+                            stop: Optional[Callable[[List[Dict[str, Any]]], bool]] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Iterate over pages of replies in a thread
+        
+        Args:
+            channel_id (str): Channel ID
+            thread_ts (str): Thread timestamp
+            page_size (int, optional): Messages per call. Defaults to 200.
+            max_items (Optional[int], optional): Maximum messages. Defaults to no limit.
+            stop (Optional[Callable], optional): Stop condition evaluated per page
+            
+        Returns:
+            AsyncIterator[Tuple[List[Dict[str, Any]], str]]: Pages of messages and next cursors
+        """
+        return self.iter_cursor("conversations.replies", "messages", {"channel": channel_id, "ts": thread_ts},
+                                page_size=page_size, max_items=max_items, stop=stop)
+    
+    async def list_channels(self, limit: int = 100, cursor: str = None) -> Dict[str, Any]:
         """List public channels in the workspace
         
         Args:
@@ -76,9 +251,9 @@ class SlackClient:
         if cursor:
             params["cursor"] = cursor
             
-        return self._make_request("GET", "conversations.list", params=params)
+        return await self._make_request("GET", "conversations.list", params=params)
     
-    def post_message(self, channel_id: str, text: str) -> Dict[str, Any]:
+    async def post_message(self, channel_id: str, text: str) -> Dict[str, Any]:
         """Post a message to a channel
         
         Args:
@@ -93,9 +268,9 @@ class SlackClient:
             "text": text
         }
         
-        return self._make_request("POST", "chat.postMessage", json_data=json_data)
+        return await self._make_request("POST", "chat.postMessage", json_data=json_data)
     
-    def reply_to_thread(self, channel_id: str, thread_ts: str, text: str) -> Dict[str, Any]:
+    async def reply_to_thread(self, channel_id: str, thread_ts: str, text: str) -> Dict[str, Any]:
         """Reply to a thread
         
         Args:
@@ -112,9 +287,9 @@ class SlackClient:
             "text": text
         }
         
-        return self._make_request("POST", "chat.postMessage", json_data=json_data)
+        return await self._make_request("POST", "chat.postMessage", json_data=json_data)
     
-    def add_reaction(self, channel_id: str, timestamp: str, reaction: str) -> Dict[str, Any]:
+    async def add_reaction(self, channel_id: str, timestamp: str, reaction: str) -> Dict[str, Any]:
         """Add a reaction to a message
         
         Args:
@@ -131,9 +306,9 @@ class SlackClient:
             "name": reaction
         }
         
-        return self._make_request("POST", "reactions.add", json_data=json_data)
+        return await self._make_request("POST", "reactions.add", json_data=json_data)
     
-    def get_channel_history(self, channel_id: str, limit: int = 10) -> Dict[str, Any]:
+    async def get_channel_history(self, channel_id: str, limit: int = 10) -> Dict[str, Any]:
         """Get channel message history
         
         Args:
@@ -148,9 +323,9 @@ class SlackClient:
             "limit": limit
         }
         
-        return self._make_request("GET", "conversations.history", params=params)
+        return await self._make_request("GET", "conversations.history", params=params)
     
-    def get_thread_replies(self, channel_id: str, thread_ts: str) -> Dict[str, Any]:
+    async def get_thread_replies(self, channel_id: str, thread_ts: str) -> Dict[str, Any]:
         """Get replies in a thread
         
         Args:
@@ -165,9 +340,9 @@ class SlackClient:
             "ts": thread_ts
         }
         
-        return self._make_request("GET", "conversations.replies", params=params)
+        return await self._make_request("GET", "conversations.replies", params=params)
     
-    def get_users(self, cursor: str = None, limit: int = 100) -> Dict[str, Any]:
+    async def get_users(self, cursor: str = None, limit: int = 100) -> Dict[str, Any]:
         """Get workspace users
         
         Args:
@@ -181,9 +356,9 @@ class SlackClient:
         if cursor:
             params["cursor"] = cursor
             
-        return self._make_request("GET", "users.list", params=params)
+        return await self._make_request("GET", "users.list", params=params)
     
-    def get_user_profile(self, user_id: str) -> Dict[str, Any]:
+    async def get_user_profile(self, user_id: str) -> Dict[str, Any]:
         """Get user profile
         
         Args:
@@ -194,4 +369,4 @@ class SlackClient:
         """
         params = {"user": user_id}
         
-        return self._make_request("GET", "users.info", params=params)
\ No newline at end of file
+        return await self._make_request("GET", "users.info", params=params)
\ No newline at end of file
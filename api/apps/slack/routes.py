@@ -10,6 +10,10 @@ from .models import SlackCredential
 from .schemas import SlackCredentialCreate, SlackCredential as SlackCredentialSchema
 from .client import SlackClient
 
+from api.apps.availability import invalidate_availability
+from api.apps.client_cache import get_cached_client, cache_client, invalidate_client
+from api.tool_cache import tool_result_cache
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
@@ -32,6 +36,10 @@ def get_slack_client(db: Session = Depends(get_db), current_user: User = Depends
     Raises:
         HTTPException: If Slack credentials are not found
     """
+    client = get_cached_client("slack", current_user.id)
+    if client is not None:
+        return client
+    
     credentials = db.query(SlackCredential).filter(SlackCredential.user_id == current_user.id).first()
     
     if not credentials:
@@ -40,7 +48,7 @@ def get_slack_client(db: Session = Depends(get_db), current_user: User = Depends
             detail="Slack credentials not found. Please connect your Slack account."
         )
     
-    return SlackClient(credentials.access_token)
+    return cache_client("slack", current_user.id, SlackClient(credentials.access_token))
 
 
 @router.post("/connect", response_model=SlackCredentialSchema)
@@ -67,6 +75,9 @@ def connect_slack(credentials: SlackCredentialCreate, db: Session = Depends(get_
         existing_credentials.team_name = credentials.team_name
         db.commit()
         db.refresh(existing_credentials)
+        invalidate_client("slack", current_user.id)
+        invalidate_availability(current_user.id)
+        tool_result_cache.invalidate(current_user.id, "slack")
         return existing_credentials
     
     # Create new credentials
@@ -83,12 +94,15 @@ def connect_slack(credentials: SlackCredentialCreate, db: Session = Depends(get_
     db.add(db_credentials)
     db.commit()
     db.refresh(db_credentials)
+    invalidate_client("slack", current_user.id)
+    invalidate_availability(current_user.id)
+    tool_result_cache.invalidate(current_user.id, "slack")
     
     return db_credentials
 
 
 @router.get("/channels")
-def list_channels(slack_client: SlackClient = Depends(get_slack_client)):
+async def list_channels(slack_client: SlackClient = Depends(get_slack_client)):
     """List channels for the authenticated Slack workspace.
     
     Args:
@@ -98,7 +112,7 @@ def list_channels(slack_client: SlackClient = Depends(get_slack_client)):
         Dict[str, Any]: List of channels
     """
     try:
-        channels = slack_client.list_channels()
+        channels = await slack_client.list_channels()
         return {"channels": channels.get("channels", [])}
     except Exception as e:
         logger.error(f"Error listing Slack channels: {e}")
@@ -109,7 +123,7 @@ def list_channels(slack_client: SlackClient = Depends(get_slack_client)):
 
 
 @router.post("/channels/{channel_id}/messages")
-def post_message(channel_id: str, text: str, slack_client: SlackClient = Depends(get_slack_client)):
+async def post_message(channel_id: str, text: str, slack_client: SlackClient = Depends(get_slack_client)):
     """Post a message to a channel.
     
     Args:
@@ -121,7 +135,7 @@ def post_message(channel_id: str, text: str, slack_client: SlackClient = Depends
         Dict[str, Any]: Message posting result
     """
     try:
-        result = slack_client.post_message(channel_id, text)
+        result = await slack_client.post_message(channel_id, text)
         return result
     except Exception as e:
         logger.error(f"Error posting Slack message: {e}")
@@ -132,7 +146,7 @@ def post_message(channel_id: str, text: str, slack_client: SlackClient = Depends
 
 
 @router.post("/channels/{channel_id}/threads/{thread_ts}/replies")
-def reply_to_thread(channel_id: str, thread_ts: str, text: str, slack_client: SlackClient = Depends(get_slack_client)):
+async def reply_to_thread(channel_id: str, thread_ts: str, text: str, slack_client: SlackClient = Depends(get_slack_client)):
     """Reply to a message thread.
     
     Args:
@@ -145,7 +159,7 @@ def reply_to_thread(channel_id: str, thread_ts: str, text: str, slack_client: Sl
         Dict[str, Any]: Reply result
     """
     try:
-        result = slack_client.reply_to_thread(channel_id, thread_ts, text)
+        result = await slack_client.reply_to_thread(channel_id, thread_ts, text)
         return result
     except Exception as e:
         logger.error(f"Error replying to Slack thread: {e}")
@@ -156,7 +170,7 @@ def reply_to_thread(channel_id: str, thread_ts: str, text: str, slack_client: Sl
 
 
 @router.get("/channels/{channel_id}/history")
-def get_channel_history(channel_id: str, limit: int = 10, slack_client: SlackClient = Depends(get_slack_client)):
+async def get_channel_history(channel_id: str, limit: int = 10, slack_client: SlackClient = Depends(get_slack_client)):
     """Get channel message history.
     
     Args:
@@ -168,7 +182,7 @@ def get_channel_history(channel_id: str, limit: int = 10, slack_client: SlackCli
         Dict[str, Any]: Channel history
     """
     try:
-        history = slack_client.get_channel_history(channel_id, limit)
+        history = await slack_client.get_channel_history(channel_id, limit)
         return history
     except Exception as e:
         logger.error(f"Error getting Slack channel history: {e}")
@@ -179,7 +193,7 @@ def get_channel_history(channel_id: str, limit: int = 10, slack_client: SlackCli
 
 
 @router.get("/channels/{channel_id}/threads/{thread_ts}/replies")
-def get_thread_replies(channel_id: str, thread_ts: str, slack_client: SlackClient = Depends(get_slack_client)):
+async def get_thread_replies(channel_id: str, thread_ts: str, slack_client: SlackClient = Depends(get_slack_client)):
     """Get replies in a thread.
     
     Args:
@@ -191,7 +205,7 @@ def get_thread_replies(channel_id: str, thread_ts: str, slack_client: SlackClien
         Dict[str, Any]: Thread replies
     """
     try:
-        replies = slack_client.get_thread_replies(channel_id, thread_ts)
+        replies = await slack_client.get_thread_replies(channel_id, thread_ts)
         return replies
     except Exception as e:
         logger.error(f"Error getting Slack thread replies: {e}")
@@ -202,7 +216,7 @@ def get_thread_replies(channel_id: str, thread_ts: str, slack_client: SlackClien
 
 
 @router.get("/users")
-def list_users(slack_client: SlackClient = Depends(get_slack_client)):
+async def list_users(slack_client: SlackClient = Depends(get_slack_client)):
     """List users in the Slack workspace.
     
     Args:
@@ -212,7 +226,7 @@ def list_users(slack_client: SlackClient = Depends(get_slack_client)):
         Dict[str, Any]: List of users
     """
     try:
-        users = slack_client.get_users()
+        users = await slack_client.get_users()
         return {"users": users.get("members", [])}
     except Exception as e:
         logger.error(f"Error listing Slack users: {e}")
@@ -223,7 +237,7 @@ def list_users(slack_client: SlackClient = Depends(get_slack_client)):
 
 
 @router.get("/users/{user_id}")
-def get_user_profile(user_id: str, slack_client: SlackClient = Depends(get_slack_client)):
+async def get_user_profile(user_id: str, slack_client: SlackClient = Depends(get_slack_client)):
     """Get user profile.
     
     Args:
@@ -234,7 +248,7 @@ def get_user_profile(user_id: str, slack_client: SlackClient = Depends(get_slack
         Dict[str, Any]: User profile
     """
     try:
-        user = slack_client.get_user_profile(user_id)
+        user = await slack_client.get_user_profile(user_id)
         return user
     except Exception as e:
         logger.error(f"Error getting Slack user profile: {e}")
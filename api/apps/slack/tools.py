@@ -1,14 +1,34 @@
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
+from api.progress import PageProgress
 from .client import SlackClient
 
 logger = logging.getLogger(__name__)
 
+# Default item budget for "all pages" mode
+DEFAULT_MAX_ITEMS = 1000
+
+# Parameters enabling "all pages" mode on cursor-paginated tools
+ALL_PAGES_PARAMETERS = {
+    "all_pages": {
+        "type": "boolean",
+        "description": "Follow pagination cursors and return items from every page, up to max_items",
+        "optional": True
+    },
+    "max_items": {
+        "type": "number",
+        "description": f"Maximum number of items to return in all_pages mode (default: {DEFAULT_MAX_ITEMS})",
+        "optional": True
+    }
+}
+
 # Define Slack tools with their parameters
 SLACK_TOOLS = {
     "slack.list_channels": {
         "name": "slack.list_channels",
         "description": "List public channels in the workspace",
+        "read_only": True,
+        "cache_ttl": 60,
         "parameters": {
             "limit": {
                 "type": "number",
@@ -19,12 +39,14 @@ SLACK_TOOLS = {
                 "type": "string",
                 "description": "Pagination cursor for next page",
                 "optional": True
-            }
+            },
+            **ALL_PAGES_PARAMETERS
         }
     },
     "slack.post_message": {
         "name": "slack.post_message",
         "description": "Post a new message to a Slack channel",
+        "read_only": False,
         "parameters": {
             "channel_id": {
                 "type": "string",
@@ -39,6 +61,7 @@ SLACK_TOOLS = {
     "slack.reply_to_thread": {
         "name": "slack.reply_to_thread",
         "description": "Reply to a specific message thread",
+        "read_only": False,
         "parameters": {
             "channel_id": {
                 "type": "string",
@@ -57,6 +80,7 @@ SLACK_TOOLS = {
     "slack.add_reaction": {
         "name": "slack.add_reaction",
         "description": "Add an emoji reaction to a message",
+        "read_only": False,
         "parameters": {
             "channel_id": {
                 "type": "string",
@@ -75,6 +99,8 @@ SLACK_TOOLS = {
     "slack.get_channel_history": {
         "name": "slack.get_channel_history",
         "description": "Get recent messages from a channel",
+        "read_only": True,
+        "cache_ttl": 10,
         "parameters": {
             "channel_id": {
                 "type": "string",
@@ -84,12 +110,15 @@ SLACK_TOOLS = {
                 "type": "number",
                 "description": "Number of messages to retrieve (default: 10)",
                 "optional": True
-            }
+            },
+            **ALL_PAGES_PARAMETERS
         }
     },
     "slack.get_thread_replies": {
         "name": "slack.get_thread_replies",
         "description": "Get all replies in a message thread",
+        "read_only": True,
+        "cache_ttl": 10,
         "parameters": {
             "channel_id": {
                 "type": "string",
@@ -98,12 +127,15 @@ SLACK_TOOLS = {
             "thread_ts": {
                 "type": "string",
                 "description": "Timestamp of the parent message"
-            }
+            },
+            **ALL_PAGES_PARAMETERS
         }
     },
     "slack.get_users": {
         "name": "slack.get_users",
         "description": "Get list of workspace users with basic profile information",
+        "read_only": True,
+        "cache_ttl": 300,
         "parameters": {
             "cursor": {
                 "type": "string",
@@ -114,12 +146,15 @@ SLACK_TOOLS = {
                 "type": "number",
                 "description": "Maximum users to return (default: 100, max: 200)",
                 "optional": True
-            }
+            },
+            **ALL_PAGES_PARAMETERS
         }
     },
     "slack.get_user_profile": {
         "name": "slack.get_user_profile",
         "description": "Get detailed profile information for a specific user",
+        "read_only": True,
+        "cache_ttl": 300,
         "parameters": {
             "user_id": {
                 "type": "string",
@@ -131,21 +166,43 @@ SLACK_TOOLS = {
 
 
 # Factory function to create a Slack tool handler for a user
-def create_slack_handler(user_id: int, db):
+async def create_slack_handler(user_id: int, db):
     """Factory function to create a Slack tool handler for a user
     
     Args:
         user_id (int): User ID
-        db: Database session
+        db: Async database session
         
     Returns:
         SlackToolHandler: Handler for Slack tools
     """
     from .utils import get_slack_client_for_user
-    client = get_slack_client_for_user(user_id, db)
+    client = await get_slack_client_for_user(user_id, db)
     return SlackToolHandler(client)
 
 
+def _max_items(parameters: Dict[str, Any]) -> int:
+    """Get the all_pages item budget from tool parameters
+    
+    Args:
+        parameters (Dict[str, Any]): Tool parameters
+        
+    Returns:
+        int: Maximum number of items
+        
+    Raises:
+        ValueError: If max_items is not a positive integer
+    """
+    try:
+        max_items = parameters.get("max_items")
+        max_items = DEFAULT_MAX_ITEMS if max_items is None else int(max_items)
+    except (TypeError, ValueError):
+        raise ValueError("max_items must be an integer")
+    if max_items < 1:
+        raise ValueError("max_items must be positive")
+    return max_items
+
+
 class SlackToolHandler:
     """Handler for executing Slack tools via MCP"""
     
@@ -157,6 +214,11 @@ class SlackToolHandler:
         """
         self.client = slack_client
     
+    @property
+    def credential_key(self) -> Optional[str]:
+        """Non-secret identifier (SHA-256 of the token) of the Slack credential in use"""
+        return getattr(self.client, "credential_key", None)
+    
     def get_tool_definitions(self) -> List[Dict[str, Any]]:
         """Get all Slack tool definitions
         
@@ -165,24 +227,98 @@ class SlackToolHandler:
         """
         return list(SLACK_TOOLS.values())
     
-    def list_channels(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _iter_pages(self, tool_name: str, parameters: Dict[str, Any]) -> AsyncIterator[Tuple[List[Dict[str, Any]], str]]:
+        """Get the cursor iterator backing a paginated Slack tool
+        
+        Args:
+            tool_name (str): Name of the paginated tool
+            parameters (Dict[str, Any]): Tool parameters
+            
+        Returns:
+            AsyncIterator[Tuple[List[Dict[str, Any]], str]]: Pages of items and next cursors
+            
+        Raises:
+            ValueError: If the tool is not paginated or parameters are missing
+        """
+        max_items = _max_items(parameters)
+        if tool_name == "slack.list_channels":
+            return self.client.iter_channels(max_items=max_items, cursor=parameters.get("cursor"))
+        if tool_name == "slack.get_users":
+            return self.client.iter_users(max_items=max_items, cursor=parameters.get("cursor"))
+        if tool_name == "slack.get_channel_history":
+            if not parameters.get("channel_id"):
+                raise ValueError("channel_id parameter is required")
+            return self.client.iter_channel_history(parameters["channel_id"], max_items=max_items)
+        if tool_name == "slack.get_thread_replies":
+            if not parameters.get("channel_id") or not parameters.get("thread_ts"):
+                raise ValueError("channel_id and thread_ts parameters are required")
+            return self.client.iter_thread_replies(parameters["channel_id"], parameters["thread_ts"], max_items=max_items)
+        raise ValueError(f"Slack tool {tool_name} does not support pagination")
+    
+    async def _collect_pages(self, tool_name: str, parameters: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
+        """Collect every page of a paginated Slack tool up to its item budget
+        
+        Args:
+            tool_name (str): Name of the paginated tool
+            parameters (Dict[str, Any]): Tool parameters
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: Items and the cursor to resume from ("" when complete)
+        """
+        items = []
+        next_cursor = ""
+        progress = PageProgress()
+        async for page, next_cursor in self._iter_pages(tool_name, parameters):
+            items.extend(page)
+            progress.page(page)
+        return items, next_cursor
+    
+    async def _stream_items(self, pages: AsyncIterator[Tuple[List[Dict[str, Any]], str]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the non-empty item lists of a cursor iterator"""
+        async for items, _ in pages:
+            if items:
+                yield items
+    
+    def stream_tool(self, tool_name: str, parameters: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream every page of a paginated Slack tool as it arrives
+        
+        Args:
+            tool_name (str): Name of the tool to stream
+            parameters (Dict[str, Any]): Tool parameters
+            
+        Returns:
+            AsyncIterator[List[Dict[str, Any]]]: Pages of items
+            
+        Raises:
+            ValueError: If the tool does not support streaming or parameters are missing
+        """
+        return self._stream_items(self._iter_pages(tool_name, parameters))
+    
+    async def list_channels(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """List public channels in the workspace
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters including limit and cursor
+            parameters (Dict[str, Any]): Tool parameters including limit, cursor, all_pages and max_items
             
         Returns:
             Dict[str, Any]: Channels and response metadata
         """
+        if parameters.get("all_pages"):
+            channels, next_cursor = await self._collect_pages("slack.list_channels", parameters)
+            return {
+                "channels": channels,
+                "response_metadata": {"next_cursor": next_cursor}
+            }
+        
         limit = parameters.get("limit", 100)
         cursor = parameters.get("cursor", None)
-        response = self.client.list_channels(limit=limit, cursor=cursor)
+        response = await self.client.list_channels(limit=limit, cursor=cursor)
         return {
             "channels": response.get("channels", []),
             "response_metadata": response.get("response_metadata", {})
         }
     
-    def post_message(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def post_message(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Post a new message to a Slack channel
         
         Args:
@@ -193,14 +329,14 @@ class SlackToolHandler:
         """
         channel_id = parameters["channel_id"]
         text = parameters["text"]
-        response = self.client.post_message(channel_id=channel_id, text=text)
+        response = await self.client.post_message(channel_id=channel_id, text=text)
         return {
             "message": "Message posted successfully",
             "ts": response.get("ts"),
             "channel": response.get("channel")
         }
     
-    def reply_to_thread(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def reply_to_thread(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Reply to a specific message thread
         
         Args:
@@ -212,14 +348,14 @@ class SlackToolHandler:
         channel_id = parameters["channel_id"]
         thread_ts = parameters["thread_ts"]
         text = parameters["text"]
-        response = self.client.reply_to_thread(channel_id=channel_id, thread_ts=thread_ts, text=text)
+        response = await self.client.reply_to_thread(channel_id=channel_id, thread_ts=thread_ts, text=text)
         return {
             "message": "Reply posted successfully",
             "ts": response.get("ts"),
             "channel": response.get("channel")
         }
     
-    def add_reaction(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def add_reaction(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Add an emoji reaction to a message
         
         Args:
@@ -231,62 +367,82 @@ class SlackToolHandler:
         channel_id = parameters["channel_id"]
         timestamp = parameters["timestamp"]
         reaction = parameters["reaction"]
-        response = self.client.add_reaction(channel_id=channel_id, timestamp=timestamp, reaction=reaction)
+        response = await self.client.add_reaction(channel_id=channel_id, timestamp=timestamp, reaction=reaction)
         return {
             "message": "Reaction added successfully"
         }
     
-    def get_channel_history(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_channel_history(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get recent messages from a channel
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters including channel_id and limit
+            parameters (Dict[str, Any]): Tool parameters including channel_id, limit, all_pages and max_items
             
         Returns:
             Dict[str, Any]: Messages and pagination info
         """
+        if parameters.get("all_pages"):
+            messages, next_cursor = await self._collect_pages("slack.get_channel_history", parameters)
+            return {
+                "messages": messages,
+                "has_more": bool(next_cursor)
+            }
+        
         channel_id = parameters["channel_id"]
         limit = parameters.get("limit", 10)
-        response = self.client.get_channel_history(channel_id=channel_id, limit=limit)
+        response = await self.client.get_channel_history(channel_id=channel_id, limit=limit)
         return {
             "messages": response.get("messages", []),
             "has_more": response.get("has_more", False)
         }
     
-    def get_thread_replies(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_thread_replies(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get all replies in a message thread
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters including channel_id and thread_ts
+            parameters (Dict[str, Any]): Tool parameters including channel_id, thread_ts, all_pages and max_items
             
         Returns:
             Dict[str, Any]: Thread messages
         """
+        if parameters.get("all_pages"):
+            messages, _ = await self._collect_pages("slack.get_thread_replies", parameters)
+            return {
+                "messages": messages
+            }
+        
         channel_id = parameters["channel_id"]
         thread_ts = parameters["thread_ts"]
-        response = self.client.get_thread_replies(channel_id=channel_id, thread_ts=thread_ts)
+        response = await self.client.get_thread_replies(channel_id=channel_id, thread_ts=thread_ts)
         return {
             "messages": response.get("messages", [])
         }
     
-    def get_users(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_users(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get list of workspace users with basic profile information
         
         Args:
-            parameters (Dict[str, Any]): Tool parameters including cursor and limit
+            parameters (Dict[str, Any]): Tool parameters including cursor, limit, all_pages and max_items
             
         Returns:
             Dict[str, Any]: Users and response metadata
         """
+        if parameters.get("all_pages"):
+            members, next_cursor = await self._collect_pages("slack.get_users", parameters)
+            return {
+                "members": members,
+                "response_metadata": {"next_cursor": next_cursor}
+            }
+        
         cursor = parameters.get("cursor", None)
         limit = parameters.get("limit", 100)
-        response = self.client.get_users(cursor=cursor, limit=limit)
+        response = await self.client.get_users(cursor=cursor, limit=limit)
         return {
             "members": response.get("members", []),
             "response_metadata": response.get("response_metadata", {})
         }
     
-    def get_user_profile(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_user_profile(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Get detailed profile information for a specific user
         
         Args:
@@ -296,12 +452,12 @@ class SlackToolHandler:
             Dict[str, Any]: User profile information
         """
         user_id = parameters["user_id"]
-        response = self.client.get_user_profile(user_id=user_id)
+        response = await self.client.get_user_profile(user_id=user_id)
         return {
             "user": response.get("user", {})
         }
         
-    def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a Slack tool with the given parameters
         
         Args:
@@ -327,7 +483,7 @@ class SlackToolHandler:
             # Get the method dynamically and call it with the parameters
             if hasattr(self, method_name):
                 method = getattr(self, method_name)
-                return method(parameters)
+                return await method(parameters)
             else:
                 logger.error(f"Unimplemented Slack tool: {tool_name}")
                 raise ValueError(f"Unimplemented Slack tool: {tool_name}")
@@ -1,17 +1,21 @@
 import logging
-from typing import Dict, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ... import models
+from ..client_cache import get_cached_client, cache_client
 from .client import SlackClient
 
 logger = logging.getLogger(__name__)
 
-def get_slack_client_for_user(user_id: int, db: Session) -> SlackClient:
+async def get_slack_client_for_user(user_id: int, db: AsyncSession) -> SlackClient:
     """Get an authenticated Slack client for the user
     
+    Clients are cached per user, so warm calls skip the credential lookup.
+    
     Args:
         user_id (int): User ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         
     Returns:
         SlackClient: Authenticated Slack client for the user
@@ -19,16 +23,50 @@ def get_slack_client_for_user(user_id: int, db: Session) -> SlackClient:
     Raises:
         ValueError: If the user does not have valid Slack credentials
     """
+    client = get_cached_client("slack", user_id)
+    if client is not None:
+        return client
+    
     logger.info(f"Getting Slack client for user {user_id}")
     
     # Get the user's Slack credentials from the database
-    slack_credentials = db.query(models.SlackCredentials).filter(
-        models.SlackCredentials.user_id == user_id
-    ).first()
+    result = await db.execute(
+        select(models.SlackCredentials).filter(models.SlackCredentials.user_id == user_id)
+    )
+    slack_credentials = result.scalars().first()
     
     if not slack_credentials or not slack_credentials.access_token:
         logger.error(f"User {user_id} does not have valid Slack credentials")
         raise ValueError(f"User {user_id} does not have valid Slack credentials")
     
-    # Create and return an authenticated Slack client
-    return SlackClient(token=slack_credentials.access_token)
\ No newline at end of file
+    # Create, cache and return an authenticated Slack client
+    return cache_client("slack", user_id, SlackClient(token=slack_credentials.access_token))
+
+
+def slack_credential_probe(user_id: int):
+    """Build a SQL expression that is true when the user has usable Slack credentials
+    
+    Args:
+        user_id (int): User ID
+        
+    Returns:
+        Exists: EXISTS clause over the user's Slack credentials
+    """
+    return exists().where(
+        models.SlackCredentials.user_id == user_id,
+        models.SlackCredentials.access_token.isnot(None),
+    )
+
+
+def slack_credential_query(user_ids: List[int]):
+    """Build a query for the stored Slack access tokens of the given users
+    
+    Args:
+        user_ids (List[int]): User IDs
+        
+    Returns:
+        Select: SELECT of (user_id, access_token) over the users' Slack credentials
+    """
+    return select(models.SlackCredentials.user_id, models.SlackCredentials.access_token).filter(
+        models.SlackCredentials.user_id.in_(user_ids)
+    )
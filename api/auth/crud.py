@@ -1,53 +1,88 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import Optional
-from api.models import User
+from api.models import App, User
 from api.schemas import UserCreate
-from .utils import get_password_hash, verify_password
+from .utils import hash_password_async, verify_and_update_password_async
+from .user_cache import invalidate_user
+from .mcp_tokens import mcp_token_validator
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
+def _select_user(with_apps: bool = False):
+    """Build a user query, eagerly loading apps and their tools if requested.
+    
+    Async sessions cannot lazy load, so responses that serialize a user's
+    apps need them loaded up front.
+    """
+    query = select(User)
+    if with_apps:
+        query = query.options(selectinload(User.apps).selectinload(App.tools))
+    return query
+
+async def get_user(db: AsyncSession, user_id: int, with_apps: bool = False) -> Optional[User]:
     """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(_select_user(with_apps).filter(User.id == user_id))
+    return result.scalars().first()
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str, with_apps: bool = False) -> Optional[User]:
     """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(_select_user(with_apps).filter(User.email == email))
+    return result.scalars().first()
 
-def create_user(db: Session, user: UserCreate) -> User:
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Create a new user."""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    await db.refresh(db_user, attribute_names=["apps"])
     return db_user
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """Authenticate a user by email and password."""
-    user = get_user_by_email(db, email)
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Authenticate a user by email and password.
+    
+    Hashes made with an outdated cost factor are replaced on success.
+    """
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> list[User]:
     """Get all users with pagination."""
-    return db.query(User).offset(skip).limit(limit).all()
+    result = await db.execute(select(User).offset(skip).limit(limit))
+    return list(result.scalars().all())
 
-def update_user(db: Session, user: User, is_active: Optional[bool] = None, is_admin: Optional[bool] = None) -> User:
-    """Update user attributes."""
+async def update_user(db: AsyncSession, user: User, is_active: Optional[bool] = None, is_admin: Optional[bool] = None) -> User:
+    """Update user attributes.
+    
+    Deactivating a user revokes their MCP tokens, closing open MCP sessions.
+    """
     if is_active is not None:
         user.is_active = is_active
     if is_admin is not None:
         user.is_admin = is_admin
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.email)
+    if is_active is False:
+        await mcp_token_validator.revoke_user_tokens(db, user.id)
     return user
 
-def delete_user(db: Session, user: User) -> None:
-    """Delete a user."""
-    db.delete(user)
-    db.commit()
+async def delete_user(db: AsyncSession, user: User) -> None:
+    """Delete a user, revoking their MCP tokens first."""
+    email = user.email
+    await mcp_token_validator.revoke_user_tokens(db, user.id)
+    await db.delete(user)
+    await db.commit()
+    invalidate_user(email)
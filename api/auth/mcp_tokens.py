@@ -0,0 +1,329 @@
+import os
+import time
+import hashlib
+import logging
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import database
+from api.cache import LRUCache
+from api.models import MCPToken, User
+from api.usage import usage_tracker
+
+logger = logging.getLogger(__name__)
+
+# Bounds for the validated MCP token cache
+MCP_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("MCP_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+MCP_TOKEN_CACHE_TTL = float(os.getenv("MCP_TOKEN_CACHE_TTL", "300"))
+
+# Seconds between checks for tokens revoked by other processes; bounds how long they stay usable
+MCP_TOKEN_REVOCATION_CHECK_INTERVAL = float(os.getenv("MCP_TOKEN_REVOCATION_CHECK_INTERVAL", "5"))
+
+# Token IDs looked up per revocation check query
+_REVOCATION_CHECK_CHUNK = 500
+
+
+def hash_token(token: str) -> str:
+    """Get the SHA-256 hex digest stored for a token
+
+    Args:
+        token (str): Raw MCP token
+
+    Returns:
+        str: Hash used to look the token up
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes (as SQLite returns them) as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass(frozen=True)
+class ValidatedToken:
+    """Identity of a valid MCP token"""
+    token_id: int
+    user_id: int
+    expires_at: Optional[datetime]
+
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """Check whether the token has expired"""
+        if self.expires_at is None:
+            return False
+        return self.expires_at <= (now or datetime.now(timezone.utc))
+
+
+class MCPTokenValidator:
+    """Validate MCP tokens against their stored hashes
+
+    Valid tokens are cached by hash, so repeat lookups skip the database.
+    Entries never outlive the token's ``expires_at``. Revoking through
+    :meth:`revoke` drops the entry at once. Every process also remembers
+    the tokens it has accepted and, at most every
+    ``MCP_TOKEN_REVOCATION_CHECK_INTERVAL`` seconds, asks the database in
+    one indexed query which of them are still usable, so a revocation or
+    user deactivation made by another worker takes effect within that
+    interval rather than the cache TTL. Tokens of missing or inactive
+    users are treated as revoked. Successful validations record the token's
+    ``last_used_at`` through the usage tracker.
+    """
+
+    def __init__(self, max_entries: int = MCP_TOKEN_CACHE_MAX_ENTRIES, ttl: float = MCP_TOKEN_CACHE_TTL,
+                 check_interval: float = MCP_TOKEN_REVOCATION_CHECK_INTERVAL):
+        """Initialize the validator
+
+        Args:
+            max_entries (int): Maximum number of cached tokens
+            ttl (float): Maximum time in seconds a validated token is cached
+            check_interval (float): Seconds between checks for revocations made by other processes
+        """
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._cache = LRUCache(max_entries=max_entries, ttl=ttl)
+        # Tokens accepted by this process, by ID: (token_hash, expires_at)
+        self._accepted: Dict[int, Tuple[str, Optional[datetime]]] = {}
+        # Revoked token IDs, kept until the token would have expired anyway
+        self._revoked: Dict[int, Optional[datetime]] = {}
+        self._last_check = time.monotonic()
+        self._revocation_listeners: List[Callable[[int], Awaitable[None]]] = []
+
+    async def validate(self, db: AsyncSession, token: str) -> Optional[ValidatedToken]:
+        """Validate a raw MCP token
+
+        Args:
+            db (AsyncSession): Database session, used only on a cache miss
+            token (str): Raw MCP token
+
+        Returns:
+            Optional[ValidatedToken]: The token's identity, or None if it is
+                unknown, revoked or expired, or its user is missing or inactive
+        """
+        if not token:
+            return None
+        token_hash = hash_token(token)
+        now = datetime.now(timezone.utc)
+
+        validated = self._cache.get(token_hash)
+        if validated is not None:
+            if self.check_due():
+                await self.sync_revocations(db)
+            if validated.is_expired(now) or self.is_revoked(validated.token_id):
+                self._cache.pop(token_hash)
+                return None
+            usage_tracker.touch(MCPToken, validated.token_id, now)
+            return validated
+
+        result = await db.execute(
+            select(MCPToken)
+            .join(User, User.id == MCPToken.user_id)
+            .filter(MCPToken.token_hash == token_hash, User.is_active.is_(True))
+        )
+        row = result.scalars().first()
+        if row is None or row.is_revoked:
+            return None
+        validated = ValidatedToken(token_id=row.id, user_id=row.user_id, expires_at=_as_utc(row.expires_at))
+        if validated.is_expired(now):
+            return None
+
+        ttl = self.ttl
+        if validated.expires_at is not None:
+            ttl = min(ttl, (validated.expires_at - now).total_seconds())
+        self._cache.set(token_hash, validated, ttl=ttl)
+        self._accepted[validated.token_id] = (token_hash, validated.expires_at)
+        usage_tracker.touch(MCPToken, validated.token_id, now)
+        return validated
+
+    async def issue(self, db: AsyncSession, user_id: int, expires_at: datetime) -> str:
+        """Create a token for a user, storing only its hash
+
+        Args:
+            db (AsyncSession): Database session
+            user_id (int): User ID
+            expires_at (datetime): When the token expires
+
+        Returns:
+            str: The raw token, which cannot be recovered later
+        """
+        token = secrets.token_hex(32)
+        db.add(MCPToken(user_id=user_id, token_hash=hash_token(token), expires_at=expires_at))
+        await db.commit()
+        return token
+
+    async def revoke(self, db: AsyncSession, token_id: int, user_id: int) -> bool:
+        """Revoke one of a user's tokens
+
+        The revocation is effective immediately in this process and within
+        ``check_interval`` in every other one.
+
+        Args:
+            db (AsyncSession): Database session
+            token_id (int): Token ID
+            user_id (int): ID of the user who owns the token
+
+        Returns:
+            bool: True if the token was found and revoked
+        """
+        result = await db.execute(
+            select(MCPToken).filter(MCPToken.id == token_id, MCPToken.user_id == user_id)
+        )
+        row = result.scalars().first()
+        if row is None:
+            return False
+        row.is_revoked = True
+        await db.commit()
+        self._mark_revoked(row.id, row.token_hash, _as_utc(row.expires_at))
+        logger.info(f"Revoked MCP token {token_id} for user {user_id}")
+        await self._notify_revoked([row.id])
+        return True
+
+    async def revoke_user_tokens(self, db: AsyncSession, user_id: int) -> int:
+        """Revoke every token of a user, e.g. when the user is deactivated or deleted
+
+        Args:
+            db (AsyncSession): Database session
+            user_id (int): User ID
+
+        Returns:
+            int: Number of tokens revoked
+        """
+        result = await db.execute(
+            select(MCPToken).filter(MCPToken.user_id == user_id, MCPToken.is_revoked.isnot(True))
+        )
+        rows = list(result.scalars())
+        if not rows:
+            return 0
+        for row in rows:
+            row.is_revoked = True
+        await db.commit()
+        for row in rows:
+            self._mark_revoked(row.id, row.token_hash, _as_utc(row.expires_at))
+        logger.info(f"Revoked {len(rows)} MCP tokens for user {user_id}")
+        await self._notify_revoked([row.id for row in rows])
+        return len(rows)
+
+    def add_revocation_listener(self, listener: Callable[[int], Awaitable[None]]) -> None:
+        """Call a coroutine function with the ID of every token this process sees revoked
+
+        Args:
+            listener (Callable[[int], Awaitable[None]]): Called with the token ID,
+                e.g. to close sessions opened with the token
+        """
+        self._revocation_listeners.append(listener)
+
+    async def _notify_revoked(self, token_ids: List[int]) -> None:
+        """Tell revocation listeners about newly revoked tokens"""
+        for token_id in token_ids:
+            for listener in self._revocation_listeners:
+                try:
+                    await listener(token_id)
+                except Exception as e:
+                    logger.error(f"Revocation listener failed for MCP token {token_id}: {str(e)}")
+
+    async def is_active(self, validated: ValidatedToken) -> bool:
+        """Check that a token accepted earlier is neither expired nor revoked
+
+        Long-lived connections authenticate once; this lets them re-check the
+        token cheaply. When a revocation check is due it runs first, with a
+        short-lived database session.
+
+        Args:
+            validated (ValidatedToken): Token returned by :meth:`validate`
+
+        Returns:
+            bool: True if the token may still be used
+        """
+        if validated.is_expired():
+            return False
+        if self.check_due():
+            async with database.AsyncSessionLocal() as db:
+                await self.sync_revocations(db)
+        return not self.is_revoked(validated.token_id)
+
+    def check_due(self) -> bool:
+        """Check whether it is time to look for revocations made by other processes"""
+        return time.monotonic() - self._last_check >= self.check_interval
+
+    async def sync_revocations(self, db: AsyncSession) -> None:
+        """Drop accepted tokens that have been revoked, possibly by another process
+
+        Tokens that were deleted, or whose user was deactivated or deleted,
+        are dropped as revoked too.
+
+        Args:
+            db (AsyncSession): Database session
+        """
+        self._last_check = time.monotonic()
+        now = datetime.now(timezone.utc)
+        for token_id, (token_hash, expires_at) in list(self._accepted.items()):
+            if expires_at is not None and expires_at <= now:
+                del self._accepted[token_id]
+        for token_id, expires_at in list(self._revoked.items()):
+            if expires_at is not None and expires_at <= now:
+                del self._revoked[token_id]
+
+        token_ids = list(self._accepted)
+        revoked = []
+        for start in range(0, len(token_ids), _REVOCATION_CHECK_CHUNK):
+            chunk = token_ids[start:start + _REVOCATION_CHECK_CHUNK]
+            result = await db.execute(
+                select(MCPToken.id)
+                .join(User, User.id == MCPToken.user_id)
+                .filter(MCPToken.id.in_(chunk), MCPToken.is_revoked.isnot(True), User.is_active.is_(True))
+            )
+            usable = set(result.scalars())
+            for token_id in chunk:
+                if token_id in usable or token_id not in self._accepted:
+                    continue
+                token_hash, expires_at = self._accepted[token_id]
+                self._mark_revoked(token_id, token_hash, expires_at)
+                revoked.append(token_id)
+                logger.info(f"MCP token {token_id} was revoked or its user deactivated elsewhere")
+        await self._notify_revoked(revoked)
+
+    def is_revoked(self, token_id: int) -> bool:
+        """Check whether this process knows a token to be revoked
+
+        Args:
+            token_id (int): Token ID
+
+        Returns:
+            bool: True if the token was revoked here or seen revoked by the last check
+        """
+        return token_id in self._revoked
+
+    def _mark_revoked(self, token_id: int, token_hash: Optional[str], expires_at: Optional[datetime]) -> None:
+        """Record a revoked token and drop it from the cache"""
+        self._accepted.pop(token_id, None)
+        self._revoked[token_id] = expires_at
+        self.invalidate(token_hash)
+
+    def invalidate(self, token_hash: Optional[str]) -> None:
+        """Drop a token from the cache
+
+        Args:
+            token_hash (Optional[str]): Hash of the token
+        """
+        if token_hash:
+            self._cache.pop(token_hash)
+
+    def clear(self) -> None:
+        """Drop every cached token and known revocation"""
+        self._cache.clear()
+        self._accepted.clear()
+        self._revoked.clear()
+
+    def stats(self):
+        """Get cache counters for metrics"""
+        return {**self._cache.stats(), "accepted": len(self._accepted), "revoked": len(self._revoked)}
+
+
+# Process-wide MCP token validator
+mcp_token_validator = MCPTokenValidator()
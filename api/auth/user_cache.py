@@ -0,0 +1,145 @@
+import os
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import LRUCache
+from api.models import User
+
+logger = logging.getLogger(__name__)
+
+# Bounds for the authenticated-user snapshot cache
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_ENABLED = os.getenv("USER_CACHE_ENABLED", "True").lower() == "true"
+
+# Seconds between checks for users changed or deleted by other processes; bounds how long they see stale snapshots
+USER_CACHE_CHECK_INTERVAL = float(os.getenv("USER_CACHE_CHECK_INTERVAL", "5"))
+
+# User IDs looked up per staleness check query
+_CHECK_CHUNK = 500
+
+_last_check = time.monotonic()
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Read-only copy of the user columns needed to authorize a request"""
+    id: int
+    email: str
+    is_active: bool
+    is_admin: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        """Copy a User row into a snapshot"""
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+# Snapshots keyed by token subject (the user's email)
+user_cache = LRUCache(max_entries=USER_CACHE_MAX_ENTRIES)
+
+
+def get_cached_user(subject: str) -> Optional[UserSnapshot]:
+    """Get the cached snapshot for a token subject
+
+    Args:
+        subject (str): The token's ``sub`` claim
+
+    Returns:
+        Optional[UserSnapshot]: Snapshot, or None on a miss
+    """
+    if not USER_CACHE_ENABLED:
+        return None
+    return user_cache.get(subject)
+
+
+def cache_user(subject: str, user, expires_at: Optional[float] = None) -> UserSnapshot:
+    """Cache a snapshot of a user, never beyond the token's expiry
+
+    Args:
+        subject (str): The token's ``sub`` claim
+        user: The User row
+        expires_at (Optional[float], optional): The token's ``exp`` as a Unix timestamp
+
+    Returns:
+        UserSnapshot: The cached snapshot
+    """
+    snapshot = UserSnapshot.from_user(user)
+    if not USER_CACHE_ENABLED:
+        return snapshot
+    ttl = USER_CACHE_TTL
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        user_cache.set(subject, snapshot, ttl=ttl)
+    return snapshot
+
+
+def check_due() -> bool:
+    """Check whether it is time to look for users changed by other processes"""
+    return time.monotonic() - _last_check >= USER_CACHE_CHECK_INTERVAL
+
+
+async def sync_users(db: AsyncSession) -> int:
+    """Drop snapshots of users changed or deleted since they were cached, possibly by another process
+
+    :func:`invalidate_user` only reaches this process. Every process
+    therefore compares its cached snapshots with their rows, in one query
+    by primary key, at most every USER_CACHE_CHECK_INTERVAL seconds, so a
+    deactivation or demotion made by another worker takes effect within
+    that interval.
+
+    Args:
+        db (AsyncSession): Database session
+
+    Returns:
+        int: Number of snapshots dropped
+    """
+    global _last_check
+    _last_check = time.monotonic()
+    cached = user_cache.items()
+    rows = {}
+    for start in range(0, len(cached), _CHECK_CHUNK):
+        ids = [snapshot.id for _, snapshot in cached[start:start + _CHECK_CHUNK]]
+        result = await db.execute(
+            select(User.id, User.email, User.is_active, User.is_admin, User.updated_at).filter(User.id.in_(ids))
+        )
+        rows.update({row.id: row for row in result})
+
+    dropped = 0
+    for subject, snapshot in cached:
+        row = rows.get(snapshot.id)
+        if row is None or (row.email, row.is_active, row.is_admin, row.updated_at) != (
+            snapshot.email, snapshot.is_active, snapshot.is_admin, snapshot.updated_at
+        ):
+            user_cache.pop(subject)
+            dropped += 1
+    if dropped:
+        logger.info(f"Dropped {dropped} stale user snapshots")
+    return dropped
+
+
+def invalidate_user(email: str) -> None:
+    """Drop a user's snapshot so changes take effect on the next request in this process
+
+    Other processes pick the change up through :func:`sync_users`.
+
+    Args:
+        email (str): The user's email
+    """
+    user_cache.pop(email)
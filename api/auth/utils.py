@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+import asyncio
 import os
+import threading
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from dotenv import load_dotenv
@@ -9,7 +12,21 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below BCRYPT_ROUNDS are upgraded the next time their user logs in
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+# Worker pool for password hashing, kept apart from the event loop and tool pools
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread").lower()
+
+_hash_pool: Optional[Executor] = None
+_hash_pool_lock = threading.Lock()
 
 # JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -24,6 +41,43 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and get a new hash if the stored one is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _get_hash_pool() -> Executor:
+    """Get the password hashing pool, creating it on first use."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            if PASSWORD_HASH_POOL == "process":
+                _hash_pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+            else:
+                _hash_pool = ThreadPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+                )
+        return _hash_pool
+
+async def hash_password_async(password: str) -> str:
+    """Generate a password hash in the hashing pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hash_pool(), get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password in the hashing pool, returning a new hash if the stored one is outdated."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_hash_pool(), verify_and_update_password, plain_password, hashed_password
+    )
+
+def shutdown_hash_pool() -> None:
+    """Shut down the password hashing pool."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -0,0 +1,156 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class LRUCache:
+    """Thread-safe LRU cache with optional size budget and per-entry TTL
+
+    Entries are evicted least recently used first once either
+    ``max_entries`` or ``max_size`` is exceeded. Each entry carries a size
+    (1 by default) counted against ``max_size``, so callers can budget by
+    bytes. Expired entries are dropped when they are read.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        """Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of entries
+            max_size (Optional[int], optional): Maximum total size of all entries. Defaults to no limit.
+            ttl (Optional[float], optional): Default time to live in seconds. Defaults to no expiry.
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, marking it as recently used
+
+        Args:
+            key (Hashable): Cache key
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: Cached value, or ``default`` if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: int = 1, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries as needed
+
+        Args:
+            key (Hashable): Cache key
+            value (Any): Value to store
+            size (int, optional): Size counted against ``max_size``. Defaults to 1.
+            ttl (Optional[float], optional): Time to live in seconds, overriding the default
+        """
+        if self.max_size is not None and size > self.max_size:
+            # Never cache an entry that could not fit on its own
+            self.pop(key)
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_size is not None and self._size > self.max_size)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry
+
+        Args:
+            key (Hashable): Cache key
+            default (Any, optional): Value returned if the key is missing
+
+        Returns:
+            Any: Removed value, or ``default``
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            return self._remove(key)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches a predicate
+
+        Args:
+            predicate (Callable[[Hashable], bool]): Called with each key
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Get a snapshot of the unexpired entries, without marking them as used
+
+        Returns:
+            List[Tuple[Hashable, Any]]: Key and value of each entry
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, _, expires_at) in self._entries.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable) -> Any:
+        """Remove an entry; the caller must hold the lock"""
+        value, size, _ = self._entries.pop(key)
+        self._size -= size
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters for metrics
+
+        Returns:
+            Dict[str, int]: Entries, size, hits, misses and evictions
+        """
+        return {
+            "entries": len(self._entries),
+            "size": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
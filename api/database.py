@@ -1,8 +1,17 @@
 import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from api.db_pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+    pool_settings,
+)
 
 # Load environment variables
 load_dotenv()
@@ -24,15 +33,50 @@ else:
     # PostgreSQL configuration (for production)
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=1800,
+        poolclass=InstrumentedQueuePool,
+        **pool_settings(),
     )
+instrument_pool(engine, "sync")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def get_async_database_url(url: str) -> str:
+    """Get the async driver URL for a database URL
+    
+    Args:
+        url (str): Sync database URL (e.g. postgresql://... or sqlite:///...)
+        
+    Returns:
+        str: The same database using asyncpg or aiosqlite
+    """
+    scheme, sep, rest = url.partition("://")
+    driver = scheme.split("+")[0]
+    if driver in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if driver == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", get_async_database_url(SQLALCHEMY_DATABASE_URL))
+
+# Async engine used by request handlers so queries do not block the event loop
+if is_testing or "sqlite" in ASYNC_SQLALCHEMY_DATABASE_URL:
+    # SQLite connections are cheap, and pooling them across event loops is unsafe
+    async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+else:
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **pool_settings(),
+    )
+instrument_pool(async_engine, "async")
+
+# Create async session factory; objects stay usable after commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create base class for declarative models
 Base = declarative_base()
 
@@ -47,3 +91,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency function to get an async database session.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,117 @@
+import os
+import time
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing for the PostgreSQL engines (each engine, sync and async, gets its own pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "False").lower() == "true"
+# Checkouts waiting longer than this are logged as a sign of pool starvation
+DB_POOL_SLOW_CHECKOUT_MS = float(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", "100"))
+
+# Instrumented pools keyed by engine name
+_pools: Dict[str, Pool] = {}
+
+
+def pool_settings() -> Dict[str, Any]:
+    """Get engine keyword arguments for pool sizing
+
+    Returns:
+        Dict[str, Any]: pool_size, max_overflow, pool_timeout, pool_recycle and pool_pre_ping
+    """
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+class _TimedCheckoutMixin:
+    """Record how long each checkout waits for a connection"""
+
+    engine_name = "default"
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        waited = time.perf_counter() - started
+        metrics.observe("db_pool_checkout_wait_seconds", waited, engine=self.engine_name)
+        metrics.observe("db_pool_checked_out", self.checkedout(), engine=self.engine_name)
+        if self.overflow() > 0:
+            metrics.increment("db_pool_overflow_checkouts", engine=self.engine_name)
+        if waited * 1000 >= DB_POOL_SLOW_CHECKOUT_MS:
+            metrics.increment("db_pool_slow_checkouts", engine=self.engine_name)
+            logger.warning(
+                f"Waited {waited * 1000:.0f} ms for a {self.engine_name} DB connection "
+                f"({self.checkedout()} checked out, overflow {self.overflow()}, size {self.size()})"
+            )
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records checkout wait time"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time"""
+
+
+def instrument_pool(engine, name: str) -> None:
+    """Attach metrics listeners to an engine's connection pool
+
+    Records connection age on each checkout and counts connects, and makes
+    the pool's counters available through :func:`pool_stats`.
+
+    Args:
+        engine: Sync Engine, or AsyncEngine (its sync engine is used)
+        name (str): Engine name used as the metrics label
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    pool = engine.pool
+    if isinstance(pool, _TimedCheckoutMixin):
+        pool.engine_name = name
+    _pools[name] = pool
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        metrics.increment("db_pool_connects", engine=name)
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            metrics.observe("db_connection_age_seconds", time.monotonic() - connected_at, engine=name)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Get current counters for every instrumented pool
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Size, checked out, checked in and overflow per engine
+    """
+    stats = {}
+    for name, pool in _pools.items():
+        if isinstance(pool, QueuePool):
+            stats[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+            }
+        else:
+            stats[name] = {"pool": type(pool).__name__}
+    return stats
@@ -1,15 +1,23 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from .database import get_db
+from .database import get_async_db
 from .auth import crud, utils
+from .auth import user_cache
+from .auth.user_cache import get_cached_user, cache_user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Get the current authenticated user."""
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Get the current authenticated user.
+    
+    Returns a cached snapshot of the user when one is available so most
+    requests skip the database lookup. Snapshots are checked against the
+    database every USER_CACHE_CHECK_INTERVAL seconds, so changes made by
+    other workers take effect within that interval.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -20,11 +28,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if payload is None:
         raise credentials_exception
     
-    user = crud.get_user_by_email(db, payload.get("sub"))
+    subject = payload.get("sub")
+    user = get_cached_user(subject)
+    if user is not None and user_cache.check_due():
+        await user_cache.sync_users(db)
+        user = get_cached_user(subject)
+    if user is not None:
+        return user
+    
+    user = await crud.get_user_by_email(db, subject)
     if user is None:
         raise credentials_exception
     
-    return user
+    return cache_user(subject, user, payload.get("exp"))
 
 def get_current_active_user(current_user = Depends(get_current_user)):
     """Get the current active user."""
@@ -0,0 +1,287 @@
+import os
+import time
+import asyncio
+import inspect
+import logging
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Dict, Any, Optional, AsyncIterator
+
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Default number of concurrent tool calls allowed per app
+APP_CONCURRENCY_DEFAULT = int(os.getenv("APP_CONCURRENCY_DEFAULT", "10"))
+
+# Default deadline in seconds for one tool call, including time queued for a slot (0 disables it)
+TOOL_CALL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "60"))
+
+
+def _parse_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse per-app concurrency limits from an "app=limit,..." string
+
+    Args:
+        value (Optional[str]): Limit specification, e.g. "github=20,slack=5"
+
+    Returns:
+        Dict[str, int]: Concurrency limit keyed by app name
+    """
+    limits = {}
+    if not value:
+        return limits
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        app_name, limit = item.split("=", 1)
+        try:
+            limits[app_name.strip()] = int(limit)
+        except ValueError:
+            logger.warning(f"Ignoring invalid concurrency limit for {app_name.strip()}: {limit}")
+    return limits
+
+
+class AppSlots:
+    """Counting limiter for one app's calls whose capacity can change while slots are held
+
+    Unlike ``asyncio.Semaphore``, resizing keeps the count of held slots, so
+    lowering or raising the limit never lets more calls run than the new cap.
+    """
+
+    def __init__(self, limit: int):
+        """Initialize with no slots held
+
+        Args:
+            limit (int): Maximum number of slots held at once
+        """
+        self.limit = limit
+        self.held = 0
+        self._waiters: deque = deque()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and hold it"""
+        if self.held < self.limit and not self._waiters:
+            self.held += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as the wait was cancelled
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Give back a held slot"""
+        self.held -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        """Change the limit; calls already holding slots keep them
+
+        Args:
+            limit (int): New maximum number of slots held at once
+        """
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        """Grant free slots to waiters in arrival order"""
+        while self._waiters and self.held < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.held += 1
+                waiter.set_result(None)
+
+
+class ToolExecutor:
+    """Runs tool handlers with a concurrency cap per app
+
+    Async handlers are awaited on the event loop. Synchronous handlers run
+    in a thread pool owned by their app and sized to the app's cap, so a
+    burst of calls to one app cannot take the workers another app needs.
+    Time spent waiting for a slot is recorded as the
+    ``tool_queue_wait_seconds`` metric.
+
+    Cancelling a call, directly or through its deadline, cancels the
+    handler's task, which aborts its in-flight upstream request, and frees
+    its slot at once. Synchronous handlers cannot be interrupted, so their
+    thread finishes in the background.
+    """
+
+    def __init__(self, default_limit: int = APP_CONCURRENCY_DEFAULT, limits: Optional[Dict[str, int]] = None):
+        """Initialize the executor
+
+        Args:
+            default_limit (int): Concurrency cap for apps without an explicit limit
+            limits (Optional[Dict[str, int]], optional): Concurrency caps keyed by app name
+        """
+        self.default_limit = default_limit
+        self.limits: Dict[str, int] = dict(limits or {})
+        self._slots: Dict[str, AppSlots] = {}
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._waiting: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+
+    def set_limit(self, app_name: str, limit: int) -> None:
+        """Set the concurrency cap for an app
+
+        Args:
+            app_name (str): The name of the app
+            limit (int): Maximum concurrent tool calls for the app
+        """
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.limits[app_name] = limit
+        # Resize in place so calls holding slots still count against the new cap
+        slots = self._slots.get(app_name)
+        if slots is not None:
+            slots.resize(limit)
+        # Recreate the thread pool with the new size on next use; running threads finish
+        pool = self._pools.pop(app_name, None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def get_limit(self, app_name: str) -> int:
+        """Get the concurrency cap for an app"""
+        return self.limits.get(app_name, self.default_limit)
+
+    def _app_slots(self, app_name: str) -> AppSlots:
+        """Get the limiter bounding an app's concurrent calls"""
+        if app_name not in self._slots:
+            self._slots[app_name] = AppSlots(self.get_limit(app_name))
+        return self._slots[app_name]
+
+    def _pool(self, app_name: str) -> ThreadPoolExecutor:
+        """Get the thread pool running an app's synchronous handlers"""
+        if app_name not in self._pools:
+            self._pools[app_name] = ThreadPoolExecutor(
+                max_workers=self.get_limit(app_name),
+                thread_name_prefix=f"tool-{app_name}"
+            )
+        return self._pools[app_name]
+
+    @asynccontextmanager
+    async def _slot(self, app_name: str):
+        """Hold one of an app's concurrency slots, recording the queue wait"""
+        slots = self._app_slots(app_name)
+        self._waiting[app_name] = self._waiting.get(app_name, 0) + 1
+        queued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting[app_name] -= 1
+        metrics.observe("tool_queue_wait_seconds", time.perf_counter() - queued_at, app=app_name)
+
+        self._running[app_name] = self._running.get(app_name, 0) + 1
+        try:
+            yield
+        finally:
+            self._running[app_name] -= 1
+            slots.release()
+
+    async def run(self, app_name: str, handler, tool_name: str, parameters: Dict[str, Any],
+                  timeout: Optional[float] = None) -> Any:
+        """Execute a tool on a handler within the app's concurrency cap
+
+        Args:
+            app_name (str): The name of the app
+            handler: Tool handler created by the app's factory
+            tool_name (str): Name of the tool to execute
+            parameters (Dict[str, Any]): Tool parameters
+            timeout (Optional[float], optional): Deadline in seconds for the call,
+                including time queued for a slot. Defaults to no deadline.
+
+        Returns:
+            Any: Result of the tool execution
+
+        Raises:
+            TimeoutError: If the call does not finish before its deadline
+        """
+        try:
+            if not timeout:
+                return await self._run(app_name, handler, tool_name, parameters)
+            return await asyncio.wait_for(self._run(app_name, handler, tool_name, parameters), timeout)
+        except asyncio.TimeoutError:
+            metrics.increment("tool_call_timeouts", app=app_name)
+            raise TimeoutError(f"Tool {tool_name} timed out after {timeout:g} seconds")
+        except asyncio.CancelledError:
+            metrics.increment("tool_calls_cancelled", app=app_name)
+            raise
+
+    async def _run(self, app_name: str, handler, tool_name: str, parameters: Dict[str, Any]) -> Any:
+        """Execute a tool within the app's concurrency cap, without a deadline"""
+        async with self._slot(app_name):
+            if inspect.iscoroutinefunction(handler.execute_tool):
+                return await handler.execute_tool(tool_name, parameters)
+
+            # Copy the context so the call's progress reporter is visible in the worker thread
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            result = await loop.run_in_executor(
+                self._pool(app_name),
+                partial(context.run, handler.execute_tool, tool_name, parameters)
+            )
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    async def stream(self, app_name: str, handler, tool_name: str, parameters: Dict[str, Any]) -> AsyncIterator[Any]:
+        """Stream a tool's results within the app's concurrency cap
+
+        The app slot is held until the stream is exhausted or closed.
+
+        Args:
+            app_name (str): The name of the app
+            handler: Tool handler implementing ``stream_tool``
+            tool_name (str): Name of the tool to stream
+            parameters (Dict[str, Any]): Tool parameters
+
+        Yields:
+            Any: Chunks produced by the handler, e.g. pages of items
+        """
+        async with self._slot(app_name):
+            chunks = handler.stream_tool(tool_name, parameters)
+            if inspect.isawaitable(chunks):
+                chunks = await chunks
+            async for chunk in chunks:
+                yield chunk
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get running and waiting call counts per app for metrics
+
+        Returns:
+            Dict[str, Dict[str, int]]: Limit, running and waiting counts keyed by app
+        """
+        apps = set(self._running) | set(self._waiting)
+        return {
+            app_name: {
+                "limit": self.get_limit(app_name),
+                "running": self._running.get(app_name, 0),
+                "waiting": self._waiting.get(app_name, 0),
+            }
+            for app_name in sorted(apps)
+        }
+
+    def reset(self) -> None:
+        """Drop every app's slot limiter"""
+        self._slots.clear()
+
+    def shutdown(self) -> None:
+        """Shut down every app thread pool"""
+        for pool in self._pools.values():
+            pool.shutdown(wait=False)
+        self._pools.clear()
+        self.reset()
+
+
+# Process-wide tool executor
+tool_executor = ToolExecutor(limits=_parse_limits(os.getenv("APP_CONCURRENCY_LIMITS")))
@@ -1,79 +1,171 @@
+import time
+
+# Measured from the first line so the cost of importing dependencies is included
+_IMPORT_STARTED = time.perf_counter()
+
+import os
+import logging
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers import auth, tools, health, apps
-from api.database import engine, Base
-from api.dependencies import get_current_active_user
-from api.apps.github.routes import router as github_router
-from api.apps.slack.routes import router as slack_router
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="MCP Aggregator",
-    description="A centralized location for LLM applications to access external context, tools, and prompts",
-    version="0.1.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Update this with your frontend URL in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(
-    auth.router,
-    prefix="/api/v1",
-    tags=["authentication"]
-)
-
-app.include_router(
-    tools.router,
-    prefix="/api/v1",
-    tags=["tools"],
-    dependencies=[Depends(get_current_active_user)]
-)
-
-app.include_router(
-    health.router,
-    prefix="/api/v1",
-    tags=["health"]
-)
-
-# Include Apps router
-app.include_router(
-    apps.router,
-    prefix="/api/v1",
-    tags=["apps"]
-)
-
-# Include GitHub router
-app.include_router(
-    github_router,
-    dependencies=[Depends(get_current_active_user)]
-)
-
-# Include Slack router
-app.include_router(
-    slack_router,
-    dependencies=[Depends(get_current_active_user)]
-)
-
-@app.get("/")
-async def root():
-    return {
-        "message": "Welcome to MCP Aggregator API",
-        "docs": "/api/docs",
-        "redoc": "/api/redoc",
-        "openapi": "/api/openapi.json"
-    }
+
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Settings below are read at import, before api.database loads .env
+load_dotenv()
+
+# Create missing tables on startup. The Alembic chain assumes the base tables
+# (users, apps, tools) already exist, so a fresh database needs this.
+CREATE_SCHEMA_ON_STARTUP = os.getenv("CREATE_SCHEMA_ON_STARTUP", "False").lower() == "true"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start shared resources before serving and release them on shutdown
+
+    Args:
+        app (FastAPI): The application
+    """
+    from api.database import async_engine, Base
+    from api.apps.http import connection_manager
+    from api.apps import client_cache
+    from api.executor import tool_executor
+    from api.auth.utils import shutdown_hash_pool
+    from api.usage import usage_tracker
+    from api.mcp_server import mcp_sessions
+
+    started = time.perf_counter()
+    if app.state.create_schema:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    # Start idle eviction of pooled upstream connections
+    await connection_manager.start()
+    # Start periodic flushing of buffered usage timestamps
+    usage_tracker.start()
+    # Start periodic closing of idle MCP sessions and those of revoked tokens
+    mcp_sessions.start()
+    # Start periodic checks for app credentials changed by other workers
+    client_cache.start_credential_checks()
+    startup_seconds = time.perf_counter() - started
+    metrics.observe("app_startup_seconds", startup_seconds)
+    logger.info(f"Application started in {startup_seconds * 1000:.1f} ms")
+
+    try:
+        yield
+    finally:
+        # Cancel calls still running in open MCP sessions
+        await mcp_sessions.stop()
+        await mcp_sessions.close_all()
+        await client_cache.stop_credential_checks()
+        await connection_manager.close()
+        # Write pending usage timestamps before the database is closed
+        await usage_tracker.stop()
+        await async_engine.dispose()
+        tool_executor.shutdown()
+        shutdown_hash_pool()
+
+
+def create_app(create_schema: bool = CREATE_SCHEMA_ON_STARTUP) -> FastAPI:
+    """Create the API application
+
+    Routers and app packages are imported here, so importing this module
+    does not load every app or touch the database.
+
+    Args:
+        create_schema (bool, optional): Create missing tables on startup.
+            Defaults to CREATE_SCHEMA_ON_STARTUP.
+
+    Returns:
+        FastAPI: The configured application
+    """
+    started = time.perf_counter()
+    from api.routers import auth, tools, health, apps, mcp
+    from api.dependencies import get_current_active_user
+
+    app = FastAPI(
+        title="MCP Aggregator",
+        description="A centralized location for LLM applications to access external context, tools, and prompts",
+        version="0.1.0",
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        openapi_url="/api/openapi.json",
+        lifespan=lifespan,
+    )
+    app.state.create_schema = create_schema
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Update this with your frontend URL in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    app.include_router(
+        auth.router,
+        prefix="/api/v1",
+        tags=["authentication"]
+    )
+
+    app.include_router(
+        tools.router,
+        prefix="/api/v1",
+        tags=["tools"],
+        dependencies=[Depends(get_current_active_user)]
+    )
+
+    app.include_router(
+        health.router,
+        prefix="/api/v1",
+        tags=["health"]
+    )
+
+    # Include Apps router
+    app.include_router(
+        apps.router,
+        prefix="/api/v1",
+        tags=["apps"]
+    )
+
+    # MCP clients authenticate with their MCP token rather than a JWT
+    app.include_router(
+        mcp.router,
+        prefix="/api/v1",
+        tags=["mcp"]
+    )
+
+    # Register installed apps (GitHub, Slack, ...) and include their own routers
+    for module in tools.load_apps():
+        if hasattr(module, "get_router"):
+            app.include_router(
+                module.get_router(),
+                dependencies=[Depends(get_current_active_user)]
+            )
+
+    @app.get("/")
+    async def root():
+        return {
+            "message": "Welcome to MCP Aggregator API",
+            "docs": "/api/docs",
+            "redoc": "/api/redoc",
+            "openapi": "/api/openapi.json"
+        }
+
+    metrics.observe("app_create_seconds", time.perf_counter() - started)
+    return app
+
+
+app = create_app()
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+metrics.observe("app_import_seconds", IMPORT_SECONDS)
+logger.info(f"api.main imported in {IMPORT_SECONDS * 1000:.1f} ms")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,508 @@
+import os
+import json
+import asyncio
+import logging
+import secrets
+import time
+from typing import Callable, Dict, Any, Optional
+
+from fastapi import HTTPException
+
+from api import database
+from api.apps.availability import get_available_app_names
+from api.auth.mcp_tokens import ValidatedToken, mcp_token_validator
+from api.metrics import metrics
+from api.progress import ProgressReporter, progress_context
+from api.tool_catalog import tool_catalog, EncodedPayload
+
+logger = logging.getLogger(__name__)
+
+# Protocol versions this server speaks, newest first
+SUPPORTED_PROTOCOL_VERSIONS = ["2025-03-26", "2024-11-05"]
+
+SERVER_INFO = {"name": "mcp-aggregator", "version": "0.1.0"}
+
+# Maximum concurrent tool calls within one MCP session
+MCP_SESSION_MAX_CONCURRENCY = int(os.getenv("MCP_SESSION_MAX_CONCURRENCY", "10"))
+
+# Seconds a session without a stream or in-flight calls is kept open
+MCP_SESSION_IDLE_TIMEOUT = float(os.getenv("MCP_SESSION_IDLE_TIMEOUT", "1800"))
+
+# Seconds between sweeps closing idle sessions and sessions of expired or revoked tokens
+MCP_SESSION_SWEEP_INTERVAL = float(os.getenv("MCP_SESSION_SWEEP_INTERVAL", "60"))
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class JSONRPCError(Exception):
+    """Error returned to the client as a JSON-RPC error object"""
+
+    def __init__(self, code: int, message: str):
+        """Initialize the error
+
+        Args:
+            code (int): JSON-RPC error code
+            message (str): Error message
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def error_response(message_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """Build a JSON-RPC error response"""
+    return {"jsonrpc": "2.0", "id": message_id, "error": {"code": code, "message": message}}
+
+
+def expects_response(message: Any) -> bool:
+    """Check whether a JSON-RPC message is answered, i.e. it is a request or invalid
+
+    Args:
+        message (Any): Decoded JSON-RPC message
+
+    Returns:
+        bool: False for notifications and for responses sent by the client
+    """
+    if not isinstance(message, dict) or message.get("jsonrpc") != "2.0":
+        return True
+    if "method" in message:
+        return "id" in message
+    return "id" not in message
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a JSON-RPC message, splicing in pre-encoded results as they are
+
+    Args:
+        message (Dict[str, Any]): Response or notification
+
+    Returns:
+        bytes: Compact JSON
+    """
+    result = message.get("result")
+    if isinstance(result, EncodedPayload):
+        envelope = {key: value for key, value in message.items() if key != "result"}
+        head = json.dumps(envelope, separators=(",", ":"), default=str).encode()
+        return head[:-1] + b',"result":' + result.data + b"}"
+    return json.dumps(message, separators=(",", ":"), default=str).encode()
+
+
+def tool_result(result: Any, is_error: bool = False) -> Dict[str, Any]:
+    """Wrap a tool's result as MCP text content
+
+    Args:
+        result (Any): Tool result, or an error message
+        is_error (bool, optional): Whether the call failed
+
+    Returns:
+        Dict[str, Any]: ``tools/call`` result
+    """
+    text = result if isinstance(result, str) else json.dumps(result, default=str)
+    return {"content": [{"type": "text", "text": text}], "isError": is_error}
+
+
+class MCPSession:
+    """State of one authenticated MCP client connection
+
+    The session is authenticated once with an MCP token when it is opened,
+    so messages within it skip token validation; transports re-check the
+    token with :meth:`is_authorized`, and the session is closed when the
+    token is revoked. Handlers are built once per
+    app and reused by every call. Tool calls run as separate tasks, up to
+    MCP_SESSION_MAX_CONCURRENCY at a time, through the same executor and
+    result cache as the REST endpoints. Responses and notifications are
+    queued on :attr:`outgoing` for the transport to deliver, unless a
+    message is started with its own ``send`` target.
+    """
+
+    def __init__(self, token: ValidatedToken, max_concurrency: int = MCP_SESSION_MAX_CONCURRENCY):
+        """Initialize the session
+
+        Args:
+            token (ValidatedToken): The MCP token the session was opened with
+            max_concurrency (int): Maximum concurrent tool calls in the session
+        """
+        self.session_id = secrets.token_urlsafe(24)
+        self.token = token
+        self.user_id = token.user_id
+        self.protocol_version: Optional[str] = None
+        self.outgoing: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        self._handlers: Dict[str, Any] = {}
+        self._handler_locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Dict[Any, asyncio.Task] = {}
+        self.last_active = time.monotonic()
+        self.closed = False
+
+    def is_expired(self) -> bool:
+        """Check whether the session's token has expired"""
+        return self.token.is_expired()
+
+    async def is_authorized(self) -> bool:
+        """Check that the session's token has not expired or been revoked and its user is still active"""
+        return await mcp_token_validator.is_active(self.token)
+
+    def touch(self) -> None:
+        """Record activity so the session is not closed as idle"""
+        self.last_active = time.monotonic()
+
+    def is_idle(self, timeout: float = MCP_SESSION_IDLE_TIMEOUT) -> bool:
+        """Check whether the session has had no activity or calls for ``timeout`` seconds"""
+        return not self._tasks and time.monotonic() - self.last_active > timeout
+
+    def start(self, message: Any, send: Optional[Callable[[Dict[str, Any]], None]] = None) -> asyncio.Task:
+        """Handle a message in a task tracked by the session
+
+        Args:
+            message (Any): Decoded JSON-RPC message
+            send (Optional[Callable[[Dict[str, Any]], None]], optional): Delivers
+                notifications about the message, e.g. progress. Defaults to
+                queueing them on :attr:`outgoing`.
+
+        Returns:
+            asyncio.Task: Task resolving to the response, or None for notifications
+        """
+        self.touch()
+        task = asyncio.create_task(self.handle(message, send or self.outgoing.put_nowait))
+        key = message.get("id") if isinstance(message, dict) and message.get("id") is not None else task
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return task
+
+    def submit(self, message: Any) -> None:
+        """Handle a message in the background, queueing any response
+
+        Args:
+            message (Any): Decoded JSON-RPC message
+        """
+        self.start(message).add_done_callback(self._queue_response)
+
+    def _queue_response(self, task: asyncio.Task) -> None:
+        """Queue the response of a finished task for the session stream"""
+        if not task.cancelled() and task.exception() is None and task.result() is not None:
+            self.outgoing.put_nowait(task.result())
+
+    async def handle(self, message: Any, send: Optional[Callable[[Dict[str, Any]], None]] = None) -> Optional[Dict[str, Any]]:
+        """Handle one JSON-RPC message
+
+        Args:
+            message (Any): Decoded JSON-RPC message
+            send (Optional[Callable[[Dict[str, Any]], None]], optional): Delivers
+                notifications about the message. Defaults to :attr:`outgoing`.
+
+        Returns:
+            Optional[Dict[str, Any]]: Response, or None for notifications
+        """
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or "method" not in message:
+            # Responses from the client (e.g. to pings) need no reply
+            if isinstance(message, dict) and message.get("jsonrpc") == "2.0" and "id" in message:
+                return None
+            message_id = message.get("id") if isinstance(message, dict) else None
+            return error_response(message_id, INVALID_REQUEST, "Invalid JSON-RPC request")
+
+        method = message["method"]
+        params = message.get("params") or {}
+        message_id = message.get("id")
+        is_notification = "id" not in message
+        try:
+            if not isinstance(params, dict):
+                raise JSONRPCError(INVALID_PARAMS, "params must be an object")
+            result = await self.dispatch(method, params, send or self.outgoing.put_nowait)
+        except JSONRPCError as e:
+            if is_notification:
+                return None
+            return error_response(message_id, e.code, e.message)
+        except Exception as e:
+            logger.error(f"Error handling MCP {method} for user {self.user_id}: {str(e)}")
+            if is_notification:
+                return None
+            return error_response(message_id, INTERNAL_ERROR, str(e))
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": message_id, "result": result}
+
+    async def dispatch(self, method: str, params: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> Any:
+        """Run a JSON-RPC method
+
+        Args:
+            method (str): Method name
+            params (Dict[str, Any]): Method parameters
+            send (Callable[[Dict[str, Any]], None]): Delivers notifications about the request
+
+        Returns:
+            Any: Method result
+
+        Raises:
+            JSONRPCError: If the method is unknown or its parameters are invalid
+        """
+        if method == "initialize":
+            return self.initialize(params)
+        if method == "ping":
+            return {}
+        if method == "tools/list":
+            return await self.list_tools()
+        if method == "notifications/cancelled":
+            self.cancel(params.get("requestId"))
+            return None
+        if method == "tools/call":
+            return await self.call_tool(params.get("name"), params.get("arguments") or {}, params.get("_meta"), send)
+        if method.startswith("notifications/"):
+            return None
+        raise JSONRPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    def initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Negotiate the protocol version and describe the server"""
+        requested = params.get("protocolVersion")
+        if requested in SUPPORTED_PROTOCOL_VERSIONS:
+            self.protocol_version = requested
+        else:
+            self.protocol_version = SUPPORTED_PROTOCOL_VERSIONS[0]
+        return {
+            "protocolVersion": self.protocol_version,
+            "capabilities": {"tools": {"listChanged": False}},
+            "serverInfo": SERVER_INFO,
+        }
+
+    async def list_tools(self) -> EncodedPayload:
+        """Get the pre-encoded ``tools/list`` result for the apps the user has credentials for"""
+        async with database.AsyncSessionLocal() as db:
+            app_names = await get_available_app_names(db, self.user_id)
+        return tool_catalog.tools_list(app_names)
+
+    async def _get_handler(self, app_name: str):
+        """Get the session's handler for an app, building it on first use"""
+        from api.routers.tools import _create_handler
+        if app_name not in self._handlers:
+            lock = self._handler_locks.setdefault(app_name, asyncio.Lock())
+            async with lock:
+                if app_name not in self._handlers:
+                    async with database.AsyncSessionLocal() as db:
+                        self._handlers[app_name] = await _create_handler(app_name, self.user_id, db)
+        return self._handlers[app_name]
+
+    async def call_tool(self, name: Optional[str], arguments: Dict[str, Any],
+                        meta: Optional[Dict[str, Any]] = None,
+                        send: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Execute a tool for the session's user
+
+        Unknown tools are JSON-RPC errors; failures inside the tool are
+        reported as results with ``isError`` set, as MCP expects. When the
+        request carries ``_meta.progressToken``, the handler can report
+        progress (and, if ``_meta.partialResults`` is set, partial results)
+        through ``api.progress`` as ``notifications/progress``.
+
+        Args:
+            name (Optional[str]): Tool name (e.g., 'github.list_repos')
+            arguments (Dict[str, Any]): Tool parameters
+            meta (Optional[Dict[str, Any]], optional): The request's ``_meta``
+            send (Optional[Callable[[Dict[str, Any]], None]], optional): Delivers
+                notifications. Defaults to :attr:`outgoing`.
+
+        Returns:
+            Dict[str, Any]: ``tools/call`` result
+        """
+        from api.routers.tools import _resolve_app, _run_tool
+        if not isinstance(name, str) or not isinstance(arguments, dict):
+            raise JSONRPCError(INVALID_PARAMS, "tools/call requires a tool name and object arguments")
+        try:
+            app_name = _resolve_app(name)
+        except HTTPException as e:
+            raise JSONRPCError(INVALID_PARAMS, e.detail)
+
+        reporter = None
+        if isinstance(meta, dict) and meta.get("progressToken") is not None:
+            reporter = ProgressReporter(
+                send or self.outgoing.put_nowait, meta["progressToken"], bool(meta.get("partialResults"))
+            )
+
+        async with self._semaphore:
+            try:
+                handler = await self._get_handler(app_name)
+                with progress_context(reporter):
+                    result = await _run_tool(app_name, handler, name, arguments, self.user_id)
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                logger.error(f"Error executing MCP tool {name}: {detail}")
+                metrics.increment("mcp_tool_calls", app=app_name, outcome="error")
+                return tool_result(detail, is_error=True)
+        metrics.increment("mcp_tool_calls", app=app_name, outcome="success")
+        return tool_result(result)
+
+    def cancel(self, request_id: Any) -> bool:
+        """Cancel an in-flight request, e.g. on ``notifications/cancelled``
+
+        Cancelling the request's task aborts its upstream HTTP request and
+        releases its concurrency slots; no response is sent for it.
+
+        Args:
+            request_id (Any): ID of the request to cancel
+
+        Returns:
+            bool: True if a running request was cancelled
+        """
+        task = self._tasks.get(request_id) if request_id is not None else None
+        if task is None or task.done() or task is asyncio.current_task():
+            return False
+        task.cancel()
+        metrics.increment("mcp_requests_cancelled")
+        logger.info(f"Cancelled MCP request {request_id} for user {self.user_id}")
+        return True
+
+    async def close(self) -> None:
+        """Cancel in-flight calls and mark the session closed
+
+        None is queued on :attr:`outgoing` last, so a stream reading it ends.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        tasks = [task for task in self._tasks.values() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.outgoing.put_nowait(None)
+
+
+class MCPSessionRegistry:
+    """Open MCP sessions keyed by session ID
+
+    Once started, a background task periodically closes sessions that are
+    idle or whose token has expired or been revoked, so abandoned
+    Streamable HTTP sessions do not pile up.
+    """
+
+    def __init__(self, sweep_interval: float = MCP_SESSION_SWEEP_INTERVAL):
+        """Initialize an empty registry
+
+        Args:
+            sweep_interval (float): Seconds between sweeps for sessions to close
+        """
+        self.sweep_interval = sweep_interval
+        self._sessions: Dict[str, MCPSession] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def open(self, token: ValidatedToken) -> MCPSession:
+        """Open a session for a validated token
+
+        Args:
+            token (ValidatedToken): The client's MCP token
+
+        Returns:
+            MCPSession: The new session
+        """
+        session = MCPSession(token)
+        self._sessions[session.session_id] = session
+        metrics.increment("mcp_sessions_opened")
+        return session
+
+    def get(self, session_id: Optional[str]) -> Optional[MCPSession]:
+        """Get an open session by ID"""
+        if not session_id:
+            return None
+        return self._sessions.get(session_id)
+
+    async def close(self, session_id: str) -> None:
+        """Close and forget a session"""
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            await session.close()
+
+    async def close_idle(self, timeout: float = MCP_SESSION_IDLE_TIMEOUT) -> int:
+        """Close sessions that are idle or whose token has expired or been revoked
+
+        Args:
+            timeout (float): Idle time in seconds after which a session is closed
+
+        Returns:
+            int: Number of sessions closed
+        """
+        stale = [
+            session_id for session_id, session in self._sessions.items()
+            if session.is_idle(timeout) or session.is_expired()
+            or mcp_token_validator.is_revoked(session.token.token_id)
+        ]
+        for session_id in stale:
+            await self.close(session_id)
+        return len(stale)
+
+    async def close_token(self, token_id: int) -> int:
+        """Close every session opened with a token, e.g. when it is revoked
+
+        Args:
+            token_id (int): Token ID
+
+        Returns:
+            int: Number of sessions closed
+        """
+        sessions = [
+            session_id for session_id, session in self._sessions.items()
+            if session.token.token_id == token_id
+        ]
+        for session_id in sessions:
+            await self.close(session_id)
+        if sessions:
+            logger.info(f"Closed {len(sessions)} MCP sessions of revoked token {token_id}")
+        return len(sessions)
+
+    async def sweep(self) -> int:
+        """Close idle sessions and sessions whose token is no longer active
+
+        Returns:
+            int: Number of sessions closed
+        """
+        if self._sessions and mcp_token_validator.check_due():
+            # Closes sessions of tokens revoked elsewhere through the revocation listener
+            async with database.AsyncSessionLocal() as db:
+                await mcp_token_validator.sync_revocations(db)
+        return await self.close_idle()
+
+    async def _run(self) -> None:
+        """Sweep periodically until cancelled"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                closed = await self.sweep()
+                if closed:
+                    logger.info(f"Closed {closed} idle or unauthorized MCP sessions")
+            except Exception as e:
+                logger.error(f"Failed to sweep MCP sessions: {str(e)}")
+
+    def start(self) -> None:
+        """Start periodic sweeping on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic sweeping"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def close_all(self) -> None:
+        """Close every session, e.g. on shutdown"""
+        for session_id in list(self._sessions):
+            await self.close(session_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Get session counters for metrics"""
+        return {
+            "sessions": len(self._sessions),
+            "in_flight": sum(len(session._tasks) for session in self._sessions.values()),
+        }
+
+
+# Process-wide MCP session registry
+mcp_sessions = MCPSessionRegistry()
+
+# Sessions end as soon as this process learns their token was revoked
+mcp_token_validator.add_revocation_listener(mcp_sessions.close_token)
@@ -0,0 +1,70 @@
+import threading
+from typing import Dict, Any
+
+
+def _metric_key(name: str, labels: Dict[str, Any]) -> str:
+    """Build a metric key such as ``name{app=github}`` from a name and labels"""
+    if not labels:
+        return name
+    label_str = ",".join(f"{key}={labels[key]}" for key in sorted(labels))
+    return f"{name}{{{label_str}}}"
+
+
+class MetricsRegistry:
+    """Thread-safe in-process registry of counters and timing summaries"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """Increment a counter
+
+        Args:
+            name (str): Metric name
+            value (float, optional): Amount to add. Defaults to 1.
+            **labels: Labels distinguishing series of the same metric
+        """
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record an observation (usually a duration in seconds)
+
+        Args:
+            name (str): Metric name
+            value (float): Observed value
+            **labels: Labels distinguishing series of the same metric
+        """
+        key = _metric_key(name, labels)
+        with self._lock:
+            timing = self._timings.setdefault(key, {"count": 0, "sum": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["sum"] += value
+            timing["max"] = max(timing["max"], value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of every metric
+
+        Returns:
+            Dict[str, Any]: Counters and timing summaries keyed by metric key
+        """
+        with self._lock:
+            timings = {
+                key: {**timing, "avg": timing["sum"] / timing["count"] if timing["count"] else 0.0}
+                for key, timing in self._timings.items()
+            }
+            return {"counters": dict(self._counters), "timings": timings}
+
+    def reset(self) -> None:
+        """Clear every metric"""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+# Process-wide metrics registry
+metrics = MetricsRegistry()
@@ -72,7 +72,10 @@ class MCPToken(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    token = Column(String, unique=True, index=True)
+    # Legacy raw token; new tokens store only token_hash
+    token = Column(String, unique=True, index=True, nullable=True)
+    # SHA-256 hex digest of the token, used for lookups
+    token_hash = Column(String(64), unique=True, index=True)
     expires_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_revoked = Column(Boolean, default=False)
@@ -0,0 +1,126 @@
+import json
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Reporter of the tool call running in the current context, if the caller asked for progress
+_current_reporter: ContextVar[Optional["ProgressReporter"]] = ContextVar("tool_progress", default=None)
+
+
+class ProgressReporter:
+    """Sends MCP progress and partial-result notifications for one tool call
+
+    Notifications are handed to ``send`` on the event loop the reporter was
+    created on, so handlers may report from worker threads as well.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], progress_token: Any, partial_results: bool = False):
+        """Initialize the reporter
+
+        Args:
+            send (Callable[[Dict[str, Any]], None]): Delivers a notification to the client
+            progress_token (Any): ``_meta.progressToken`` from the client's request
+            partial_results (bool, optional): Whether the client asked for partial results
+        """
+        self.send = send
+        self.progress_token = progress_token
+        self.partial_results = partial_results
+        self._loop = asyncio.get_running_loop()
+        self._last_progress: Optional[float] = None
+
+    def _emit(self, method: str, params: Dict[str, Any]) -> None:
+        """Queue a notification for delivery on the event loop"""
+        message = {"jsonrpc": "2.0", "method": method, "params": {"progressToken": self.progress_token, **params}}
+        self._loop.call_soon_threadsafe(self.send, message)
+
+    def report(self, progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        """Send a ``notifications/progress`` notification
+
+        Progress must increase between notifications, so repeats are dropped.
+
+        Args:
+            progress (float): Work done so far, e.g. items fetched
+            total (Optional[float], optional): Total work, if known
+            message (Optional[str], optional): Human-readable status
+        """
+        if self._last_progress is not None and progress <= self._last_progress:
+            return
+        self._last_progress = progress
+        params: Dict[str, Any] = {"progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message is not None:
+            params["message"] = message
+        self._emit("notifications/progress", params)
+
+    def partial(self, result: Any) -> None:
+        """Send part of the result before the call completes, if the client asked for it
+
+        Args:
+            result (Any): Partial result, e.g. the items of one page
+        """
+        if not self.partial_results:
+            return
+        text = json.dumps(result, default=str)
+        self._emit("notifications/tools/partial_result", {"content": [{"type": "text", "text": text}]})
+
+
+@contextmanager
+def progress_context(reporter: Optional[ProgressReporter]):
+    """Make a reporter current while a tool call runs
+
+    Args:
+        reporter (Optional[ProgressReporter]): Reporter for the call, or None
+    """
+    token = _current_reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current_reporter.reset(token)
+
+
+def current_progress() -> Optional[ProgressReporter]:
+    """Get the reporter of the tool call running in this context, if any"""
+    return _current_reporter.get()
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Report progress of the current tool call; a no-op when nobody is listening"""
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.report(progress, total, message)
+
+
+def report_partial(result: Any) -> None:
+    """Send a partial result of the current tool call; a no-op when nobody is listening"""
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.partial(result)
+
+
+class PageProgress:
+    """Reports pages fetched and items so far while a paginated tool collects pages"""
+
+    def __init__(self):
+        """Initialize with nothing fetched"""
+        self.pages = 0
+        self.items = 0
+
+    def page(self, items: List[Any]) -> None:
+        """Record a fetched page, reporting progress and the page as a partial result
+
+        Args:
+            items (List[Any]): Items of the page
+        """
+        self.pages += 1
+        self.items += len(items)
+        reporter = _current_reporter.get()
+        if reporter is None:
+            return
+        reporter.report(self.items, message=f"Fetched {self.pages} pages, {self.items} items")
+        if items:
+            reporter.partial(items)
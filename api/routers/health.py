@@ -1,5 +1,16 @@
 from fastapi import APIRouter
 
+from api.apps.http import connection_manager
+from api.db_pool import pool_stats
+from api.executor import tool_executor
+from api.metrics import metrics as metrics_registry
+from api.tool_cache import tool_result_cache
+from api.tool_catalog import tool_catalog
+from api.apps import client_cache
+from api.auth.mcp_tokens import mcp_token_validator
+from api.usage import usage_tracker
+from api.mcp_server import mcp_sessions
+
 router = APIRouter(
     prefix="/api/v1/health",
     tags=["health"]
@@ -18,5 +29,15 @@ async def metrics():
     return {
         "total_requests": 0,
         "active_connections": 0,
-        "error_rate": 0.0
+        "error_rate": 0.0,
+        "db_pools": pool_stats(),
+        "upstream_pools": connection_manager.stats(),
+        "tool_executor": tool_executor.stats(),
+        "tool_result_cache": tool_result_cache.stats(),
+        "tool_catalog": tool_catalog.stats(),
+        "client_cache": client_cache.stats(),
+        "mcp_token_cache": mcp_token_validator.stats(),
+        "usage_tracker": usage_tracker.stats(),
+        "mcp_sessions": mcp_sessions.stats(),
+        **metrics_registry.snapshot()
     }
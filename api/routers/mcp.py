@@ -0,0 +1,277 @@
+from fastapi import APIRouter, Header, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
+import asyncio
+import json
+import os
+import logging
+
+from api import database
+from api.auth.mcp_tokens import mcp_token_validator
+from api.mcp_server import (
+    mcp_sessions, encode_message, error_response, expects_response, PARSE_ERROR, INVALID_REQUEST
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    tags=["mcp"]
+)
+
+# Seconds between SSE keep-alive comments, which also detect disconnected clients
+MCP_SSE_KEEPALIVE = float(os.getenv("MCP_SSE_KEEPALIVE", "15"))
+
+# Seconds to wait for a POST's responses before switching from a JSON reply to an SSE stream
+MCP_JSON_RESPONSE_WAIT = float(os.getenv("MCP_JSON_RESPONSE_WAIT", "1"))
+
+# Header carrying the Streamable HTTP session ID
+SESSION_HEADER = "Mcp-Session-Id"
+
+
+def _sse_event(event: str, data: bytes) -> bytes:
+    """Format one server-sent event"""
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+@router.get("/mcp")
+async def open_mcp_stream(request: Request, token: str):
+    """Open an MCP session over server-sent events
+
+    The client authenticates once with the token from ``/mcp-url/``. The
+    first event (``endpoint``) gives the URL to POST JSON-RPC messages to;
+    responses and notifications arrive on this stream as ``message`` events.
+    The token is re-checked on every keep-alive tick, and the stream ends
+    when the token expires or is revoked.
+
+    Args:
+        request (Request): The incoming request
+        token (str): MCP token
+
+    Returns:
+        StreamingResponse: The session's event stream
+
+    Raises:
+        HTTPException: If the token is invalid, revoked or expired
+    """
+    # Validate with a short-lived session so the stream does not hold a DB connection
+    async with database.AsyncSessionLocal() as db:
+        validated = await mcp_token_validator.validate(db, token)
+    if validated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired MCP token"
+        )
+
+    session = mcp_sessions.open(validated)
+    endpoint = f"{request.url.path.rstrip('/')}/messages?session_id={session.session_id}"
+    logger.info(f"Opened MCP session for user {session.user_id}")
+
+    async def events():
+        try:
+            yield _sse_event("endpoint", endpoint.encode())
+            while True:
+                try:
+                    message = await asyncio.wait_for(session.outgoing.get(), timeout=MCP_SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected() or not await session.is_authorized():
+                        break
+                    session.touch()
+                    yield b": keepalive\n\n"
+                    continue
+                if message is None:
+                    # The session was closed, e.g. because its token was revoked
+                    break
+                yield _sse_event("message", encode_message(message))
+        finally:
+            await mcp_sessions.close(session.session_id)
+            logger.info(f"Closed MCP session for user {session.user_id}")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _read_messages(request: Request):
+    """Decode a POSTed JSON-RPC message or batch
+
+    Args:
+        request (Request): The incoming request
+
+    Returns:
+        tuple: The decoded message or batch and None, or None and an error
+            response if the body is not valid JSON or is an empty batch
+    """
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        return None, JSONResponse(
+            error_response(None, PARSE_ERROR, "Parse error"),
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    if isinstance(payload, list) and not payload:
+        return None, JSONResponse(
+            error_response(None, INVALID_REQUEST, "Empty batch"),
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    return payload, None
+
+
+@router.post("/mcp")
+async def post_mcp(request: Request, token: Optional[str] = None, mcp_session_id: Optional[str] = Header(None)):
+    """Handle JSON-RPC messages over the Streamable HTTP transport
+
+    An ``initialize`` request authenticates with the MCP token and opens a
+    session whose ID is returned in the ``Mcp-Session-Id`` header; later
+    requests send that header instead of re-authenticating. A body may be a
+    single message or a batch, whose requests run concurrently. If every
+    response is ready within MCP_JSON_RESPONSE_WAIT, or the client does not
+    accept ``text/event-stream``, they are returned as plain JSON. Otherwise
+    the reply is an SSE stream that sends progress notifications and each
+    response as its call finishes.
+
+    Args:
+        request (Request): The incoming request
+        token (Optional[str]): MCP token, required to initialize a session
+        mcp_session_id (Optional[str]): Session ID from ``initialize``
+
+    Returns:
+        Response: 202 Accepted when nothing needs a reply, JSON, or an SSE stream
+
+    Raises:
+        HTTPException: If authentication fails, or the session is unknown or
+            its token has expired or been revoked
+    """
+    payload, error = await _read_messages(request)
+    if error is not None:
+        return error
+    is_batch = isinstance(payload, list)
+    messages = payload if is_batch else [payload]
+
+    if any(isinstance(message, dict) and message.get("method") == "initialize" for message in messages):
+        async with database.AsyncSessionLocal() as db:
+            validated = await mcp_token_validator.validate(db, token)
+        if validated is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired MCP token"
+            )
+        session = mcp_sessions.open(validated)
+        logger.info(f"Opened MCP session for user {session.user_id}")
+    else:
+        if not mcp_session_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing {SESSION_HEADER} header"
+            )
+        # The session ID stands in for the token, so the token must still be active
+        session = mcp_sessions.get(mcp_session_id)
+        if session is None or not await session.is_authorized():
+            if session is not None:
+                await mcp_sessions.close(mcp_session_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="MCP session not found"
+            )
+
+    headers = {SESSION_HEADER: session.session_id}
+    # Notifications about these requests (e.g. progress) go on this POST's stream
+    notifications: asyncio.Queue = asyncio.Queue()
+    tasks = [(session.start(message, notifications.put_nowait), expects_response(message)) for message in messages]
+    pending_replies = [task for task, answered in tasks if answered]
+    if not pending_replies:
+        return Response(status_code=status.HTTP_202_ACCEPTED, headers=headers)
+
+    accepts_stream = "text/event-stream" in request.headers.get("accept", "")
+    _, pending = await asyncio.wait(pending_replies, timeout=MCP_JSON_RESPONSE_WAIT if accepts_stream else None)
+
+    if not pending:
+        responses = [task.result() for task in pending_replies if not task.cancelled() and task.result() is not None]
+        if not responses:
+            return Response(status_code=status.HTTP_202_ACCEPTED, headers=headers)
+        if is_batch:
+            content = b"[" + b",".join(encode_message(response) for response in responses) + b"]"
+        else:
+            content = encode_message(responses[0])
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    # Finished calls join the notification queue, so each response follows its own progress
+    for task in pending_replies:
+        task.add_done_callback(notifications.put_nowait)
+
+    async def events():
+        remaining = len(pending_replies)
+        while remaining:
+            item = await notifications.get()
+            if not isinstance(item, asyncio.Task):
+                yield _sse_event("message", encode_message(item))
+                continue
+            remaining -= 1
+            if not item.cancelled() and item.result() is not None:
+                yield _sse_event("message", encode_message(item.result()))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={**headers, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete("/mcp", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_mcp_session(mcp_session_id: str = Header(...)):
+    """End a Streamable HTTP session, cancelling its in-flight calls
+
+    Args:
+        mcp_session_id (str): Session ID from ``initialize``
+
+    Raises:
+        HTTPException: If the session is unknown
+    """
+    if mcp_sessions.get(mcp_session_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="MCP session not found"
+        )
+    await mcp_sessions.close(mcp_session_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/mcp/messages", status_code=status.HTTP_202_ACCEPTED)
+async def post_mcp_message(request: Request, session_id: str):
+    """Accept JSON-RPC messages for an open MCP session
+
+    Each message (or each member of a batch) is handled concurrently and
+    its response is delivered on the session's event stream.
+
+    Args:
+        request (Request): The incoming request
+        session_id (str): Session ID from the ``endpoint`` event
+
+    Returns:
+        Response: 202 Accepted
+
+    Raises:
+        HTTPException: If the session is unknown or its token has expired or been revoked
+    """
+    session = mcp_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="MCP session not found"
+        )
+    if not await session.is_authorized():
+        await mcp_sessions.close(session_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="MCP token has expired or been revoked"
+        )
+
+    payload, error = await _read_messages(request)
+    if error is not None:
+        return error
+
+    session.touch()
+    for message in payload if isinstance(payload, list) else [payload]:
+        session.submit(message)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
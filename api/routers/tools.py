@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from api import schemas, models, database
 from api.dependencies import get_current_active_user
-from api.apps.github.tools import GITHUB_TOOLS, create_github_handler
-from api.apps.slack.tools import SLACK_TOOLS, create_slack_handler
-from api.apps.github.models import GitHubCredential
-from api.models import SlackCredentials as SlackCredential
-import secrets
-from datetime import datetime, timedelta
+from api.apps.availability import register_credential_probe, get_available_app_names
+from api.apps.client_cache import register_credential_query
+from api.apps.http import connection_manager
+from api.executor import tool_executor, TOOL_CALL_TIMEOUT
+from api.tool_cache import tool_result_cache
+from api.tool_catalog import tool_catalog
+from api.auth.mcp_tokens import mcp_token_validator
+from api.usage import usage_tracker
+from api.metrics import metrics
+import asyncio
+import importlib
+import inspect
+from datetime import datetime, timedelta, timezone
+import json
 import os
 import logging
 
@@ -18,62 +27,119 @@ router = APIRouter(
     tags=["tools"]
 )
 
-# Tool registry with all available tools
-TOOL_REGISTRY = {
-    "github": GITHUB_TOOLS, 
-    "slack": SLACK_TOOLS
-    # Add more app tools here as they are implemented
-}
+# Tool registry with all available tools, filled in as apps register
+TOOL_REGISTRY = {}
+
+# App packages loaded by load_apps(); each exposes register() and optionally get_router()
+INSTALLED_APPS = [
+    name.strip() for name in os.getenv("INSTALLED_APPS", "api.apps.github,api.apps.slack").split(",")
+    if name.strip()
+]
+_LOADED_APPS = set()
+
+# Limits for batch tool execution
+BATCH_MAX_CALLS = int(os.getenv("BATCH_MAX_CALLS", "50"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "10"))
+
+# Status reported when the client disconnects before a call finishes (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
 
 # Registry of app-specific tool handlers and factory functions
 APP_HANDLER_FACTORIES = {}
 
 # Define a function to register app handlers
-def register_app_handler(app_name, handler_factory):
+def register_app_handler(app_name, handler_factory, tools=None, upstream_pools=None, concurrency_limit=None, credential_probe=None,
+                         credential_query=None):
     """Register an app handler factory function
     
+    App clients get pooled, keep-alive connections by calling
+    ``api.apps.http.get_http_client(url)`` with their API base URL.
+    Handlers may implement ``execute_tool`` synchronously; such handlers
+    run in a bounded thread pool owned by the app.
+    
     Args:
         app_name (str): The name of the app
-        handler_factory (callable): Function that creates a handler for the app
+        handler_factory (callable): Function (or coroutine function) called with
+            the user ID and an async DB session that creates a handler for the app
+        tools (dict, optional): Tool definitions keyed by tool name, encoded
+            into the tool catalog once here
+        upstream_pools (dict, optional): Pool settings keyed by upstream URL,
+            e.g. {"https://api.example.com": {"max_connections": 20}}
+        concurrency_limit (int, optional): Maximum concurrent tool calls for the app.
+            Defaults to APP_CONCURRENCY_LIMITS / APP_CONCURRENCY_DEFAULT.
+        credential_probe (callable, optional): Function taking a user ID and returning
+            a SQL boolean expression that is true when the user can use the app.
+            See ``api.apps.availability``.
+        credential_query (callable, optional): Function taking a list of user IDs and returning
+            a SELECT of (user_id, access_token) over the app's credentials, used to drop
+            cached clients whose credentials changed. See ``api.apps.client_cache``.
     """
     APP_HANDLER_FACTORIES[app_name] = handler_factory
+    if tools is not None:
+        TOOL_REGISTRY[app_name] = tools
+        tool_catalog.compile(app_name, tools)
+    if credential_probe is not None:
+        register_credential_probe(app_name, credential_probe)
+    if credential_query is not None:
+        register_credential_query(app_name, credential_query)
+    if concurrency_limit is not None:
+        tool_executor.set_limit(app_name, concurrency_limit)
+    for url, settings in (upstream_pools or {}).items():
+        connection_manager.configure_host(url, **settings)
 
-# Register the GitHub handler from the GitHub module
-register_app_handler("github", create_github_handler)
-
-# Register the Slack handler from the Slack module
-register_app_handler("slack", create_slack_handler)
+def load_apps(app_modules=None):
+    """Import app packages and register their handlers
+    
+    Apps are imported here rather than when this module is imported, so
+    importing the router stays cheap. Loading an app twice is a no-op.
+    
+    Args:
+        app_modules (list, optional): Module paths of app packages. Defaults to INSTALLED_APPS.
+        
+    Returns:
+        list: The loaded app modules
+    """
+    modules = []
+    for module_path in app_modules if app_modules is not None else INSTALLED_APPS:
+        module = importlib.import_module(module_path)
+        if module_path not in _LOADED_APPS:
+            module.register()
+            _LOADED_APPS.add(module_path)
+        modules.append(module)
+    return modules
 
 @router.get("/apps/{app}/tools/", response_model=List[schemas.Tool])
-async def list_app_tools(app: str, db: Session = Depends(database.get_db)):
+async def list_app_tools(app: str, request: Request):
     """List all tools available for a specific app
     
+    The list is served from the tool catalog, encoded once when the app
+    registered, with its content hash as the ETag.
+    
     Args:
         app (str): App name (e.g., 'github')
-        db (Session): Database session
+        request (Request): The incoming request, checked for If-None-Match
         
     Returns:
-        List[schemas.Tool]: List of tools for the app
+        Response: JSON list of tools for the app, or 304 if unchanged
     """
-    if app not in TOOL_REGISTRY:
+    payload = tool_catalog.app_tools(app)
+    if payload is None:
         return []
-        
-    app_tools = TOOL_REGISTRY[app]
-    return [schemas.Tool(
-        name=tool_def["name"],
-        description=tool_def["description"],
-        parameters=tool_def["parameters"]
-    ) for tool_def in app_tools.values()]
+    
+    headers = {"ETag": payload.etag}
+    if request.headers.get("if-none-match") == payload.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload.data, media_type="application/json", headers=headers)
 
 
 @router.get("/apps/{app}/tools/{tool}/", response_model=schemas.Tool)
-async def get_tool(app: str, tool: str, db: Session = Depends(database.get_db)):
+async def get_tool(app: str, tool: str, db: AsyncSession = Depends(database.get_async_db)):
     """Get a specific tool by app and tool name
     
     Args:
         app (str): App name (e.g., 'github')
         tool (str): Tool name (e.g., 'github.list_repos')
-        db (Session): Database session
+        db (AsyncSession): Database session
         
     Returns:
         schemas.Tool: Tool details
@@ -102,16 +168,138 @@ async def get_tool(app: str, tool: str, db: Session = Depends(database.get_db)):
     )
 
 @router.get("/guess-tools/")
-async def guess_tools(description: str, db: Session = Depends(database.get_db)):
+async def guess_tools(description: str, db: AsyncSession = Depends(database.get_async_db)):
     return {"suggested_tools": []}
 
+async def _create_handler(app_name: str, user_id: int, db: AsyncSession):
+    """Create a user's handler for an app with its registered factory
+    
+    Args:
+        app_name (str): The name of the app
+        user_id (int): User ID
+        db (AsyncSession): Database session
+        
+    Returns:
+        Any: Tool handler for the app
+    """
+    handler = APP_HANDLER_FACTORIES[app_name](user_id, db)
+    if inspect.isawaitable(handler):
+        handler = await handler
+    return handler
+
+def _resolve_app(tool_name: str) -> str:
+    """Get the app for a tool, checking the app and tool are registered
+    
+    Args:
+        tool_name (str): Tool name (e.g., 'github.list_repos')
+        
+    Returns:
+        str: App name (e.g., 'github')
+        
+    Raises:
+        HTTPException: If the app or tool is not registered
+    """
+    # Extract app name from tool name (e.g., 'github.list_repos' -> 'github')
+    app_name = tool_name.split('.')[0] if '.' in tool_name else ''
+    
+    # Check if app is supported
+    if app_name not in APP_HANDLER_FACTORIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported app: {app_name}"
+        )
+    
+    # Check if the tool exists in the registry
+    if app_name in TOOL_REGISTRY and tool_name not in TOOL_REGISTRY[app_name]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tool {tool_name} not found for app {app_name}"
+        )
+    
+    return app_name
+
+async def _run_tool(app_name: str, handler, tool_name: str, parameters: dict, user_id: int, bypass_cache: bool = False):
+    """Run a tool through the executor, serving read-only tools from the result cache
+    
+    Args:
+        app_name (str): The name of the app
+        handler: Tool handler created by the app's factory
+        tool_name (str): Name of the tool to execute
+        parameters (dict): Tool parameters
+        user_id (int): User ID
+        bypass_cache (bool, optional): Skip the cache lookup and refresh the entry
+        
+    Returns:
+        Any: Result of the tool execution
+    """
+    # Record usage without writing on the request path
+    usage_tracker.touch_tool(user_id, app_name, tool_name)
+    
+    tool_def = TOOL_REGISTRY.get(app_name, {}).get(tool_name)
+    cache_key = None
+    if tool_result_cache.is_cacheable(tool_def):
+        cache_key = tool_result_cache.make_key(
+            user_id, app_name, getattr(handler, "credential_key", None), tool_name, parameters
+        )
+        if not bypass_cache:
+            cached = tool_result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+    
+    # Execute the tool within the app's concurrency limit and the tool's
+    # deadline; sync handlers run in the app's thread pool instead of on the event loop
+    timeout = (tool_def or {}).get("timeout", TOOL_CALL_TIMEOUT)
+    result = await tool_executor.run(app_name, handler, tool_name, parameters, timeout=timeout)
+    if cache_key is not None:
+        tool_result_cache.set(cache_key, result, ttl=tool_def["cache_ttl"])
+    return result
+
+async def _cancel_on_disconnect(http_request: Request, call):
+    """Await a call, cancelling it if the client disconnects first
+    
+    The request body has already been read, so the next ASGI message is
+    the disconnect. The cancelled call is awaited so it has released its
+    concurrency slots before this returns.
+    
+    Args:
+        http_request (Request): The incoming request
+        call: Awaitable running the tool call(s)
+        
+    Returns:
+        Any: Result of the call
+        
+    Raises:
+        HTTPException: If the client disconnected before the call finished
+    """
+    async def wait_for_disconnect():
+        while (await http_request.receive())["type"] != "http.disconnect":
+            pass
+    
+    task = asyncio.ensure_future(call)
+    watcher = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if task.cancelled():
+        metrics.increment("tool_requests_disconnected")
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    return task.result()
+
 @router.post("/execute/", response_model=schemas.ExecuteToolResponse)
-async def execute_tool(request: schemas.ExecuteToolRequest, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_active_user)):
+async def execute_tool(request: schemas.ExecuteToolRequest, http_request: Request, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_active_user)):
     """Execute a tool with provided parameters
     
+    The call is cancelled, down to its upstream request, if the client
+    disconnects before it finishes.
+    
     Args:
         request (schemas.ExecuteToolRequest): Tool execution request
-        db (Session): Database session
+        http_request (Request): The incoming HTTP request, watched for disconnects
+        db (AsyncSession): Database session
         current_user (models.User): Current authenticated user
         
     Returns:
@@ -123,32 +311,18 @@ async def execute_tool(request: schemas.ExecuteToolRequest, db: Session = Depend
     tool_name = request.tool
     parameters = request.parameters if request.parameters else {}
     
-    # Extract app name from tool name (e.g., 'github.list_repos' -> 'github')
-    app_name = tool_name.split('.')[0] if '.' in tool_name else ''
-    
     logger.info(f"Executing tool: {tool_name} for user {current_user.id}")
     
     try:
-        # Check if app is supported
-        if app_name not in APP_HANDLER_FACTORIES:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported app: {app_name}"
-            )
-        
-        # Check if the tool exists in the registry
-        if app_name in TOOL_REGISTRY and tool_name not in TOOL_REGISTRY[app_name]:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tool {tool_name} not found for app {app_name}"
-            )
+        app_name = _resolve_app(tool_name)
         
         # Get the appropriate handler for this app
-        handler_factory = APP_HANDLER_FACTORIES[app_name]
-        handler = handler_factory(current_user.id, db)
+        handler = await _create_handler(app_name, current_user.id, db)
         
-        # Execute the tool using the handler
-        result = handler.execute_tool(tool_name, parameters)
+        result = await _cancel_on_disconnect(
+            http_request,
+            _run_tool(app_name, handler, tool_name, parameters, current_user.id, request.bypass_cache)
+        )
         
         # Log successful execution
         logger.info(f"Successfully executed {tool_name}")
@@ -169,13 +343,150 @@ async def execute_tool(request: schemas.ExecuteToolRequest, db: Session = Depend
             "error": str(e)
         }
 
+@router.post("/execute/batch/", response_model=schemas.ExecuteToolBatchResponse)
+async def execute_tool_batch(request: schemas.ExecuteToolBatchRequest, http_request: Request, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_active_user)):
+    """Execute several tools concurrently in one request
+    
+    The user is authenticated and each app's handler is built once for the
+    whole batch. Calls run concurrently up to ``max_concurrency`` (capped by
+    BATCH_MAX_CONCURRENCY) and per-app limits, and results are returned in
+    the order of the calls. Every call still running is cancelled if the
+    client disconnects.
+    
+    Args:
+        request (schemas.ExecuteToolBatchRequest): Tool calls to execute
+        http_request (Request): The incoming HTTP request, watched for disconnects
+        db (AsyncSession): Database session
+        current_user (models.User): Current authenticated user
+        
+    Returns:
+        schemas.ExecuteToolBatchResponse: Per-call results in input order
+        
+    Raises:
+        HTTPException: If the batch is empty or too large
+    """
+    calls = request.calls
+    if not calls or len(calls) > BATCH_MAX_CALLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch must contain between 1 and {BATCH_MAX_CALLS} calls"
+        )
+    
+    logger.info(f"Executing batch of {len(calls)} tools for user {current_user.id}")
+    
+    # Build each app's handler once; this shares the DB session, so it runs sequentially
+    handlers = {}
+    prepared = []
+    for call in calls:
+        try:
+            app_name = _resolve_app(call.tool)
+        except HTTPException as e:
+            prepared.append((call, None, e.detail))
+            continue
+        if app_name not in handlers:
+            try:
+                handlers[app_name] = await _create_handler(app_name, current_user.id, db)
+            except HTTPException as e:
+                handlers[app_name] = e.detail
+            except Exception as e:
+                handlers[app_name] = str(e)
+        prepared.append((call, app_name, None))
+    
+    concurrency = min(request.max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    
+    async def run_call(call, app_name, error):
+        if error is not None:
+            return {"tool": call.tool, "success": False, "error": error}
+        handler = handlers[app_name]
+        if isinstance(handler, str):
+            return {"tool": call.tool, "success": False, "error": handler}
+        async with semaphore:
+            try:
+                result = await _run_tool(
+                    app_name, handler, call.tool, call.parameters or {}, current_user.id, call.bypass_cache
+                )
+                return {"tool": call.tool, "success": True, "result": result}
+            except Exception as e:
+                logger.error(f"Error executing tool {call.tool}: {str(e)}")
+                return {"tool": call.tool, "success": False, "error": str(e)}
+    
+    results = await _cancel_on_disconnect(http_request, asyncio.gather(*(run_call(*item) for item in prepared)))
+    return {"results": results}
+
+@router.post("/execute/stream/")
+async def stream_tool(request: schemas.ExecuteToolRequest, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_active_user)):
+    """Execute a paginated tool and stream its items as pages arrive
+    
+    The response is newline-delimited JSON: one ``{"items": [...]}`` line per
+    page, then a final ``{"done": true, "count": n}`` line. An error after
+    streaming has started is reported as a final ``{"error": "..."}`` line.
+    
+    Args:
+        request (schemas.ExecuteToolRequest): Tool execution request
+        db (AsyncSession): Database session
+        current_user (models.User): Current authenticated user
+        
+    Returns:
+        StreamingResponse: NDJSON stream of pages
+        
+    Raises:
+        HTTPException: If the tool is not found or does not support streaming
+    """
+    tool_name = request.tool
+    parameters = request.parameters if request.parameters else {}
+    
+    logger.info(f"Streaming tool: {tool_name} for user {current_user.id}")
+    
+    app_name = _resolve_app(tool_name)
+    handler = await _create_handler(app_name, current_user.id, db)
+    if not hasattr(handler, "stream_tool"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"App {app_name} does not support streaming"
+        )
+    
+    usage_tracker.touch_tool(current_user.id, app_name, tool_name)
+    pages = tool_executor.stream(app_name, handler, tool_name, parameters)
+    
+    # Fetch the first page before responding so invalid requests still get an error status
+    try:
+        first_page = await pages.__anext__()
+    except StopAsyncIteration:
+        first_page = None
+    except ValueError as e:
+        await pages.aclose()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        await pages.aclose()
+        logger.error(f"Error streaming tool {tool_name}: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    
+    async def ndjson():
+        count = 0
+        try:
+            if first_page is not None:
+                count += len(first_page)
+                yield json.dumps({"items": first_page}) + "\n"
+                async for page in pages:
+                    count += len(page)
+                    yield json.dumps({"items": page}) + "\n"
+            yield json.dumps({"done": True, "count": count}) + "\n"
+        except Exception as e:
+            logger.error(f"Error streaming tool {tool_name}: {str(e)}")
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            await pages.aclose()
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
 @router.post("/tools/{tool_id}/execute/", response_model=schemas.ExecuteToolResponse)
-async def execute_specific_tool(tool_id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_active_user)):
+async def execute_specific_tool(tool_id: int, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_active_user)):
     """Execute a tool by its ID
     
     Args:
         tool_id (int): Tool ID in the database
-        db (Session): Database session
+        db (AsyncSession): Database session
         current_user (models.User): Current authenticated user
         
     Returns:
@@ -186,33 +497,38 @@ async def execute_specific_tool(tool_id: int, db: Session = Depends(database.get
     # 2. Get the tool handler for the associated app
     # 3. Execute the tool with the provided parameters
     
-    tool = db.query(models.Tool).filter(models.Tool.id == tool_id).first()
+    tool = await db.get(models.Tool, tool_id)
     if not tool:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Tool with id {tool_id} not found"
         )
+    
+    # Record usage without writing on the request path
+    usage_tracker.touch(models.Tool, tool.id)
+    if tool.app_id is not None:
+        usage_tracker.touch(models.App, tool.app_id)
         
     # For now, return a mock response
     return {"success": True, "result": {"message": f"Tool {tool_id} execution not implemented yet"}}
 
 @router.post("/execute/log/{execution_log_id}/rate/")
-async def rate_execution(execution_log_id: int, rating: int, db: Session = Depends(database.get_db)):
+async def rate_execution(execution_log_id: int, rating: int, db: AsyncSession = Depends(database.get_async_db)):
     return {"status": "success"}
 
 @router.get("/tools/", response_model=List[schemas.Tool])
-async def list_tools(db: Session = Depends(database.get_db)):
+async def list_tools(db: AsyncSession = Depends(database.get_async_db)):
     return []
 
 @router.get("/mcp-url/", response_model=schemas.MCPUrlResponse)
-async def generate_mcp_url(db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_active_user)):
+async def generate_mcp_url(db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_active_user)):
     """Generate a unique URL for the user to connect their MCP client
     
     This URL contains authentication information that allows the MCP client
     to access all tools available to the user without additional authentication.
     
     Args:
-        db (Session): Database session
+        db (AsyncSession): Database session
         current_user (models.User): Current authenticated user
         
     Returns:
@@ -222,48 +538,17 @@ async def generate_mcp_url(db: Session = Depends(database.get_db), current_user:
         # Log the URL generation request
         logger.info(f"Generating MCP URL for user {current_user.id}")
         
-        # Get available apps for the user
-        available_apps = []
-        for app_name in APP_HANDLER_FACTORIES.keys():
-            # Check if the user has credentials for this app
-            # This would be replaced with actual credential checking logic
-            app_available = False
-            
-            if app_name == "github":
-                # Check if user has GitHub credentials
-                github_creds = db.query(GitHubCredential).filter(
-                    GitHubCredential.user_id == current_user.id
-                ).first()
-                app_available = github_creds is not None
-            
-            elif app_name == "slack":
-                # Check if user has Slack credentials
-                slack_creds = db.query(SlackCredential).filter(
-                    SlackCredential.user_id == current_user.id
-                ).first()
-                app_available = slack_creds is not None
-            
-            if app_available:
-                available_apps.append(app_name)
+        # Get the apps the user has credentials for (one cached query for every app)
+        available_apps = await get_available_app_names(db, current_user.id)
         
         # Generate a token for the user that includes access to their apps
         # In a real implementation, this would be a JWT or similar token with appropriate expiration
         
-        # Generate a secure random token
-        token = secrets.token_hex(32)
-        
         # Create an expiration date (24 hours from now)
-        expires_at = datetime.utcnow() + timedelta(days=1)
+        expires_at = datetime.now(timezone.utc) + timedelta(days=1)
         
-        # Store the token in the database associated with this user
-        # This is a simplified version - in a real app you'd store this securely
-        new_token = models.MCPToken(
-            user_id=current_user.id,
-            token=token,
-            expires_at=expires_at
-        )
-        db.add(new_token)
-        db.commit()
+        # Store only a hash of the token; the raw token is returned once in the URL
+        token = await mcp_token_validator.issue(db, current_user.id, expires_at)
         
         # Construct the MCP URL with the token
         # In a real application, this would be properly configured based on deployment environment
@@ -283,6 +568,24 @@ async def generate_mcp_url(db: Session = Depends(database.get_db), current_user:
             detail="Failed to generate MCP URL"
         )
 
+@router.delete("/mcp-tokens/{token_id}/", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_mcp_token(token_id: int, db: AsyncSession = Depends(database.get_async_db), current_user: models.User = Depends(get_current_active_user)):
+    """Revoke one of the user's MCP tokens
+    
+    Args:
+        token_id (int): Token ID
+        db (AsyncSession): Database session
+        current_user (models.User): Current authenticated user
+        
+    Raises:
+        HTTPException: If the token is not found
+    """
+    if not await mcp_token_validator.revoke(db, token_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="MCP token not found"
+        )
+
 @router.get("/tools/{tool_id}/", response_model=schemas.Tool)
-async def get_tool_by_id(tool_id: int, db: Session = Depends(database.get_db)):
+async def get_tool_by_id(tool_id: int, db: AsyncSession = Depends(database.get_async_db)):
     return {}
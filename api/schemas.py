@@ -65,12 +65,23 @@ class Tool(ToolBase):
 class ExecuteToolRequest(BaseModel):
     tool: str
     parameters: Optional[Dict[str, Any]] = None
+    bypass_cache: bool = False
 
 class ExecuteToolResponse(BaseModel):
     success: bool
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
+class ExecuteToolBatchRequest(BaseModel):
+    calls: List[ExecuteToolRequest]
+    max_concurrency: Optional[int] = None
+
+class ExecuteToolBatchResult(ExecuteToolResponse):
+    tool: str
+
+class ExecuteToolBatchResponse(BaseModel):
+    results: List[ExecuteToolBatchResult]
+
 # MCP URL generation schema
 class MCPUrlResponse(BaseModel):
     url: str
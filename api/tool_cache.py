@@ -0,0 +1,129 @@
+import os
+import json
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from api.cache import LRUCache
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for cached results of read-only tools
+TOOL_CACHE_BYTES = int(float(os.getenv("TOOL_CACHE_MB", "64")) * 1024 * 1024)
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "True").lower() == "true"
+
+
+def canonical_parameters(parameters: Optional[Dict[str, Any]]) -> str:
+    """Serialize tool parameters so equivalent calls produce the same key
+
+    Args:
+        parameters (Optional[Dict[str, Any]]): Tool parameters
+
+    Returns:
+        str: JSON with sorted keys and no insignificant whitespace
+    """
+    return json.dumps(parameters or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    """TTL + LRU cache of results from read-only tools
+
+    Entries are keyed by (user, app, credential, tool, canonical parameters)
+    and sized by their serialized length. Only tools whose definition sets
+    ``read_only`` and a positive ``cache_ttl`` are cached.
+    """
+
+    def __init__(self, max_bytes: int = TOOL_CACHE_BYTES, enabled: bool = TOOL_CACHE_ENABLED):
+        """Initialize the cache
+
+        Args:
+            max_bytes (int): Maximum total size of cached results
+            enabled (bool): Whether results are cached at all
+        """
+        self.enabled = enabled
+        self._cache = LRUCache(max_entries=100_000, max_size=max_bytes)
+
+    @staticmethod
+    def is_cacheable(tool_def: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a tool definition allows caching its results"""
+        return bool(tool_def and tool_def.get("read_only") and tool_def.get("cache_ttl", 0) > 0)
+
+    def make_key(self, user_id: int, app_name: str, credential_key: Optional[str],
+                 tool_name: str, parameters: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+        """Build the cache key for a tool call
+
+        Args:
+            user_id (int): User ID
+            app_name (str): The name of the app
+            credential_key (Optional[str]): Non-secret identifier of the credential in use
+            tool_name (str): Name of the tool
+            parameters (Optional[Dict[str, Any]]): Tool parameters
+
+        Returns:
+            Optional[Tuple]: Cache key, or None if the call cannot be cached
+        """
+        if not self.enabled or not isinstance(credential_key, str):
+            return None
+        return (user_id, app_name, credential_key, tool_name, canonical_parameters(parameters))
+
+    def get(self, key: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        """Get a cached result
+
+        Args:
+            key (Optional[Tuple]): Key from :meth:`make_key`
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached result, or None on a miss
+        """
+        if key is None:
+            return None
+        result = self._cache.get(key)
+        metrics.increment("tool_cache_hits" if result is not None else "tool_cache_misses", app=key[1])
+        return result
+
+    def set(self, key: Optional[Tuple], result: Any, ttl: float) -> None:
+        """Store a result
+
+        Results reporting an error are not cached.
+
+        Args:
+            key (Optional[Tuple]): Key from :meth:`make_key`
+            result (Any): Tool result
+            ttl (float): Time to live in seconds
+        """
+        if key is None or not isinstance(result, dict) or "error" in result:
+            return
+        try:
+            size = len(json.dumps(result, default=str))
+        except (TypeError, ValueError):
+            return
+        self._cache.set(key, result, size=size, ttl=ttl)
+
+    def invalidate(self, user_id: int, app_name: Optional[str] = None) -> int:
+        """Drop cached results for a user, e.g. after they reconnect credentials
+
+        Args:
+            user_id (int): User ID
+            app_name (Optional[str], optional): Only drop results for this app
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = self._cache.delete_where(
+            lambda key: key[0] == user_id and (app_name is None or key[1] == app_name)
+        )
+        if removed:
+            logger.info(f"Invalidated {removed} cached tool results for user {user_id}")
+        return removed
+
+    def clear(self) -> None:
+        """Drop every cached result"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters for metrics"""
+        return self._cache.stats()
+
+
+# Process-wide tool result cache
+tool_result_cache = ToolResultCache()
@@ -0,0 +1,173 @@
+import json
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from api.cache import LRUCache
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> bytes:
+    """Encode a value as compact JSON bytes"""
+    return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+
+def _etag(data: bytes) -> str:
+    """Get a strong ETag for a payload from its content hash"""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def input_schema(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a tool's parameter definitions into a JSON Schema object
+
+    Args:
+        parameters (Dict[str, Any]): Parameter definitions keyed by name, as in GITHUB_TOOLS
+
+    Returns:
+        Dict[str, Any]: JSON Schema for the tool's arguments
+    """
+    properties = {}
+    required = []
+    for name, definition in parameters.items():
+        properties[name] = {key: value for key, value in definition.items() if key != "optional"}
+        if not definition.get("optional"):
+            required.append(name)
+    schema = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+def mcp_tool(tool_def: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe a registered tool as an MCP tool definition"""
+    return {
+        "name": tool_def["name"],
+        "description": tool_def.get("description", ""),
+        "inputSchema": input_schema(tool_def.get("parameters", {})),
+    }
+
+
+def rest_tool(tool_def: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe a registered tool as returned by ``GET /apps/{app}/tools/``"""
+    return {
+        "name": tool_def["name"],
+        "description": tool_def.get("description"),
+        "parameters": tool_def.get("parameters", {}),
+    }
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """Pre-serialized JSON with the ETag of its content"""
+    data: bytes
+    etag: str
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EncodedPayload":
+        """Wrap encoded JSON, hashing it for the ETag"""
+        return cls(data=data, etag=_etag(data))
+
+
+@dataclass(frozen=True)
+class CompiledApp:
+    """An app's tool definitions, encoded once
+
+    ``mcp_items`` and ``rest_items`` are comma-separated JSON objects without
+    the enclosing brackets, so several apps can be joined without decoding.
+    """
+    mcp_items: bytes
+    rest_items: bytes
+    rest_list: EncodedPayload
+
+
+class ToolCatalog:
+    """Registered tools compiled into immutable, pre-encoded JSON
+
+    Each app's tools are encoded once when the app registers. A user's MCP
+    ``tools/list`` result is assembled by joining the encoded tools of the
+    apps they have credentials for, and is cached by that set of apps, so
+    it changes only when their credentials or the registry change.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """Initialize an empty catalog
+
+        Args:
+            max_entries (int): Maximum number of cached per-app-set payloads
+        """
+        self._apps: Dict[str, CompiledApp] = {}
+        self._payloads = LRUCache(max_entries=max_entries)
+        self.version = 0
+
+    def compile(self, app_name: str, tools: Dict[str, Dict[str, Any]]) -> None:
+        """Encode an app's tool definitions, replacing any earlier ones
+
+        Args:
+            app_name (str): The name of the app
+            tools (Dict[str, Dict[str, Any]]): Tool definitions keyed by tool name
+        """
+        rest_items = b",".join(_encode(rest_tool(tool_def)) for tool_def in tools.values())
+        self._apps[app_name] = CompiledApp(
+            mcp_items=b",".join(_encode(mcp_tool(tool_def)) for tool_def in tools.values()),
+            rest_items=rest_items,
+            rest_list=EncodedPayload.from_bytes(b"[" + rest_items + b"]"),
+        )
+        self._changed()
+
+    def remove(self, app_name: str) -> None:
+        """Drop an app's tools from the catalog"""
+        if self._apps.pop(app_name, None) is not None:
+            self._changed()
+
+    def _changed(self) -> None:
+        """Drop assembled payloads after the registry changes"""
+        self.version += 1
+        self._payloads.clear()
+
+    def app_tools(self, app_name: str) -> Optional[EncodedPayload]:
+        """Get the encoded REST tool list for one app
+
+        Args:
+            app_name (str): The name of the app
+
+        Returns:
+            Optional[EncodedPayload]: JSON array of tools, or None if the app has none registered
+        """
+        compiled = self._apps.get(app_name)
+        return compiled.rest_list if compiled is not None else None
+
+    def tools_list(self, app_names: Iterable[str]) -> EncodedPayload:
+        """Get the encoded MCP ``tools/list`` result for a set of apps
+
+        Args:
+            app_names (Iterable[str]): Apps the user has credentials for
+
+        Returns:
+            EncodedPayload: JSON object ``{"tools": [...]}``
+        """
+        key: Tuple[str, ...] = tuple(app for app in app_names if app in self._apps)
+        payload = self._payloads.get(key)
+        if payload is not None:
+            metrics.increment("tool_catalog_hits")
+            return payload
+        metrics.increment("tool_catalog_misses")
+        items = [self._apps[app].mcp_items for app in key if self._apps[app].mcp_items]
+        payload = EncodedPayload.from_bytes(b'{"tools":[' + b",".join(items) + b"]}")
+        self._payloads.set(key, payload)
+        return payload
+
+    def clear(self) -> None:
+        """Drop every compiled app"""
+        self._apps.clear()
+        self._changed()
+
+    def stats(self) -> Dict[str, int]:
+        """Get catalog counters for metrics"""
+        return {"apps": len(self._apps), "version": self.version, **self._payloads.stats()}
+
+
+# Process-wide tool catalog, compiled as apps register
+tool_catalog = ToolCatalog()
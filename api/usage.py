@@ -0,0 +1,224 @@
+import os
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple, Type
+
+from sqlalchemy import bindparam, func, or_, select, update
+
+from api.models import App, MCPToken, Tool
+from api.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# How often buffered usage timestamps are written, and how many rows may wait
+USAGE_FLUSH_INTERVAL = float(os.getenv("USAGE_FLUSH_INTERVAL", "10"))
+USAGE_MAX_PENDING = int(os.getenv("USAGE_MAX_PENDING", "10000"))
+
+# Usage timestamp column maintained for each model
+TOUCH_COLUMNS = {
+    MCPToken: "last_used_at",
+    Tool: "last_used_at",
+    App: "last_accessed_at",
+}
+
+_apps = App.__table__
+_tools = Tool.__table__
+
+# Usage of a tool call, matched by name to the user's app row and its tool row
+_TOUCH_USER_APP = (
+    update(_apps)
+    .where(_apps.c.owner_id == bindparam("user_id"), func.lower(_apps.c.name) == bindparam("app_name"))
+    .values(last_accessed_at=bindparam("at"))
+)
+_TOUCH_USER_TOOL = (
+    update(_tools)
+    .where(
+        _tools.c.app_id.in_(
+            select(_apps.c.id)
+            .where(_apps.c.owner_id == bindparam("user_id"), func.lower(_apps.c.name) == bindparam("app_name"))
+            .scalar_subquery()
+        ),
+        or_(_tools.c.name == bindparam("tool_name"), _tools.c.name == bindparam("short_name"))
+    )
+    .values(last_used_at=bindparam("at"))
+)
+
+
+class UsageTracker:
+    """Write-behind buffer for usage timestamps
+
+    Touches are recorded in memory and coalesced per row, keeping the
+    latest time. Pending touches are written periodically, one bulk UPDATE
+    per model, and once more on shutdown. Tool calls are recorded by user,
+    app and tool name and matched to their rows when written, so the
+    request path needs no lookup.
+    """
+
+    def __init__(self, session_factory=None, interval: float = USAGE_FLUSH_INTERVAL,
+                 max_pending: int = USAGE_MAX_PENDING):
+        """Initialize the tracker
+
+        Args:
+            session_factory (callable, optional): Creates async DB sessions.
+                Defaults to ``api.database.AsyncSessionLocal``.
+            interval (float): Seconds between periodic flushes
+            max_pending (int): Pending rows that trigger an early flush
+        """
+        self.session_factory = session_factory
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[Type, int], datetime] = {}
+        self._tool_calls: Dict[Tuple[int, str, str], datetime] = {}
+        self._lock = threading.Lock()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+
+    def touch(self, model: Type, row_id: int, at: Optional[datetime] = None) -> None:
+        """Record that a row was used
+
+        Args:
+            model (Type): Model class listed in TOUCH_COLUMNS
+            row_id (int): Primary key of the row
+            at (Optional[datetime], optional): Time of use. Defaults to now.
+
+        Raises:
+            ValueError: If the model has no usage timestamp
+        """
+        if model not in TOUCH_COLUMNS:
+            raise ValueError(f"{model.__name__} has no usage timestamp")
+        self._record(self._pending, (model, row_id), at)
+
+    def touch_tool(self, user_id: int, app_name: str, tool_name: str, at: Optional[datetime] = None) -> None:
+        """Record that a user ran a tool
+
+        Updates ``last_accessed_at`` of the user's app with that name and
+        ``last_used_at`` of its tool, if the user has registered them.
+
+        Args:
+            user_id (int): User ID
+            app_name (str): The name of the app, e.g. 'github'
+            tool_name (str): Tool name, e.g. 'github.list_repos'
+            at (Optional[datetime], optional): Time of use. Defaults to now.
+        """
+        self._record(self._tool_calls, (user_id, app_name, tool_name), at)
+
+    def _record(self, pending: dict, key: tuple, at: Optional[datetime]) -> None:
+        """Keep the latest time for a key, flushing early when the buffer fills up"""
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            previous = pending.get(key)
+            if previous is None or at > previous:
+                pending[key] = at
+            count = len(self._pending) + len(self._tool_calls)
+        if count >= self.max_pending:
+            self._schedule_early_flush()
+
+    def _schedule_early_flush(self) -> None:
+        """Flush in the background when the buffer fills up"""
+        if self._early_flush is not None and not self._early_flush.done():
+            return
+        try:
+            self._early_flush = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            # No running loop; the periodic or shutdown flush will write them
+            pass
+
+    async def flush(self) -> int:
+        """Write pending touches as one bulk UPDATE per model
+
+        Touches that fail to write are kept for the next flush.
+
+        Returns:
+            int: Number of rows updated
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                tool_calls, self._tool_calls = self._tool_calls, {}
+            if not pending and not tool_calls:
+                return 0
+
+            by_model: Dict[Type, list] = {}
+            for (model, row_id), at in pending.items():
+                by_model.setdefault(model, []).append({"id": row_id, TOUCH_COLUMNS[model]: at})
+
+            app_rows: Dict[Tuple[int, str], datetime] = {}
+            tool_rows = []
+            for (user_id, app_name, tool_name), at in tool_calls.items():
+                app_key = (user_id, app_name.lower())
+                if app_key not in app_rows or at > app_rows[app_key]:
+                    app_rows[app_key] = at
+                tool_rows.append({
+                    "user_id": user_id, "app_name": app_name.lower(), "at": at,
+                    "tool_name": tool_name, "short_name": tool_name.split(".", 1)[-1],
+                })
+
+            session_factory = self.session_factory
+            if session_factory is None:
+                from api.database import AsyncSessionLocal
+                session_factory = AsyncSessionLocal
+            try:
+                async with session_factory() as db:
+                    for model, rows in by_model.items():
+                        await db.execute(update(model), rows)
+                    if tool_calls:
+                        await db.execute(_TOUCH_USER_APP, [
+                            {"user_id": user_id, "app_name": app_name, "at": at}
+                            for (user_id, app_name), at in app_rows.items()
+                        ])
+                        await db.execute(_TOUCH_USER_TOOL, tool_rows)
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to flush {len(pending) + len(tool_calls)} usage timestamps: {str(e)}")
+                self._restore(self._pending, pending)
+                self._restore(self._tool_calls, tool_calls)
+                return 0
+
+            flushed = len(pending) + len(tool_calls)
+            metrics.increment("usage_rows_flushed", flushed)
+            return flushed
+
+    def _restore(self, target: dict, unwritten: dict) -> None:
+        """Put unwritten touches back, keeping the latest time per key"""
+        with self._lock:
+            for key, at in unwritten.items():
+                current = target.get(key)
+                if current is None or at > current:
+                    target[key] = at
+
+    async def _run(self) -> None:
+        """Flush periodically until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start periodic flushing on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic flushing and write any pending touches"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._flush_lock = None
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of touches waiting to be written"""
+        with self._lock:
+            return {"pending": len(self._pending) + len(self._tool_calls)}
+
+
+# Process-wide usage tracker
+usage_tracker = UsageTracker()
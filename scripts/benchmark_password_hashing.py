@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the effect of password hashing on concurrent tool latency.
+
+Simulated tool calls (each awaiting a short upstream delay) run on the event
+loop while a burst of logins verifies bcrypt hashes, first inline on the
+event loop as the login route used to, then in the password hashing pool.
+
+Usage:
+    python scripts/benchmark_password_hashing.py [--logins 20] [--tool-calls 200]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add the parent directory to sys.path to import the api module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.auth import utils
+
+
+async def tool_call(upstream_delay: float) -> float:
+    """Simulate a tool call and return its latency in seconds"""
+    start = time.perf_counter()
+    await asyncio.sleep(upstream_delay)
+    return time.perf_counter() - start
+
+
+async def login_inline(password: str, hashed: str) -> None:
+    """Verify a password on the event loop"""
+    utils.verify_and_update_password(password, hashed)
+
+
+async def login_pooled(password: str, hashed: str) -> None:
+    """Verify a password in the hashing pool"""
+    await utils.verify_and_update_password_async(password, hashed)
+
+
+async def run_scenario(login, logins: int, tool_calls: int, upstream_delay: float, hashed: str) -> dict:
+    """Run tool calls alongside a login burst and summarize tool latency"""
+    async def tools():
+        latencies = []
+        for _ in range(tool_calls):
+            latencies.append(await tool_call(upstream_delay))
+        return latencies
+
+    start = time.perf_counter()
+    tool_task = asyncio.create_task(tools())
+    await asyncio.gather(*(login("password", hashed) for _ in range(logins)))
+    latencies = sorted(await tool_task)
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "total_s": time.perf_counter() - start,
+    }
+
+
+async def main(args):
+    """Compare tool latency with inline and pooled password hashing"""
+    hashed = utils.get_password_hash("password")
+    print(f"bcrypt rounds: {utils.BCRYPT_ROUNDS}, pool: {utils.PASSWORD_HASH_POOL} "
+          f"x{utils.PASSWORD_HASH_WORKERS}, logins: {args.logins}, tool calls: {args.tool_calls}")
+
+    for name, login in (("inline", login_inline), ("pooled", login_pooled)):
+        result = await run_scenario(login, args.logins, args.tool_calls, args.upstream_delay, hashed)
+        print(f"{name:>7}: tool p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, "
+              f"max {result['max_ms']:.1f} ms, total {result['total_s']:.2f} s")
+
+    utils.shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=20, help="Concurrent logins in the burst")
+    parser.add_argument("--tool-calls", type=int, default=200, help="Sequential simulated tool calls")
+    parser.add_argument("--upstream-delay", type=float, default=0.005, help="Simulated upstream latency in seconds")
+    asyncio.run(main(parser.parse_args()))
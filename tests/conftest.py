@@ -1,13 +1,15 @@
 import pytest
 import os
+import tempfile
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-# Temporarily set DATABASE_URL to use in-memory SQLite for tests
-# Use SQLite-compatible parameters
-os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+# Temporarily set DATABASE_URL to use a file-backed SQLite database for tests
+# so the sync fixtures and the app's async (aiosqlite) engine share the same data
+TEST_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ['DATABASE_URL'] = f'sqlite:///{TEST_DB_PATH}'
 os.environ['TESTING'] = 'True'
 
 # Now import app and database components after setting the environment variable
@@ -17,7 +19,7 @@ from api.models import User, SlackCredentials
 from api.apps.github.models import GitHubCredential
 
 
-# Create a test database in memory
+# Create a test database
 # We already set DATABASE_URL, so we can use it directly from the api.database module
 from api.database import engine
 
@@ -66,6 +68,10 @@ def client(db_session, test_user):
     
     # Remove the overrides after the test
     app.dependency_overrides.clear()
+    
+    # Token IDs are reused once the tables are dropped, so forget cached tokens and revocations
+    from api.auth.mcp_tokens import mcp_token_validator
+    mcp_token_validator.clear()
 
 
 @pytest.fixture(scope="function")
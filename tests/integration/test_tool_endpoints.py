@@ -1,15 +1,16 @@
+import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 @pytest.mark.usefixtures("client", "test_user", "github_credentials", "slack_credentials")
 class TestToolEndpoints:
     """Integration tests for tool endpoints"""    
     
-    @patch("api.apps.github.utils.get_github_client_for_user")
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
     def test_execute_github_tool(self, mock_get_client, client, test_user):
         """Test executing a GitHub tool through the API endpoint"""
         # Setup mock GitHub client
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_client.list_repositories.return_value = [{"name": "repo1"}, {"name": "repo2"}]
         mock_get_client.return_value = mock_client
         
@@ -27,14 +28,15 @@ class TestToolEndpoints:
         # Assert response contains expected data
         assert "success" in response.json()
         assert "result" in response.json()
+        assert response.json()["result"] == {"repositories": [{"name": "repo1"}, {"name": "repo2"}]}
         # Assert client was called correctly
-        mock_client.list_repositories.assert_called_once()
+        mock_client.list_repositories.assert_awaited_once()
     
-    @patch("api.apps.slack.utils.get_slack_client_for_user")
+    @patch("api.apps.slack.utils.get_slack_client_for_user", new_callable=AsyncMock)
     def test_execute_slack_tool(self, mock_get_client, client, test_user):
         """Test executing a Slack tool through the API endpoint"""
         # Setup mock Slack client
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_client.list_channels.return_value = {
             "ok": True,
             "channels": [{"id": "C1234", "name": "general"}]
@@ -54,13 +56,105 @@ class TestToolEndpoints:
         assert response.status_code == 200
         # Assert response contains expected data
         assert "success" in response.json()
-        assert "result" in response.json()
+        assert response.json()["success"] is True
+        assert response.json()["result"]["channels"] == [{"id": "C1234", "name": "general"}]
         # Assert client was called correctly
         # The actual call includes a cursor=None parameter which is fine
         assert mock_client.list_channels.called
         args, kwargs = mock_client.list_channels.call_args
         assert kwargs.get('limit') == 10
     
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
+    def test_stream_github_tool(self, mock_get_client, client, test_user):
+        """Test streaming a paginated GitHub tool as NDJSON"""
+        async def pages():
+            yield [{"name": "repo1"}, {"name": "repo2"}]
+            yield [{"name": "repo3"}]
+        mock_client = AsyncMock()
+        mock_client.iter_repositories = MagicMock(return_value=pages())
+        mock_get_client.return_value = mock_client
+        
+        response = client.post(
+            "/api/v1/execute/stream/",
+            json={"tool": "github.list_repos", "parameters": {}}
+        )
+        
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [
+            {"items": [{"name": "repo1"}, {"name": "repo2"}]},
+            {"items": [{"name": "repo3"}]},
+            {"done": True, "count": 3}
+        ]
+    
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
+    def test_stream_unsupported_tool(self, mock_get_client, client, test_user):
+        """Test streaming a tool that is not paginated returns 400"""
+        mock_get_client.return_value = AsyncMock()
+        
+        response = client.post(
+            "/api/v1/execute/stream/",
+            json={"tool": "github.get_user", "parameters": {}}
+        )
+        
+        assert response.status_code == 400
+    
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
+    def test_execute_batch(self, mock_get_client, client, test_user):
+        """Test executing a batch of tools returns results in input order"""
+        mock_client = AsyncMock()
+        mock_client.get_repository.side_effect = lambda owner, repo: {"full_name": f"{owner}/{repo}"}
+        mock_get_client.return_value = mock_client
+        
+        response = client.post(
+            "/api/v1/execute/batch/",
+            json={
+                "calls": [
+                    {"tool": "github.get_repo", "parameters": {"owner": "o", "repo": "a"}},
+                    {"tool": "unknown.tool"},
+                    {"tool": "github.get_repo", "parameters": {"owner": "o", "repo": "b"}}
+                ]
+            }
+        )
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["tool"] for r in results] == ["github.get_repo", "unknown.tool", "github.get_repo"]
+        assert results[0]["result"] == {"full_name": "o/a"}
+        assert results[1]["success"] is False
+        assert results[2]["result"] == {"full_name": "o/b"}
+        # The handler (and its credential lookup) is built once for the batch
+        mock_get_client.assert_called_once()
+    
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
+    def test_execute_read_only_tool_cached(self, mock_get_client, client, test_user):
+        """Test repeated read-only calls are served from the result cache"""
+        from api.tool_cache import tool_result_cache
+        tool_result_cache.clear()
+        mock_client = AsyncMock()
+        mock_client.credential_key = "credential"
+        mock_client.get_repository.return_value = {"full_name": "o/a"}
+        mock_get_client.return_value = mock_client
+        payload = {"tool": "github.get_repo", "parameters": {"owner": "o", "repo": "a"}}
+        
+        try:
+            first = client.post("/api/v1/execute/", json=payload)
+            second = client.post("/api/v1/execute/", json=payload)
+            assert first.json()["result"] == second.json()["result"] == {"full_name": "o/a"}
+            mock_client.get_repository.assert_awaited_once()
+            
+            # bypass_cache forces a fresh upstream call
+            client.post("/api/v1/execute/", json={**payload, "bypass_cache": True})
+            assert mock_client.get_repository.await_count == 2
+        finally:
+            tool_result_cache.clear()
+    
+    def test_execute_batch_empty(self, client):
+        """Test an empty batch is rejected"""
+        response = client.post("/api/v1/execute/batch/", json={"calls": []})
+        
+        assert response.status_code == 400
+    
     def test_unknown_tool(self, client):
         """Test attempting to execute an unknown tool"""
         response = client.post(
@@ -95,3 +189,172 @@ class TestToolEndpoints:
         # Description should mention github and slack apps
         assert "github" in data["description"]
         assert "slack" in data["description"]
+    
+    def test_revoke_unknown_mcp_token(self, client):
+        """Test revoking a token that does not exist returns 404"""
+        response = client.delete("/api/v1/mcp-tokens/9999/")
+        
+        assert response.status_code == 404
+    
+    def test_mcp_stream_rejects_invalid_token(self, client):
+        """Test opening an MCP session requires a valid MCP token"""
+        response = client.get("/api/v1/mcp", params={"token": "not-a-token"})
+        
+        assert response.status_code == 401
+    
+    def test_mcp_message_unknown_session(self, client):
+        """Test posting to a session that is not open returns 404"""
+        response = client.post(
+            "/api/v1/mcp/messages",
+            params={"session_id": "missing"},
+            json={"jsonrpc": "2.0", "id": 1, "method": "ping"}
+        )
+        
+        assert response.status_code == 404
+    
+    def test_mcp_messages_rejected_after_revocation(self, client, test_user):
+        """Test an open SSE session stops accepting messages once its token is revoked"""
+        from api.mcp_server import mcp_sessions
+        session = mcp_sessions.get(self._open_streamable_session(client))
+        
+        assert client.delete(f"/api/v1/mcp-tokens/{session.token.token_id}/").status_code == 204
+        
+        assert session.closed
+        response = client.post(
+            "/api/v1/mcp/messages",
+            params={"session_id": session.session_id},
+            json={"jsonrpc": "2.0", "id": 1, "method": "ping"}
+        )
+        assert response.status_code == 404
+        response = client.post(
+            "/api/v1/mcp",
+            headers={"Mcp-Session-Id": session.session_id},
+            json={"jsonrpc": "2.0", "id": 2, "method": "ping"}
+        )
+        assert response.status_code == 404
+    
+    def test_mcp_streamable_session_ends_when_revoked_elsewhere(self, client, db_session):
+        """Test a Streamable HTTP session stops working once another worker revokes its token"""
+        from api.auth.mcp_tokens import mcp_token_validator
+        from api.mcp_server import mcp_sessions
+        from api.models import MCPToken
+        session = mcp_sessions.get(self._open_streamable_session(client))
+        
+        # Revoke directly in the database, as another worker would
+        db_session.query(MCPToken).filter(MCPToken.id == session.token.token_id).update({"is_revoked": True})
+        db_session.commit()
+        
+        with patch.object(mcp_token_validator, "check_interval", 0):
+            response = client.post(
+                "/api/v1/mcp",
+                headers={"Mcp-Session-Id": session.session_id},
+                json={"jsonrpc": "2.0", "id": 1, "method": "ping"}
+            )
+        
+        assert response.status_code == 404
+        assert session.closed
+    
+    def _open_streamable_session(self, client):
+        """Initialize a Streamable HTTP MCP session and return its ID"""
+        token = client.get("/api/v1/mcp-url/").json()["url"].split("token=")[1]
+        response = client.post(
+            "/api/v1/mcp",
+            params={"token": token},
+            json={"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {"protocolVersion": "2025-03-26"}}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"]["protocolVersion"] == "2025-03-26"
+        return response.headers["Mcp-Session-Id"]
+    
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
+    def test_mcp_streamable_batch_json(self, mock_get_client, client, test_user):
+        """Test a fast batch over Streamable HTTP gets a plain JSON array in input order"""
+        mock_client = AsyncMock()
+        mock_client.get_repository.side_effect = lambda owner, repo: {"full_name": f"{owner}/{repo}"}
+        mock_get_client.return_value = mock_client
+        session_id = self._open_streamable_session(client)
+        
+        response = client.post(
+            "/api/v1/mcp",
+            headers={"Mcp-Session-Id": session_id, "Accept": "application/json, text/event-stream"},
+            json=[
+                {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                 "params": {"name": "github.get_repo", "arguments": {"owner": "o", "repo": "a"}}},
+                {"jsonrpc": "2.0", "method": "notifications/initialized"},
+                {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                 "params": {"name": "github.get_repo", "arguments": {"owner": "o", "repo": "b"}}}
+            ]
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert [message["id"] for message in response.json()] == [1, 2]
+        assert json.loads(response.json()[1]["result"]["content"][0]["text"]) == {"full_name": "o/b"}
+        
+        assert client.delete("/api/v1/mcp", headers={"Mcp-Session-Id": session_id}).status_code == 204
+    
+    @patch("api.routers.mcp.MCP_JSON_RESPONSE_WAIT", 0.01)
+    @patch("api.apps.github.utils.get_github_client_for_user", new_callable=AsyncMock)
+    def test_mcp_streamable_batch_streams_as_completed(self, mock_get_client, client, test_user):
+        """Test a slow batch is streamed as SSE with responses in completion order"""
+        import asyncio
+        
+        async def get_repository(owner, repo):
+            await asyncio.sleep(0.2 if repo == "slow" else 0.05)
+            return {"full_name": f"{owner}/{repo}"}
+        mock_client = AsyncMock()
+        mock_client.get_repository.side_effect = get_repository
+        mock_get_client.return_value = mock_client
+        session_id = self._open_streamable_session(client)
+        
+        response = client.post(
+            "/api/v1/mcp",
+            headers={"Mcp-Session-Id": session_id, "Accept": "application/json, text/event-stream"},
+            json=[
+                {"jsonrpc": "2.0", "id": 1, "method": "tools/call",
+                 "params": {"name": "github.get_repo", "arguments": {"owner": "o", "repo": "slow"}}},
+                {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                 "params": {"name": "github.get_repo", "arguments": {"owner": "o", "repo": "fast"}}}
+            ]
+        )
+        
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+        assert [message["id"] for message in messages] == [2, 1]
+    
+    def test_mcp_streamable_requires_session(self, client):
+        """Test requests other than initialize need a session ID"""
+        response = client.post("/api/v1/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+        assert response.status_code == 400
+        
+        response = client.post(
+            "/api/v1/mcp",
+            headers={"Mcp-Session-Id": "missing"},
+            json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+        )
+        assert response.status_code == 404
+    
+    def test_list_app_tools_etag(self, client):
+        """Test an app's tool list is served with an ETag and revalidates with 304"""
+        response = client.get("/api/v1/apps/github/tools/")
+        
+        assert response.status_code == 200
+        assert "github.get_repo" in [tool["name"] for tool in response.json()]
+        
+        etag = response.headers["etag"]
+        response = client.get("/api/v1/apps/github/tools/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    
+    def test_mcp_tools_list(self, client, github_credentials, slack_credentials):
+        """Test tools/list returns the catalog tools of the user's connected apps"""
+        session_id = self._open_streamable_session(client)
+        
+        response = client.post(
+            "/api/v1/mcp",
+            headers={"Mcp-Session-Id": session_id},
+            json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+        )
+        
+        names = [tool["name"] for tool in response.json()["result"]["tools"]]
+        assert "github.list_repos" in names
+        assert "slack.list_channels" in names
@@ -1,41 +1,47 @@
+import asyncio
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from pathlib import Path
 import sys
 
+import httpx
+
 # Add the project root to the Python path to allow importing modules without installing the package
 project_root = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from api.apps.github.client import GitHubClient
+from api.cache import LRUCache
+from api.progress import ProgressReporter, progress_context
 
 
-class TestGitHubClient(unittest.TestCase):
+class TestGitHubClient(unittest.IsolatedAsyncioTestCase):
     """Unit tests for GitHubClient class"""
     
     def setUp(self):
         """Set up test fixtures"""
         self.access_token = "test_token"
-        self.client = GitHubClient(access_token=self.access_token)
+        self.client = GitHubClient(access_token=self.access_token, validator_cache=None)
     
     def test_initialization(self):
         """Test client initialization sets the correct properties"""
         self.assertEqual(self.client.access_token, self.access_token)
         self.assertEqual(self.client.headers["Authorization"], f"Bearer {self.access_token}")
     
-    @patch('api.apps.github.client.requests.request')
-    def test_get_user(self, mock_request):
+    @patch('api.apps.github.client.get_http_client')
+    async def test_get_user(self, mock_get_http_client):
         """Test get_user method makes correct API call"""
         # Setup mock response
         mock_response = Mock()
         mock_response.content = True
         mock_response.json.return_value = {"login": "test_user", "id": 12345}
-        mock_request.return_value = mock_response
+        mock_request = AsyncMock(return_value=mock_response)
+        mock_get_http_client.return_value.request = mock_request
         
         # Call the method
-        result = self.client.get_user()
+        result = await self.client.get_user()
         
-        # Assert requests.request was called with correct args
+        # Assert the shared HTTP client was called with correct args
         mock_request.assert_called_once_with(
             method="GET",
             url="https://api.github.com/user",
@@ -45,27 +51,114 @@ class TestGitHubClient(unittest.TestCase):
         # Assert the result is the mocked response
         self.assertEqual(result, {"login": "test_user", "id": 12345})
     
-    @patch('api.apps.github.client.requests.request')
-    def test_list_repositories(self, mock_request):
+    @patch('api.apps.github.client.get_http_client')
+    async def test_list_repositories(self, mock_get_http_client):
         """Test list_repositories method makes correct API call"""
         # Setup mock response
         mock_response = Mock()
         mock_response.content = True
         mock_response.json.return_value = [{"name": "repo1"}, {"name": "repo2"}]
-        mock_request.return_value = mock_response
+        mock_response.links = {}
+        mock_request = AsyncMock(return_value=mock_response)
+        mock_get_http_client.return_value.request = mock_request
         
         # Call the method
-        result = self.client.list_repositories()
+        result = await self.client.list_repositories()
         
-        # Assert requests.request was called with correct args
+        # Assert the shared HTTP client was called with correct args
         mock_request.assert_called_once_with(
             method="GET",
             url="https://api.github.com/user/repos",
-            headers=self.client.headers
+            headers=self.client.headers,
+            params={"per_page": 100}
         )
         
         # Assert the result is the mocked response
         self.assertEqual(result, [{"name": "repo1"}, {"name": "repo2"}])
+    
+    @patch('api.apps.github.client.get_http_client')
+    async def test_pagination_follows_link_header(self, mock_get_http_client):
+        """Test list methods follow the next link until the last page"""
+        next_url = "https://api.github.com/repos/o/r/issues?per_page=2&page=2"
+        first_page = Mock(content=True, links={"next": {"url": next_url}})
+        first_page.json.return_value = [{"number": 1}, {"number": 2}]
+        last_page = Mock(content=True, links={})
+        last_page.json.return_value = [{"number": 3}]
+        mock_request = AsyncMock(side_effect=[first_page, last_page])
+        mock_get_http_client.return_value.request = mock_request
+        
+        result = await self.client.list_issues("o", "r", page_size=2)
+        
+        self.assertEqual(result, [{"number": 1}, {"number": 2}, {"number": 3}])
+        self.assertEqual(mock_request.call_args_list[0].kwargs["params"], {"per_page": 2})
+        self.assertEqual(mock_request.call_args_list[1].kwargs["url"], next_url)
+        self.assertIsNone(mock_request.call_args_list[1].kwargs["params"])
+    
+    @patch('api.apps.github.client.get_http_client')
+    async def test_list_reports_progress_per_page(self, mock_get_http_client):
+        """Test list methods report items so far after each page when a reporter is active"""
+        next_url = "https://api.github.com/repos/o/r/issues?per_page=2&page=2"
+        first_page = Mock(content=True, links={"next": {"url": next_url}})
+        first_page.json.return_value = [{"number": 1}, {"number": 2}]
+        last_page = Mock(content=True, links={})
+        last_page.json.return_value = [{"number": 3}]
+        mock_get_http_client.return_value.request = AsyncMock(side_effect=[first_page, last_page])
+        sent = []
+        
+        with progress_context(ProgressReporter(sent.append, "tok")):
+            await self.client.list_issues("o", "r", page_size=2)
+        await asyncio.sleep(0)
+        
+        self.assertEqual([message["params"]["progress"] for message in sent], [2, 3])
+    
+    @patch('api.apps.github.client.get_http_client')
+    async def test_pagination_stops_at_max_items(self, mock_get_http_client):
+        """Test pagination stops requesting pages once max_items is reached"""
+        page = Mock(content=True, links={"next": {"url": "https://api.github.com/user/repos?page=2"}})
+        page.json.return_value = [{"id": 1}, {"id": 2}, {"id": 3}]
+        mock_request = AsyncMock(return_value=page)
+        mock_get_http_client.return_value.request = mock_request
+        
+        pages = [p async for p in self.client.iter_repositories(max_items=3)]
+        
+        self.assertEqual(pages, [[{"id": 1}, {"id": 2}, {"id": 3}]])
+        mock_request.assert_awaited_once()
+        self.assertEqual(mock_request.call_args.kwargs["params"], {"per_page": 3})
+    
+    async def test_conditional_get_serves_cached_body_on_304(self):
+        """Test GETs revalidate with If-None-Match and reuse the body on 304"""
+        seen = []
+        
+        def respond(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=[{"number": 1}], headers={"ETag": '"v1"'})
+        
+        cache = LRUCache(max_size=1024)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(respond)) as http_client:
+            client = GitHubClient(self.access_token, http_client=http_client, validator_cache=cache)
+            first = await client.list_issues("o", "r")
+            second = await client.list_issues("o", "r")
+            other = GitHubClient("other_token", http_client=http_client, validator_cache=cache)
+            await other.list_issues("o", "r")
+        
+        self.assertEqual(first, second)
+        # The other credential does not reuse this credential's validators
+        self.assertEqual(seen, [None, '"v1"', None])
+    
+    async def test_uses_injected_http_client(self):
+        """Test that an explicitly provided HTTP client is used instead of the shared one"""
+        mock_response = Mock()
+        mock_response.content = b""
+        http_client = Mock()
+        http_client.request = AsyncMock(return_value=mock_response)
+        client = GitHubClient(access_token=self.access_token, http_client=http_client)
+        
+        result = await client.get_user()
+        
+        http_client.request.assert_awaited_once()
+        self.assertEqual(result, {})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from api.apps.github.coalescer import GraphQLCoalescer, get_coalescer, repository_to_rest
+
+
+def repository_node(owner, name):
+    """Build a minimal GraphQL Repository node"""
+    return {
+        "databaseId": 1,
+        "name": name,
+        "nameWithOwner": f"{owner}/{name}",
+        "owner": {"login": owner},
+        "isPrivate": False,
+        "defaultBranchRef": {"name": "main"},
+        "openIssues": {"totalCount": 4},
+    }
+
+
+class TestGraphQLCoalescer(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for GraphQLCoalescer"""
+
+    def setUp(self):
+        """Set up a coalescer with a mocked client"""
+        self.client = Mock()
+        self.client._make_request = AsyncMock()
+        self.coalescer = GraphQLCoalescer(self.client, window=0.01, max_batch=10)
+
+    async def test_concurrent_reads_share_one_query(self):
+        """Test reads issued together are sent as one aliased query"""
+        self.client._make_request.return_value = {
+            "data": {"r0": repository_node("o", "a"), "r1": repository_node("o", "b")}
+        }
+
+        repo_a, repo_b = await asyncio.gather(
+            self.coalescer.get_repository("o", "a"),
+            self.coalescer.get_repository("o", "b"),
+        )
+
+        self.client._make_request.assert_awaited_once()
+        payload = self.client._make_request.call_args.kwargs["json"]
+        self.assertIn("r0: repository(owner: $r0_owner, name: $r0_name)", payload["query"])
+        self.assertEqual(payload["variables"]["r1_name"], "b")
+        self.assertEqual(repo_a["full_name"], "o/a")
+        self.assertEqual(repo_b["default_branch"], "main")
+
+    async def test_query_aborted_when_every_read_cancelled(self):
+        """Test the shared query is cancelled once no read is waiting for it"""
+        request_cancelled = asyncio.Event()
+
+        async def make_request(*args, **kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                request_cancelled.set()
+                raise
+        self.client._make_request.side_effect = make_request
+
+        reads = [asyncio.ensure_future(self.coalescer.get_repository("o", name)) for name in ("a", "b")]
+        await asyncio.sleep(0.05)
+        self.client._make_request.assert_awaited_once()
+        for read in reads:
+            read.cancel()
+
+        await asyncio.wait_for(request_cancelled.wait(), 1)
+
+    async def test_cancelled_reads_are_not_sent(self):
+        """Test reads cancelled before the window closes are left out of the query"""
+        self.client._make_request.return_value = {"data": {"r0": repository_node("o", "b")}}
+
+        cancelled = asyncio.ensure_future(self.coalescer.get_repository("o", "a"))
+        kept = asyncio.ensure_future(self.coalescer.get_repository("o", "b"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        self.assertEqual((await kept)["full_name"], "o/b")
+        self.assertEqual(self.client._make_request.call_args.kwargs["json"]["variables"]["r0_name"], "b")
+
+    async def test_error_only_fails_its_read(self):
+        """Test an error for one alias does not fail the other reads"""
+        self.client._make_request.return_value = {
+            "data": {"r0": repository_node("o", "a"), "r1": None},
+            "errors": [{"path": ["r1"], "message": "Could not resolve to a Repository"}]
+        }
+
+        results = await asyncio.gather(
+            self.coalescer.get_repository("o", "a"),
+            self.coalescer.get_repository("o", "missing"),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(results[0]["full_name"], "o/a")
+        self.assertIsInstance(results[1], Exception)
+        self.assertIn("Could not resolve", str(results[1]))
+
+    async def test_query_error_fails_every_read_with_its_message(self):
+        """Test errors without a path, e.g. rate limits, are reported instead of not found"""
+        self.client._make_request.return_value = {
+            "data": None,
+            "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]
+        }
+
+        results = await asyncio.gather(
+            self.coalescer.get_repository("o", "a"),
+            self.coalescer.get_repository("o", "b"),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            self.assertIsInstance(result, Exception)
+            self.assertIn("API rate limit exceeded", str(result))
+            self.assertNotIn("not found", str(result))
+
+    async def test_list_issues_follows_cursor(self):
+        """Test list reads page with GraphQL cursors up to max_items"""
+        self.client._make_request.side_effect = [
+            {"data": {"r0": {"issues": {
+                "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                "nodes": [{"number": 2, "state": "OPEN", "author": {"login": "u"}}]
+            }}}},
+            {"data": {"r0": {"issues": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [{"number": 1, "state": "OPEN", "author": None}]
+            }}}},
+        ]
+        self.coalescer.MAX_FIRST = 1
+
+        issues = await self.coalescer.list_issues("o", "r", max_items=5)
+
+        self.assertEqual([issue["number"] for issue in issues], [2, 1])
+        self.assertEqual(issues[0]["state"], "open")
+        self.assertEqual(issues[0]["user"], {"login": "u"})
+        second_call = self.client._make_request.call_args_list[1].kwargs["json"]
+        self.assertEqual(second_call["variables"]["r0_after"], "c1")
+        self.assertIn("IssueFields", second_call["query"])
+        self.assertNotIn("RepositoryFields", second_call["query"])
+
+    async def test_request_failure_fails_every_read(self):
+        """Test a failed query propagates to every read in the batch"""
+        self.client._make_request.side_effect = Exception("boom")
+
+        results = await asyncio.gather(
+            self.coalescer.get_repository("o", "a"),
+            self.coalescer.get_repository("o", "b"),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(result, Exception) for result in results))
+
+    def test_repository_to_rest(self):
+        """Test GraphQL repositories map to REST field names"""
+        rest = repository_to_rest(repository_node("o", "a"))
+
+        self.assertEqual(rest["open_issues_count"], 4)
+        self.assertEqual(rest["owner"], {"login": "o"})
+        self.assertFalse(rest["private"])
+
+    def test_get_coalescer_shared_per_credential(self):
+        """Test clients with the same token share one coalescer"""
+        first = get_coalescer(Mock(access_token="token-a"))
+
+        self.assertIs(get_coalescer(Mock(access_token="token-a")), first)
+        self.assertIsNot(get_coalescer(Mock(access_token="token-b")), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,15 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from api.apps.github.tools import GitHubToolHandler, create_github_handler, GITHUB_TOOLS
 
 
-class TestGitHubTools(unittest.TestCase):
+class TestGitHubTools(unittest.IsolatedAsyncioTestCase):
     """Unit tests for GitHub tools"""
     
     def setUp(self):
         """Set up test fixtures"""
-        self.mock_client = Mock()
+        self.mock_client = AsyncMock()
         self.handler = GitHubToolHandler(self.mock_client)
     
     def test_tool_registry(self):
@@ -25,8 +25,8 @@ class TestGitHubTools(unittest.TestCase):
         for tool in expected_tools:
             self.assertIn(tool, GITHUB_TOOLS, f"Tool {tool} should be in GITHUB_TOOLS")
     
-    @patch('api.apps.github.utils.get_github_client_for_user')
-    def test_handler_factory(self, mock_get_client):
+    @patch('api.apps.github.utils.get_github_client_for_user', new_callable=AsyncMock)
+    async def test_handler_factory(self, mock_get_client):
         """Test that the factory function creates a handler with the client"""
         # Setup mock client and database
         mock_client = Mock()
@@ -35,7 +35,7 @@ class TestGitHubTools(unittest.TestCase):
         mock_user_id = 123
         
         # Call the factory function
-        handler = create_github_handler(mock_user_id, mock_db)
+        handler = await create_github_handler(mock_user_id, mock_db)
         
         # Check that the handler is a GitHubToolHandler
         self.assertIsInstance(handler, GitHubToolHandler)
@@ -43,41 +43,90 @@ class TestGitHubTools(unittest.TestCase):
         self.assertEqual(handler.client, mock_client)
     
     @patch('api.apps.github.tools.logger')
-    def test_execute_get_user(self, mock_logger):
+    async def test_execute_get_user(self, mock_logger):
         """Test executing the get_user tool"""
         # Setup mock response
         self.mock_client.get_user.return_value = {"login": "test_user", "id": 12345}
         
         # Call the method
-        result = self.handler.execute_tool("github.get_user", {})
+        result = await self.handler.execute_tool("github.get_user", {})
         
         # Assert client method was called
-        self.mock_client.get_user.assert_called_once()
+        self.mock_client.get_user.assert_awaited_once()
         
         # Assert the result is the mocked response
         self.assertEqual(result, {"login": "test_user", "id": 12345})
     
     @patch('api.apps.github.tools.logger')
-    def test_execute_list_repositories(self, mock_logger):
+    async def test_execute_list_repositories(self, mock_logger):
         """Test executing the list_repos tool"""
         # Setup mock response
         self.mock_client.list_repositories.return_value = [{"name": "repo1"}, {"name": "repo2"}]
         
         # Call the method
-        result = self.handler.execute_tool("github.list_repos", {})
+        result = await self.handler.execute_tool("github.list_repos", {})
         
         # Assert client method was called
-        self.mock_client.list_repositories.assert_called_once_with()
+        self.mock_client.list_repositories.assert_awaited_once_with(page_size=100, max_items=1000)
         
         # Assert the result is the mocked response
         self.assertEqual(result, {"repositories": [{"name": "repo1"}, {"name": "repo2"}]})
     
     @patch('api.apps.github.tools.logger')
-    def test_execute_unknown_tool(self, mock_logger):
+    async def test_execute_list_issues_with_pagination(self, mock_logger):
+        """Test pagination parameters are passed to the client"""
+        self.mock_client.list_issues.return_value = [{"number": 1}]
+        
+        result = await self.handler.execute_tool("github.list_issues", {
+            "owner": "o", "repo": "r", "max_items": 50, "page_size": 500
+        })
+        
+        self.mock_client.list_issues.assert_awaited_once_with("o", "r", page_size=100, max_items=50)
+        self.assertEqual(result, {"issues": [{"number": 1}]})
+    
+    @patch('api.apps.github.tools.logger')
+    async def test_execute_rejects_zero_max_items(self, mock_logger):
+        """Test an explicit max_items of 0 is rejected rather than replaced by the default"""
+        result = await self.handler.execute_tool("github.list_repos", {"max_items": 0})
+
+        self.assertEqual(result, {"error": "max_items and page_size must be positive"})
+        self.mock_client.list_repositories.assert_not_awaited()
+
+    async def test_reads_use_coalescer_when_enabled(self):
+        """Test coalescable reads go through the GraphQL coalescer"""
+        coalescer = AsyncMock()
+        coalescer.get_repository.return_value = {"full_name": "o/r"}
+        handler = GitHubToolHandler(self.mock_client, coalescer=coalescer)
+        
+        result = await handler.execute_tool("github.get_repo", {"owner": "o", "repo": "r"})
+        
+        coalescer.get_repository.assert_awaited_once_with("o", "r")
+        self.mock_client.get_repository.assert_not_called()
+        self.assertEqual(result, {"full_name": "o/r"})
+    
+    async def test_stream_tool(self):
+        """Test list tools stream pages from the client iterator"""
+        async def pages():
+            yield [{"name": "repo1"}]
+            yield [{"name": "repo2"}]
+        self.mock_client.iter_repositories = Mock(return_value=pages())
+        
+        result = [page async for page in self.handler.stream_tool("github.list_repos", {"max_items": 5})]
+        
+        self.mock_client.iter_repositories.assert_called_once_with(page_size=100, max_items=5)
+        self.assertEqual(result, [[{"name": "repo1"}], [{"name": "repo2"}]])
+    
+    def test_stream_tool_unsupported(self):
+        """Test non-list tools cannot be streamed"""
+        with self.assertRaises(ValueError):
+            self.handler.stream_tool("github.get_user", {})
+    
+    @patch('api.apps.github.tools.logger')
+    async def test_execute_unknown_tool(self, mock_logger):
         """Test executing an unknown tool"""
         # Call the method with an unknown tool
         with self.assertRaises(ValueError):
-            self.handler.execute_tool("github.unknown_tool", {})
+            await self.handler.execute_tool("github.unknown_tool", {})
         
         # Assert logger was called
         mock_logger.error.assert_called_once()
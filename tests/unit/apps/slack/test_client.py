@@ -1,10 +1,10 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
-from api.apps.slack.client import SlackClient
+from api.apps.slack.client import SlackClient, _parse_method_timeouts
 
 
-class TestSlackClient(unittest.TestCase):
+class TestSlackClient(unittest.IsolatedAsyncioTestCase):
     """Unit tests for SlackClient class"""
     
     def setUp(self):
@@ -17,8 +17,8 @@ class TestSlackClient(unittest.TestCase):
         self.assertEqual(self.client.token, self.token)
         self.assertEqual(self.client.headers["Authorization"], f"Bearer {self.token}")
     
-    @patch('api.apps.slack.client.requests.get')
-    def test_list_channels(self, mock_get):
+    @patch('api.apps.slack.client.get_http_client')
+    async def test_list_channels(self, mock_get_http_client):
         """Test list_channels method makes correct API call"""
         # Setup mock response
         mock_response = Mock()
@@ -29,16 +29,18 @@ class TestSlackClient(unittest.TestCase):
                 {"id": "C5678", "name": "random"}
             ]
         }
-        mock_get.return_value = mock_response
+        mock_get = AsyncMock(return_value=mock_response)
+        mock_get_http_client.return_value.get = mock_get
         
         # Call the method
-        result = self.client.list_channels(limit=10)
+        result = await self.client.list_channels(limit=10)
         
-        # Assert requests.get was called with correct args
+        # Assert the shared HTTP client was called with correct args
         mock_get.assert_called_once_with(
             "https://slack.com/api/conversations.list",
             headers=self.client.headers,
-            params={"limit": 10}
+            params={"limit": 10},
+            timeout=30.0
         )
         
         # Assert the result is the mocked response
@@ -50,8 +52,8 @@ class TestSlackClient(unittest.TestCase):
             ]
         })
     
-    @patch('api.apps.slack.client.requests.post')
-    def test_post_message(self, mock_post):
+    @patch('api.apps.slack.client.get_http_client')
+    async def test_post_message(self, mock_get_http_client):
         """Test post_message method makes correct API call"""
         # Setup mock response
         mock_response = Mock()
@@ -60,22 +62,24 @@ class TestSlackClient(unittest.TestCase):
             "channel": "C1234",
             "ts": "1234567890.123456"
         }
-        mock_post.return_value = mock_response
+        mock_post = AsyncMock(return_value=mock_response)
+        mock_get_http_client.return_value.post = mock_post
         
         # Call the method
-        result = self.client.post_message(
+        result = await self.client.post_message(
             channel_id="C1234",
             text="Hello world!"
         )
         
-        # Assert requests.post was called with correct args
+        # Assert the shared HTTP client was called with correct args
         mock_post.assert_called_once_with(
             "https://slack.com/api/chat.postMessage",
             headers=self.client.headers,
             json={
                 "channel": "C1234",
                 "text": "Hello world!"
-            }
+            },
+            timeout=10.0
         )
         
         # Assert the result is the mocked response
@@ -85,22 +89,23 @@ class TestSlackClient(unittest.TestCase):
             "ts": "1234567890.123456"
         })
     
-    @patch('api.apps.slack.client.requests.post')
-    def test_add_reaction(self, mock_post):
+    @patch('api.apps.slack.client.get_http_client')
+    async def test_add_reaction(self, mock_get_http_client):
         """Test add_reaction method makes correct API call"""
         # Setup mock response
         mock_response = Mock()
         mock_response.json.return_value = {"ok": True}
-        mock_post.return_value = mock_response
+        mock_post = AsyncMock(return_value=mock_response)
+        mock_get_http_client.return_value.post = mock_post
         
         # Call the method
-        result = self.client.add_reaction(
+        result = await self.client.add_reaction(
             channel_id="C1234",
             timestamp="1234567890.123456",
             reaction="thumbsup"
         )
         
-        # Assert requests.post was called with correct args
+        # Assert the shared HTTP client was called with correct args
         mock_post.assert_called_once_with(
             "https://slack.com/api/reactions.add",
             headers=self.client.headers,
@@ -108,11 +113,65 @@ class TestSlackClient(unittest.TestCase):
                 "channel": "C1234",
                 "timestamp": "1234567890.123456",
                 "name": "thumbsup"
-            }
+            },
+            timeout=5.0
         )
         
         # Assert the result is the mocked response
         self.assertEqual(result, {"ok": True})
+    
+    @patch('api.apps.slack.client.get_http_client')
+    async def test_iter_cursor_follows_next_cursor(self, mock_get_http_client):
+        """Test the cursor iterator follows next_cursor until it is empty"""
+        first = Mock()
+        first.json.return_value = {"ok": True, "members": [{"id": "U1"}], "response_metadata": {"next_cursor": "abc"}}
+        last = Mock()
+        last.json.return_value = {"ok": True, "members": [{"id": "U2"}], "response_metadata": {"next_cursor": ""}}
+        mock_get = AsyncMock(side_effect=[first, last])
+        mock_get_http_client.return_value.get = mock_get
+        
+        pages = [page async for page in self.client.iter_users(page_size=1)]
+        
+        self.assertEqual(pages, [([{"id": "U1"}], "abc"), ([{"id": "U2"}], "")])
+        self.assertEqual(mock_get.call_args_list[0].kwargs["params"], {"limit": 1})
+        self.assertEqual(mock_get.call_args_list[1].kwargs["params"], {"limit": 1, "cursor": "abc"})
+    
+    @patch('api.apps.slack.client.get_http_client')
+    async def test_iter_cursor_budget_and_stop(self, mock_get_http_client):
+        """Test the cursor iterator honours the item budget and stop condition"""
+        page = Mock()
+        page.json.return_value = {
+            "ok": True,
+            "messages": [{"ts": "3"}, {"ts": "2"}],
+            "response_metadata": {"next_cursor": "more"}
+        }
+        mock_get = AsyncMock(return_value=page)
+        mock_get_http_client.return_value.get = mock_get
+        
+        budget = [p async for p in self.client.iter_channel_history("C1", page_size=2, max_items=3)]
+        self.assertEqual([len(items) for items, _ in budget], [2, 1])
+        self.assertEqual(mock_get.call_args_list[1].kwargs["params"]["limit"], 1)
+        
+        mock_get.reset_mock()
+        stopped = [p async for p in self.client.iter_channel_history("C1", stop=lambda items: True)]
+        self.assertEqual(len(stopped), 1)
+        mock_get.assert_awaited_once()
+    
+    def test_per_method_timeouts(self):
+        """Test timeouts can be overridden per Slack method"""
+        client = SlackClient(token=self.token, timeouts={"users.list": 60.0})
+        
+        self.assertEqual(client.get_timeout("users.list"), 60.0)
+        self.assertEqual(client.get_timeout("reactions.add"), 5.0)
+        self.assertEqual(client.get_timeout("unknown.method"), SlackClient.DEFAULT_TIMEOUT)
+    
+    def test_parse_method_timeouts(self):
+        """Test parsing of the SLACK_METHOD_TIMEOUTS environment format"""
+        self.assertEqual(
+            _parse_method_timeouts("users.list=45, chat.postMessage=2.5,bad,users.info=x"),
+            {"users.list": 45.0, "chat.postMessage": 2.5}
+        )
+        self.assertEqual(_parse_method_timeouts(None), {})
 
 
 if __name__ == "__main__":
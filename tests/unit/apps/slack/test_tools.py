@@ -1,15 +1,15 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from api.apps.slack.tools import SlackToolHandler, create_slack_handler, SLACK_TOOLS
 
 
-class TestSlackTools(unittest.TestCase):
+class TestSlackTools(unittest.IsolatedAsyncioTestCase):
     """Unit tests for Slack tools"""
     
     def setUp(self):
         """Set up test fixtures"""
-        self.mock_client = Mock()
+        self.mock_client = AsyncMock()
         self.handler = SlackToolHandler(self.mock_client)
     
     def test_tool_registry(self):
@@ -25,8 +25,8 @@ class TestSlackTools(unittest.TestCase):
         for tool in expected_tools:
             self.assertIn(tool, SLACK_TOOLS, f"Tool {tool} should be in SLACK_TOOLS")
     
-    @patch('api.apps.slack.utils.get_slack_client_for_user')
-    def test_handler_factory(self, mock_get_client):
+    @patch('api.apps.slack.utils.get_slack_client_for_user', new_callable=AsyncMock)
+    async def test_handler_factory(self, mock_get_client):
         """Test that the factory function creates a handler with the client"""
         # Setup mock client and database
         mock_client = Mock()
@@ -35,7 +35,7 @@ class TestSlackTools(unittest.TestCase):
         mock_user_id = 123
         
         # Call the factory function
-        handler = create_slack_handler(mock_user_id, mock_db)
+        handler = await create_slack_handler(mock_user_id, mock_db)
         
         # Check that the handler is a SlackToolHandler
         self.assertIsInstance(handler, SlackToolHandler)
@@ -43,7 +43,7 @@ class TestSlackTools(unittest.TestCase):
         self.assertEqual(handler.client, mock_client)
     
     @patch('api.apps.slack.tools.logger')
-    def test_execute_list_channels(self, mock_logger):
+    async def test_execute_list_channels(self, mock_logger):
         """Test executing the list_channels tool"""
         # Setup mock response
         mock_response = {
@@ -56,7 +56,7 @@ class TestSlackTools(unittest.TestCase):
         self.mock_client.list_channels.return_value = mock_response
         
         # Call the method
-        result = self.handler.execute_tool("slack.list_channels", {"limit": 10})
+        result = await self.handler.execute_tool("slack.list_channels", {"limit": 10})
         
         # Assert client method was called with the limit parameter
         # The actual call might include additional parameters like cursor=None
@@ -70,7 +70,7 @@ class TestSlackTools(unittest.TestCase):
         self.assertEqual(result['channels'], mock_response['channels'])
     
     @patch('api.apps.slack.tools.logger')
-    def test_execute_post_message(self, mock_logger):
+    async def test_execute_post_message(self, mock_logger):
         """Test executing the post_message tool"""
         # Setup mock response
         mock_response = {
@@ -81,13 +81,13 @@ class TestSlackTools(unittest.TestCase):
         self.mock_client.post_message.return_value = mock_response
         
         # Call the method
-        result = self.handler.execute_tool("slack.post_message", {
+        result = await self.handler.execute_tool("slack.post_message", {
             "channel_id": "C1234",
             "text": "Hello world!"
         })
         
         # Assert client method was called
-        self.mock_client.post_message.assert_called_once_with(
+        self.mock_client.post_message.assert_awaited_once_with(
             channel_id="C1234",
             text="Hello world!"
         )
@@ -100,11 +100,45 @@ class TestSlackTools(unittest.TestCase):
         self.assertEqual(result['channel'], mock_response['channel'])
     
     @patch('api.apps.slack.tools.logger')
-    def test_execute_unknown_tool(self, mock_logger):
+    async def test_execute_get_users_all_pages(self, mock_logger):
+        """Test all_pages mode collects every page up to max_items"""
+        async def pages():
+            yield [{"id": "U1"}, {"id": "U2"}], "next"
+            yield [{"id": "U3"}], "resume"
+        self.mock_client.iter_users = Mock(return_value=pages())
+        
+        result = await self.handler.execute_tool("slack.get_users", {"all_pages": True, "max_items": 3})
+        
+        self.mock_client.iter_users.assert_called_once_with(max_items=3, cursor=None)
+        self.mock_client.get_users.assert_not_called()
+        self.assertEqual(result, {
+            "members": [{"id": "U1"}, {"id": "U2"}, {"id": "U3"}],
+            "response_metadata": {"next_cursor": "resume"}
+        })
+    
+    async def test_stream_tool(self):
+        """Test paginated tools stream non-empty pages"""
+        async def pages():
+            yield [{"ts": "2"}], "next"
+            yield [], ""
+        self.mock_client.iter_channel_history = Mock(return_value=pages())
+        
+        result = [page async for page in self.handler.stream_tool("slack.get_channel_history", {"channel_id": "C1"})]
+        
+        self.mock_client.iter_channel_history.assert_called_once_with("C1", max_items=1000)
+        self.assertEqual(result, [[{"ts": "2"}]])
+    
+    def test_stream_tool_unsupported(self):
+        """Test tools without pagination cannot be streamed"""
+        with self.assertRaises(ValueError):
+            self.handler.stream_tool("slack.post_message", {})
+    
+    @patch('api.apps.slack.tools.logger')
+    async def test_execute_unknown_tool(self, mock_logger):
         """Test executing an unknown tool"""
         # Call the method with an unknown tool
         with self.assertRaises(ValueError):
-            self.handler.execute_tool("slack.unknown_tool", {})
+            await self.handler.execute_tool("slack.unknown_tool", {})
         
         # Assert logger was called
         mock_logger.error.assert_called_once()
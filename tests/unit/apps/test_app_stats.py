@@ -0,0 +1,63 @@
+import unittest
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.database import Base
+from api.models import App, Tool, User
+from api.apps.github.models import GitHubCredential  # noqa: F401 - registers the mapper
+from api.apps import crud
+from api.schemas import AppCreate
+
+
+class TestUserAppStats(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for dashboard app and tool counts"""
+
+    async def asyncSetUp(self):
+        """Create an in-memory database with two apps, one of them without tools"""
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)()
+        self.session.add(User(id=1, email="user@example.com", hashed_password="x"))
+        self.session.add(App(id=1, name="a", owner_id=1))
+        self.session.add(App(id=2, name="b", owner_id=1))
+        for tool_id in range(3):
+            self.session.add(Tool(id=tool_id + 1, name=f"t{tool_id}", app_id=1, parameters={}, action_definition={}))
+        await self.session.commit()
+
+        self.statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda *args: self.statements.append(args[2]))
+        crud.app_stats_cache.clear()
+
+    async def asyncTearDown(self):
+        """Close the database"""
+        crud.app_stats_cache.clear()
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_counts_in_one_query(self):
+        """Test apps and tools are counted with a single query"""
+        stats = await crud.get_user_app_stats(self.session, 1)
+
+        self.assertEqual(stats, {"apps": 2, "tools": 3})
+        self.assertEqual(len(self.statements), 1)
+
+    async def test_user_without_apps(self):
+        """Test a user without apps gets zero counts"""
+        self.assertEqual(await crud.get_user_app_stats(self.session, 2), {"apps": 0, "tools": 0})
+
+    async def test_cached_until_apps_change(self):
+        """Test counts are cached and refreshed after an app is registered"""
+        await crud.get_user_app_stats(self.session, 1)
+        await crud.get_user_app_stats(self.session, 1)
+        self.assertEqual(len(self.statements), 1)
+
+        await crud.create_app(self.session, AppCreate(name="c", auth_credentials={}), 1)
+
+        self.assertEqual(await crud.get_user_app_stats(self.session, 1), {"apps": 3, "tools": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.database import Base
+from api.models import User, SlackCredentials
+from api.apps.github.models import GitHubCredential
+from api.apps import availability
+from api.apps.github.utils import github_credential_probe
+from api.apps.slack.utils import slack_credential_probe
+
+
+class TestAppAvailability(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for credential-availability probes"""
+
+    async def asyncSetUp(self):
+        """Create an in-memory database with one GitHub-connected user"""
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)()
+        self.session.add(User(id=1, email="user@example.com", hashed_password="x"))
+        self.session.add(GitHubCredential(user_id=1, access_token="token"))
+        self.session.add(SlackCredentials(user_id=1, access_token=None))
+        await self.session.commit()
+
+        self.statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda *args: self.statements.append(args[2]))
+
+        self.original_probes = dict(availability.CREDENTIAL_PROBES)
+        availability.CREDENTIAL_PROBES.clear()
+        availability.register_credential_probe("github", github_credential_probe)
+        availability.register_credential_probe("slack", slack_credential_probe)
+
+    async def asyncTearDown(self):
+        """Restore the registered probes and close the database"""
+        availability.CREDENTIAL_PROBES.clear()
+        availability.CREDENTIAL_PROBES.update(self.original_probes)
+        availability.availability_cache.clear()
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_every_app_in_one_query(self):
+        """Test availability for every app comes from a single query"""
+        result = await availability.get_app_availability(self.session, 1)
+
+        self.assertEqual(result, {"github": True, "slack": False})
+        self.assertEqual(len(self.statements), 1)
+
+    async def test_result_cached_until_invalidated(self):
+        """Test repeated lookups are cached and invalidation refreshes them"""
+        await availability.get_available_app_names(self.session, 1)
+        self.assertEqual(await availability.get_available_app_names(self.session, 1), ["github"])
+        self.assertEqual(len(self.statements), 1)
+
+        availability.invalidate_availability(1)
+        await availability.get_available_app_names(self.session, 1)
+        self.assertEqual(len(self.statements), 2)
+
+    async def test_unknown_user_has_no_apps(self):
+        """Test a user without credentials has no available apps"""
+        self.assertEqual(await availability.get_available_app_names(self.session, 2), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
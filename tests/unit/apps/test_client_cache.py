@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from api.apps.client_cache import CREDENTIAL_QUERIES, client_cache, invalidate_client, sync_clients
+from api.apps.github.client import GitHubClient
+from api.apps.github.utils import get_github_client_for_user, github_credential_query
+from api.apps.slack.utils import get_slack_client_for_user, slack_credential_query
+
+
+def credentials_db(access_token):
+    """Build an async session whose query returns credentials with the token"""
+    result = Mock()
+    result.scalars.return_value.first.return_value = Mock(access_token=access_token)
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+class TestClientCache(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the per-user app client cache"""
+
+    def setUp(self):
+        """Start each test with an empty cache"""
+        client_cache.clear()
+        self.addCleanup(client_cache.clear)
+
+    async def test_github_client_reused(self):
+        """Test warm lookups return the same client without querying"""
+        db = credentials_db("token-a")
+
+        first = await get_github_client_for_user(1, db)
+        second = await get_github_client_for_user(1, db)
+
+        self.assertIsInstance(first, GitHubClient)
+        self.assertIs(second, first)
+        db.execute.assert_awaited_once()
+
+    async def test_clients_cached_per_user_and_app(self):
+        """Test users and apps do not share cached clients"""
+        db = credentials_db("token-a")
+
+        github = await get_github_client_for_user(1, db)
+        other_user = await get_github_client_for_user(2, db)
+        slack = await get_slack_client_for_user(1, db)
+
+        self.assertIsNot(other_user, github)
+        self.assertIsNot(slack, github)
+        self.assertEqual(db.execute.await_count, 3)
+
+    async def test_invalidate_rebuilds_client(self):
+        """Test reconnecting an app makes the next lookup use new credentials"""
+        first = await get_github_client_for_user(1, credentials_db("token-a"))
+
+        invalidate_client("github", 1)
+        second = await get_github_client_for_user(1, credentials_db("token-b"))
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second.access_token, "token-b")
+
+    @patch.dict(CREDENTIAL_QUERIES, {"github": github_credential_query, "slack": slack_credential_query})
+    async def test_sync_drops_clients_with_changed_credentials(self):
+        """Test clients are dropped when another worker changed or removed their credentials"""
+        kept = await get_github_client_for_user(1, credentials_db("token-a"))
+        await get_github_client_for_user(2, credentials_db("token-a"))
+        await get_slack_client_for_user(1, credentials_db("token-a"))
+        db = AsyncMock()
+        db.execute.side_effect = [[(1, "token-a"), (2, "token-b")], []]
+
+        dropped = await sync_clients(db)
+
+        self.assertEqual(dropped, 2)
+        self.assertEqual(db.execute.await_count, 2)
+        self.assertIs(await get_github_client_for_user(1, AsyncMock()), kept)
+        self.assertEqual(len(client_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
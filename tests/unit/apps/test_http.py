@@ -0,0 +1,73 @@
+import unittest
+
+from api.apps.http import ConnectionManager, _pool_key
+
+
+class TestConnectionManager(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the upstream ConnectionManager"""
+
+    async def asyncSetUp(self):
+        """Set up a fresh manager for each test"""
+        self.manager = ConnectionManager(max_connections=5, idle_timeout=60)
+
+    async def asyncTearDown(self):
+        """Close any pools opened by the test"""
+        await self.manager.close()
+
+    def test_pool_key(self):
+        """Test URLs are grouped by origin"""
+        self.assertEqual(_pool_key("https://api.github.com/user"), "https://api.github.com:443")
+        self.assertEqual(_pool_key("http://localhost:8080/api"), "http://localhost:8080")
+        self.assertEqual(_pool_key(None), "default")
+
+    async def test_client_shared_per_host(self):
+        """Test the same client is returned for the same host and a new one per host"""
+        github = self.manager.get_client("https://api.github.com")
+
+        self.assertIs(self.manager.get_client("https://api.github.com/repos/a/b"), github)
+        self.assertIsNot(self.manager.get_client("https://slack.com/api"), github)
+
+    async def test_configure_host(self):
+        """Test per-host settings are applied and unknown settings rejected"""
+        self.manager.configure_host("https://slack.com", max_connections=2)
+        self.manager.get_client("https://slack.com/api")
+
+        stats = self.manager.stats()
+        self.assertEqual(stats["https://slack.com:443"]["max_connections"], 2)
+        with self.assertRaises(ValueError):
+            self.manager.configure_host("https://slack.com", pool_size=2)
+
+    async def test_stats(self):
+        """Test pool stats report open, idle and waiting counts"""
+        self.manager.get_client("https://api.github.com")
+
+        stats = self.manager.stats()
+        self.assertEqual(
+            stats["https://api.github.com:443"],
+            {"open": 0, "idle": 0, "waiting": 0, "max_connections": 5}
+        )
+
+    async def test_evict_idle(self):
+        """Test pools unused past the idle timeout are closed"""
+        client = self.manager.get_client("https://api.github.com")
+        self.manager.idle_timeout = -1
+
+        evicted = await self.manager.evict_idle()
+
+        self.assertEqual(evicted, 1)
+        self.assertTrue(client.is_closed)
+        self.assertEqual(self.manager.stats(), {})
+
+    async def test_close(self):
+        """Test close stops eviction and closes every pool"""
+        await self.manager.start()
+        client = self.manager.get_client("https://api.github.com")
+
+        await self.manager.close()
+
+        self.assertTrue(client.is_closed)
+        self.assertIsNone(self.manager._eviction_task)
+
+
+if __name__ == "__main__":
+    unittest.main()
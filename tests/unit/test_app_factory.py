@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import patch
+
+from api.main import create_app
+from api.routers import tools
+
+
+class TestCreateApp(unittest.TestCase):
+    """Unit tests for the application factory"""
+
+    def test_installed_apps_registered(self):
+        """Test installed apps contribute tools and their own routes"""
+        app = create_app(create_schema=False)
+        paths = {route.path for route in app.routes}
+
+        self.assertIn("github.list_repos", tools.TOOL_REGISTRY["github"])
+        self.assertIn("slack", tools.APP_HANDLER_FACTORIES)
+        self.assertIn("/api/v1/apps/github/connect", paths)
+        self.assertIn("/api/v1/execute/", paths)
+        self.assertFalse(app.state.create_schema)
+
+    def test_apps_register_once(self):
+        """Test loading an app again does not re-register it"""
+        with patch("api.apps.github.register") as register:
+            tools.load_apps(["api.apps.github"])
+
+        register.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
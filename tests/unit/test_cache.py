@@ -0,0 +1,68 @@
+import time
+import unittest
+
+from api.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Unit tests for LRUCache"""
+
+    def test_get_and_set(self):
+        """Test values are stored and hits and misses counted"""
+        cache = LRUCache()
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted first"""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_size_budget(self):
+        """Test entries are evicted to stay within the size budget"""
+        cache = LRUCache(max_size=10)
+        cache.set("a", "x", size=6)
+        cache.set("b", "y", size=6)
+        cache.set("huge", "z", size=11)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "y")
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(cache.stats()["size"], 6)
+
+    def test_ttl(self):
+        """Test expired entries are not returned"""
+        cache = LRUCache(ttl=0.01)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_delete_where(self):
+        """Test entries can be invalidated by key predicate"""
+        cache = LRUCache()
+        cache.set((1, "x"), 1)
+        cache.set((1, "y"), 2)
+        cache.set((2, "x"), 3)
+
+        removed = cache.delete_where(lambda key: key[0] == 1)
+
+        self.assertEqual(removed, 2)
+        self.assertEqual(len(cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from fastapi import HTTPException
+
+from api.routers.tools import _cancel_on_disconnect, CLIENT_CLOSED_REQUEST
+
+
+class FakeRequest:
+    """Request whose client disconnects when ``disconnect`` is set"""
+
+    def __init__(self):
+        self.disconnect = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+
+class TestCancelOnDisconnect(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for cancelling /execute/ calls when the client disconnects"""
+
+    async def test_returns_result_while_connected(self):
+        """Test a call that finishes first returns its result"""
+        async def call():
+            return {"ok": True}
+
+        self.assertEqual(await _cancel_on_disconnect(FakeRequest(), call()), {"ok": True})
+
+    async def test_disconnect_cancels_call(self):
+        """Test a disconnect cancels the running call before returning"""
+        request = FakeRequest()
+        cancelled = asyncio.Event()
+
+        async def call():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        asyncio.get_running_loop().call_later(0.01, request.disconnect.set)
+        with self.assertRaises(HTTPException) as raised:
+            await _cancel_on_disconnect(request, call())
+
+        self.assertEqual(raised.exception.status_code, CLIENT_CLOSED_REQUEST)
+        self.assertTrue(cancelled.is_set())
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from api.db_pool import InstrumentedQueuePool, instrument_pool, pool_stats
+from api.metrics import metrics
+
+
+class TestInstrumentedPool(unittest.TestCase):
+    """Unit tests for DB pool metrics"""
+
+    def setUp(self):
+        """Create an instrumented engine on a temporary SQLite file"""
+        metrics.reset()
+        path = os.path.join(tempfile.mkdtemp(), "pool.db")
+        self.engine = create_engine(f"sqlite:///{path}", poolclass=InstrumentedQueuePool,
+                                    pool_size=1, max_overflow=1)
+        instrument_pool(self.engine, "test")
+
+    def tearDown(self):
+        """Dispose of the engine"""
+        self.engine.dispose()
+        metrics.reset()
+
+    def test_checkout_metrics_recorded(self):
+        """Test checkouts record wait time, checked-out count and connection age"""
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            self.assertEqual(pool_stats()["test"]["checked_out"], 1)
+
+        timings = metrics.snapshot()["timings"]
+        self.assertEqual(timings["db_pool_checkout_wait_seconds{engine=test}"]["count"], 1)
+        self.assertEqual(timings["db_pool_checked_out{engine=test}"]["max"], 1)
+        self.assertIn("db_connection_age_seconds{engine=test}", timings)
+        self.assertEqual(pool_stats()["test"]["checked_out"], 0)
+
+    def test_overflow_counted(self):
+        """Test checkouts beyond pool_size are counted as overflow"""
+        with self.engine.connect(), self.engine.connect():
+            self.assertEqual(pool_stats()["test"]["overflow"], 1)
+
+        self.assertEqual(metrics.snapshot()["counters"]["db_pool_overflow_checkouts{engine=test}"], 1)
+
+    @patch("api.db_pool.DB_POOL_SLOW_CHECKOUT_MS", 0)
+    def test_slow_checkout_warns(self):
+        """Test checkouts over the threshold log a warning"""
+        with self.assertLogs("api.db_pool", level="WARNING"):
+            with self.engine.connect():
+                pass
+
+        self.assertEqual(metrics.snapshot()["counters"]["db_pool_slow_checkouts{engine=test}"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from api.executor import ToolExecutor, _parse_limits
+from api.metrics import metrics
+
+
+class SyncHandler:
+    """Synchronous handler recording the thread it ran on"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def execute_tool(self, tool_name, parameters):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return {"tool": tool_name, "thread": threading.current_thread().name}
+
+
+class AsyncHandler:
+    """Asynchronous handler"""
+
+    async def execute_tool(self, tool_name, parameters):
+        await asyncio.sleep(0)
+        return {"tool": tool_name, "thread": threading.current_thread().name}
+
+
+class TestToolExecutor(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for ToolExecutor"""
+
+    def setUp(self):
+        """Set up a fresh executor and metrics"""
+        self.executor = ToolExecutor(default_limit=2)
+        metrics.reset()
+
+    def tearDown(self):
+        """Shut down executor thread pools"""
+        self.executor.shutdown()
+
+    async def test_sync_handler_runs_in_app_thread_pool(self):
+        """Test synchronous handlers run off the event loop thread"""
+        result = await self.executor.run("slack", SyncHandler(), "slack.list_channels", {})
+
+        self.assertEqual(result["tool"], "slack.list_channels")
+        self.assertTrue(result["thread"].startswith("tool-slack"))
+
+    async def test_async_handler_awaited_on_loop(self):
+        """Test asynchronous handlers are awaited on the event loop"""
+        result = await self.executor.run("github", AsyncHandler(), "github.get_user", {})
+
+        self.assertEqual(result["thread"], threading.current_thread().name)
+
+    async def test_per_app_concurrency_limit(self):
+        """Test calls to one app never exceed its concurrency limit"""
+        self.executor.set_limit("slack", 3)
+        handler = SyncHandler(delay=0.02)
+
+        await asyncio.gather(*[
+            self.executor.run("slack", handler, "slack.get_users", {}) for _ in range(10)
+        ])
+
+        self.assertEqual(handler.max_active, 3)
+        self.assertEqual(self.executor.stats()["slack"], {"limit": 3, "running": 0, "waiting": 0})
+
+    async def test_queue_wait_metric(self):
+        """Test queue wait time is reported per app"""
+        await self.executor.run("github", AsyncHandler(), "github.get_user", {})
+
+        timing = metrics.snapshot()["timings"]["tool_queue_wait_seconds{app=github}"]
+        self.assertEqual(timing["count"], 1)
+
+    async def test_deadline_cancels_call_and_frees_slot(self):
+        """Test a call past its deadline is cancelled and its slot released at once"""
+        self.executor.set_limit("github", 1)
+        cancelled = asyncio.Event()
+
+        class SlowHandler:
+            async def execute_tool(self, tool_name, parameters):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+        with self.assertRaises(TimeoutError):
+            await self.executor.run("github", SlowHandler(), "github.list_repos", {}, timeout=0.01)
+
+        self.assertTrue(cancelled.is_set())
+        self.assertEqual(self.executor.stats()["github"]["running"], 0)
+        result = await self.executor.run("github", AsyncHandler(), "github.get_user", {}, timeout=1)
+        self.assertEqual(result["tool"], "github.get_user")
+        self.assertEqual(metrics.snapshot()["counters"]["tool_call_timeouts{app=github}"], 1)
+
+    async def test_cancelled_call_frees_slot(self):
+        """Test cancelling a running call releases its slot for queued calls"""
+        self.executor.set_limit("slack", 1)
+
+        class BlockingHandler:
+            async def execute_tool(self, tool_name, parameters):
+                await asyncio.sleep(10)
+
+        running = asyncio.ensure_future(self.executor.run("slack", BlockingHandler(), "slack.get_users", {}))
+        await asyncio.sleep(0.01)
+        queued = asyncio.ensure_future(self.executor.run("slack", AsyncHandler(), "slack.list_channels", {}))
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.executor.stats()["slack"]["waiting"], 1)
+
+        running.cancel()
+        result = await asyncio.wait_for(queued, 1)
+
+        self.assertEqual(result["tool"], "slack.list_channels")
+        self.assertEqual(metrics.snapshot()["counters"]["tool_calls_cancelled{app=slack}"], 1)
+
+    async def test_set_limit_while_running_keeps_cap(self):
+        """Test changing the limit mid-flight counts calls already holding slots"""
+        self.executor.set_limit("slack", 2)
+        handler = SyncHandler(delay=0.05)
+
+        first = [asyncio.ensure_future(self.executor.run("slack", handler, "slack.get_users", {})) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        self.executor.set_limit("slack", 3)
+        rest = [asyncio.ensure_future(self.executor.run("slack", handler, "slack.get_users", {})) for _ in range(6)]
+        await asyncio.gather(*first, *rest)
+
+        self.assertEqual(handler.max_active, 3)
+
+        self.executor.set_limit("slack", 1)
+        await asyncio.gather(*[self.executor.run("slack", handler, "slack.get_users", {}) for _ in range(3)])
+        self.assertEqual(self.executor.stats()["slack"]["running"], 0)
+
+    def test_invalid_limit(self):
+        """Test limits below one are rejected"""
+        with self.assertRaises(ValueError):
+            self.executor.set_limit("github", 0)
+
+    def test_parse_limits(self):
+        """Test parsing of the APP_CONCURRENCY_LIMITS environment format"""
+        self.assertEqual(_parse_limits("github=20, slack=5,bad,jira=x"), {"github": 20, "slack": 5})
+        self.assertEqual(_parse_limits(None), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from api.auth.mcp_tokens import ValidatedToken, mcp_token_validator
+from api.progress import report_progress
+from api.mcp_server import (
+    MCPSession, MCPSessionRegistry, encode_message, expects_response,
+    METHOD_NOT_FOUND, INVALID_PARAMS, MCP_SESSION_IDLE_TIMEOUT, SUPPORTED_PROTOCOL_VERSIONS
+)
+from api.routers import tools
+from api.tool_catalog import EncodedPayload
+
+TOOLS = {
+    "demo.echo": {
+        "name": "demo.echo",
+        "description": "Echo the arguments",
+        "parameters": {
+            "text": {"type": "string", "description": "Text to echo"},
+            "delay": {"type": "number", "description": "Seconds to wait", "optional": True}
+        }
+    },
+    "demo.fail": {"name": "demo.fail", "description": "Always fails", "parameters": {}}
+}
+
+
+class DemoHandler:
+    """Async handler tracking how many calls overlap"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def execute_tool(self, tool_name, parameters):
+        if tool_name == "demo.fail":
+            raise ValueError("boom")
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        report_progress(1, total=1)
+        await asyncio.sleep(parameters.get("delay", 0))
+        self.active -= 1
+        return {"text": parameters["text"]}
+
+
+def make_token(expires_in=timedelta(hours=1)):
+    """Build a validated token for user 1"""
+    return ValidatedToken(token_id=1, user_id=1, expires_at=datetime.now(timezone.utc) + expires_in)
+
+
+class TestMCPSession(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for MCPSession"""
+
+    def setUp(self):
+        """Register a demo app and a session with its handler already built"""
+        patcher = patch.dict(tools.TOOL_REGISTRY, {"demo": TOOLS})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.dict(tools.APP_HANDLER_FACTORIES, {"demo": lambda user_id, db: DemoHandler()})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.handler = DemoHandler()
+        self.session = MCPSession(make_token(), max_concurrency=5)
+        self.session._handlers["demo"] = self.handler
+
+    async def request(self, method, params=None, message_id=1):
+        """Send a request and return its response"""
+        return await self.session.handle({"jsonrpc": "2.0", "id": message_id, "method": method, "params": params or {}})
+
+    async def test_initialize_negotiates_version(self):
+        """Test unsupported protocol versions fall back to the latest supported one"""
+        response = await self.request("initialize", {"protocolVersion": "1999-01-01"})
+
+        self.assertEqual(response["result"]["protocolVersion"], SUPPORTED_PROTOCOL_VERSIONS[0])
+        self.assertIn("tools", response["result"]["capabilities"])
+
+        response = await self.request("initialize", {"protocolVersion": "2024-11-05"})
+        self.assertEqual(response["result"]["protocolVersion"], "2024-11-05")
+
+    async def test_call_tool_returns_text_content(self):
+        """Test tool results are returned as JSON text content"""
+        response = await self.request("tools/call", {"name": "demo.echo", "arguments": {"text": "hi"}})
+
+        result = response["result"]
+        self.assertFalse(result["isError"])
+        self.assertEqual(json.loads(result["content"][0]["text"]), {"text": "hi"})
+
+    async def test_tool_failure_is_error_result(self):
+        """Test exceptions inside a tool become isError results, not protocol errors"""
+        response = await self.request("tools/call", {"name": "demo.fail", "arguments": {}})
+
+        self.assertTrue(response["result"]["isError"])
+        self.assertEqual(response["result"]["content"][0]["text"], "boom")
+
+    async def test_unknown_tool_and_method_are_errors(self):
+        """Test unknown tools and methods return JSON-RPC errors"""
+        response = await self.request("tools/call", {"name": "demo.missing"})
+        self.assertEqual(response["error"]["code"], INVALID_PARAMS)
+
+        response = await self.request("resources/list")
+        self.assertEqual(response["error"]["code"], METHOD_NOT_FOUND)
+
+    async def test_notifications_get_no_response(self):
+        """Test notifications are not answered"""
+        response = await self.session.handle({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+        self.assertIsNone(response)
+
+    async def test_submitted_calls_run_concurrently(self):
+        """Test calls submitted to a session overlap and each response is queued"""
+        for message_id in range(3):
+            self.session.submit({
+                "jsonrpc": "2.0", "id": message_id, "method": "tools/call",
+                "params": {"name": "demo.echo", "arguments": {"text": str(message_id), "delay": 0.05}}
+            })
+
+        responses = [await asyncio.wait_for(self.session.outgoing.get(), 1) for _ in range(3)]
+
+        self.assertEqual(sorted(response["id"] for response in responses), [0, 1, 2])
+        self.assertEqual(self.handler.max_active, 3)
+
+    async def test_progress_notifications_precede_response(self):
+        """Test calls with a progress token send notifications/progress before their response"""
+        self.session.submit({
+            "jsonrpc": "2.0", "id": 5, "method": "tools/call",
+            "params": {"name": "demo.echo", "arguments": {"text": "hi"}, "_meta": {"progressToken": "p1"}}
+        })
+
+        first = await asyncio.wait_for(self.session.outgoing.get(), 1)
+        second = await asyncio.wait_for(self.session.outgoing.get(), 1)
+
+        self.assertEqual(first["method"], "notifications/progress")
+        self.assertEqual(first["params"], {"progressToken": "p1", "progress": 1, "total": 1})
+        self.assertEqual(second["id"], 5)
+
+    async def test_no_progress_without_token(self):
+        """Test calls without a progress token only get their response"""
+        await self.request("tools/call", {"name": "demo.echo", "arguments": {"text": "hi"}})
+        await asyncio.sleep(0)
+
+        self.assertTrue(self.session.outgoing.empty())
+
+    async def test_cancelled_notification_cancels_call(self):
+        """Test notifications/cancelled stops the call, frees its slot and suppresses its response"""
+        self.session._semaphore = asyncio.Semaphore(1)
+        self.session.submit({
+            "jsonrpc": "2.0", "id": "slow", "method": "tools/call",
+            "params": {"name": "demo.echo", "arguments": {"text": "slow", "delay": 10}}
+        })
+        await asyncio.sleep(0.01)
+
+        self.session.submit({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": "slow"}})
+        response = await asyncio.wait_for(
+            self.request("tools/call", {"name": "demo.echo", "arguments": {"text": "next"}}, message_id="next"), 1
+        )
+
+        self.assertEqual(json.loads(response["result"]["content"][0]["text"]), {"text": "next"})
+        self.assertTrue(self.session.outgoing.empty())
+        self.assertNotIn("slow", self.session._tasks)
+
+    async def test_close_cancels_in_flight_calls(self):
+        """Test closing a session cancels its running calls"""
+        self.session.submit({
+            "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+            "params": {"name": "demo.echo", "arguments": {"text": "slow", "delay": 10}}
+        })
+        await asyncio.sleep(0.01)
+
+        await self.session.close()
+
+        self.assertIsNone(self.session.outgoing.get_nowait())
+        self.assertTrue(self.session.outgoing.empty())
+        self.assertEqual(self.session._tasks, {})
+
+
+class TestMCPSessionRegistry(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for MCPSessionRegistry"""
+
+    def setUp(self):
+        """Forget revocations recorded by other tests"""
+        mcp_token_validator.clear()
+
+    async def test_close_idle(self):
+        """Test idle and expired sessions are closed"""
+        registry = MCPSessionRegistry()
+        active = registry.open(make_token())
+        idle = registry.open(make_token())
+        idle.last_active -= 120
+        expired = registry.open(make_token(expires_in=timedelta(seconds=-1)))
+
+        self.assertEqual(await registry.close_idle(timeout=60), 2)
+        self.assertIs(registry.get(active.session_id), active)
+        self.assertTrue(idle.closed and expired.closed)
+
+    async def test_periodic_sweep_closes_idle_sessions(self):
+        """Test the started registry closes idle sessions without new initialize requests"""
+        registry = MCPSessionRegistry(sweep_interval=0.01)
+        idle = registry.open(make_token())
+        idle.last_active -= MCP_SESSION_IDLE_TIMEOUT + 1
+        registry.start()
+        try:
+            for _ in range(100):
+                if idle.closed:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await registry.stop()
+
+        self.assertTrue(idle.closed)
+        self.assertIsNone(registry.get(idle.session_id))
+
+    async def test_close_token(self):
+        """Test every session of a revoked token is closed and others stay open"""
+        registry = MCPSessionRegistry()
+        revoked = [registry.open(make_token()), registry.open(make_token())]
+        other = registry.open(ValidatedToken(
+            token_id=2, user_id=1, expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+        ))
+
+        self.assertEqual(await registry.close_token(1), 2)
+        self.assertTrue(all(session.closed for session in revoked))
+        self.assertIs(registry.get(other.session_id), other)
+
+    async def test_open_get_close(self):
+        """Test sessions are found by ID until closed"""
+        registry = MCPSessionRegistry()
+        session = registry.open(make_token())
+
+        self.assertIs(registry.get(session.session_id), session)
+        await registry.close(session.session_id)
+        self.assertIsNone(registry.get(session.session_id))
+        self.assertTrue(session.closed)
+
+
+class TestEncodeMessage(unittest.TestCase):
+    """Unit tests for encode_message"""
+
+    def test_pre_encoded_result_is_spliced(self):
+        """Test pre-encoded results are embedded without re-serializing"""
+        payload = EncodedPayload.from_bytes(b'{"tools":[]}')
+
+        encoded = encode_message({"jsonrpc": "2.0", "id": 7, "result": payload})
+
+        self.assertEqual(json.loads(encoded), {"jsonrpc": "2.0", "id": 7, "result": {"tools": []}})
+
+
+class TestExpectsResponse(unittest.TestCase):
+    """Unit tests for expects_response"""
+
+    def test_only_requests_and_invalid_messages_are_answered(self):
+        """Test notifications and client responses get no reply"""
+        self.assertTrue(expects_response({"jsonrpc": "2.0", "id": 1, "method": "ping"}))
+        self.assertTrue(expects_response({"id": 1}))
+        self.assertFalse(expects_response({"jsonrpc": "2.0", "method": "notifications/initialized"}))
+        self.assertFalse(expects_response({"jsonrpc": "2.0", "id": 1, "result": {}}))
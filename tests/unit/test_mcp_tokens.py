@@ -0,0 +1,177 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.database import Base
+from api.models import MCPToken, User
+from api.apps.github.models import GitHubCredential  # noqa: F401 - registers the mapper
+from api.auth.mcp_tokens import MCPTokenValidator, hash_token
+
+
+class TestMCPTokenValidator(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for MCPTokenValidator"""
+
+    async def asyncSetUp(self):
+        """Create an in-memory database with one user"""
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)()
+        self.session.add(User(id=1, email="user@example.com", hashed_password="x"))
+        await self.session.commit()
+
+        self.statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda *args: self.statements.append(args[2]))
+        self.validator = MCPTokenValidator(max_entries=10, ttl=60)
+
+    async def asyncTearDown(self):
+        """Close the database"""
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def issue(self, expires_in=timedelta(days=1)):
+        """Issue a token for the test user"""
+        return await self.validator.issue(self.session, 1, datetime.now(timezone.utc) + expires_in)
+
+    async def test_only_hash_is_stored(self):
+        """Test the raw token is never written to the database"""
+        token = await self.issue()
+
+        row = (await self.session.execute(select(MCPToken))).scalars().one()
+        self.assertIsNone(row.token)
+        self.assertEqual(row.token_hash, hash_token(token))
+
+    async def test_validated_token_is_cached(self):
+        """Test repeat validations skip the database"""
+        token = await self.issue()
+        self.statements.clear()
+
+        first = await self.validator.validate(self.session, token)
+        second = await self.validator.validate(self.session, token)
+
+        self.assertEqual(first.user_id, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.statements), 1)
+
+    async def test_unknown_and_expired_tokens_rejected(self):
+        """Test unknown and expired tokens do not validate"""
+        expired = await self.issue(expires_in=timedelta(seconds=-1))
+
+        self.assertIsNone(await self.validator.validate(self.session, "unknown"))
+        self.assertIsNone(await self.validator.validate(self.session, expired))
+        self.assertIsNone(await self.validator.validate(self.session, ""))
+
+    async def test_revocation_is_immediate(self):
+        """Test a revoked token is rejected even when cached"""
+        token = await self.issue()
+        validated = await self.validator.validate(self.session, token)
+
+        self.assertTrue(await self.validator.revoke(self.session, validated.token_id, 1))
+        self.assertIsNone(await self.validator.validate(self.session, token))
+
+    async def test_revocation_by_other_process(self):
+        """Test a token revoked by another process is rejected once revocations are checked"""
+        token = await self.issue()
+        self.validator.check_interval = 0
+        validated = await self.validator.validate(self.session, token)
+        other_process = MCPTokenValidator(max_entries=10, ttl=60)
+
+        self.assertTrue(await other_process.revoke(self.session, validated.token_id, 1))
+        self.statements.clear()
+
+        self.assertIsNone(await self.validator.validate(self.session, token))
+        self.assertTrue(self.validator.is_revoked(validated.token_id))
+        self.assertEqual(self.validator.stats()["accepted"], 0)
+
+    async def test_revocations_checked_at_most_every_interval(self):
+        """Test cached validations only query for revocations once the interval has passed"""
+        token = await self.issue()
+        await self.validator.validate(self.session, token)
+        self.statements.clear()
+
+        await self.validator.validate(self.session, token)
+        self.assertEqual(self.statements, [])
+
+        self.validator._last_check -= 60
+        await self.validator.validate(self.session, token)
+        self.assertEqual(len(self.statements), 1)
+        self.assertFalse(self.validator.check_due())
+
+    async def test_long_lived_sessions_see_revocations(self):
+        """Test is_active re-checks accepted tokens and listeners hear of revocations"""
+        token = await self.issue()
+        validated = await self.validator.validate(self.session, token)
+        here, elsewhere = [], []
+
+        async def listener(token_id):
+            here.append(token_id)
+
+        async def other_listener(token_id):
+            elsewhere.append(token_id)
+
+        self.validator.add_revocation_listener(listener)
+        other_process = MCPTokenValidator(max_entries=10, ttl=60)
+        other_process.add_revocation_listener(other_listener)
+        self.assertTrue(await self.validator.is_active(validated))
+
+        await other_process.revoke(self.session, validated.token_id, 1)
+        self.assertEqual(elsewhere, [validated.token_id])
+        self.assertTrue(await self.validator.is_active(validated))
+
+        self.validator.check_interval = 0
+        with patch("api.database.AsyncSessionLocal", async_sessionmaker(self.engine)):
+            self.assertFalse(await self.validator.is_active(validated))
+        self.assertEqual(here, [validated.token_id])
+
+    async def test_inactive_user_tokens_rejected(self):
+        """Test tokens of a deactivated user are refused on lookup and dropped when revocations are checked"""
+        cached = await self.issue()
+        uncached = await self.issue()
+        validated = await self.validator.validate(self.session, cached)
+        self.validator.check_interval = 0
+
+        user = await self.session.get(User, 1)
+        user.is_active = False
+        await self.session.commit()
+
+        self.assertIsNone(await self.validator.validate(self.session, uncached))
+        self.assertIsNone(await self.validator.validate(self.session, cached))
+        self.assertTrue(self.validator.is_revoked(validated.token_id))
+
+    async def test_deactivating_user_revokes_tokens(self):
+        """Test deactivating a user revokes their tokens and tells revocation listeners"""
+        from api.auth import crud
+
+        token = await self.issue()
+        validated = await self.validator.validate(self.session, token)
+        closed = []
+
+        async def listener(token_id):
+            closed.append(token_id)
+
+        self.validator.add_revocation_listener(listener)
+        user = await self.session.get(User, 1)
+        with patch("api.auth.crud.mcp_token_validator", self.validator):
+            await crud.update_user(self.session, user, is_active=False)
+
+        self.assertEqual(closed, [validated.token_id])
+        row = (await self.session.execute(select(MCPToken))).scalars().one()
+        self.assertTrue(row.is_revoked)
+        self.assertFalse(await self.validator.is_active(validated))
+        self.assertEqual(await self.validator.revoke_user_tokens(self.session, 1), 0)
+
+    async def test_revoke_requires_owner(self):
+        """Test users cannot revoke each other's tokens"""
+        token = await self.issue()
+        validated = await self.validator.validate(self.session, token)
+
+        self.assertFalse(await self.validator.revoke(self.session, validated.token_id, 2))
+        self.assertIsNotNone(await self.validator.validate(self.session, token))
+
+
+if __name__ == "__main__":
+    unittest.main()
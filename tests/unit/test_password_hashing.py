@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from passlib.context import CryptContext
+
+from api.auth import crud, utils
+
+# Cheap cost factors keep the tests fast; hashes below MIN_ROUNDS are outdated
+MIN_ROUNDS = 5
+FAST_CONTEXT = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=MIN_ROUNDS, bcrypt__min_rounds=MIN_ROUNDS
+)
+OLD_CONTEXT = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4)
+
+
+@patch("api.auth.utils.pwd_context", FAST_CONTEXT)
+class TestPasswordHashing(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for pooled password hashing"""
+
+    async def test_hash_and_verify_in_pool(self):
+        """Test hashes made in the pool verify"""
+        hashed = await utils.hash_password_async("secret")
+
+        verified, new_hash = await utils.verify_and_update_password_async("secret", hashed)
+
+        self.assertTrue(verified)
+        self.assertIsNone(new_hash)
+        self.assertIn(f"${MIN_ROUNDS:02d}$", hashed)
+
+    async def test_wrong_password(self):
+        """Test a wrong password does not verify"""
+        hashed = await utils.hash_password_async("secret")
+
+        verified, _ = await utils.verify_and_update_password_async("wrong", hashed)
+
+        self.assertFalse(verified)
+
+    @patch("api.auth.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_login_upgrades_outdated_hash(self, mock_get_user):
+        """Test a successful login rehashes with the configured cost factor"""
+        user = Mock(hashed_password=OLD_CONTEXT.hash("secret"))
+        mock_get_user.return_value = user
+        db = AsyncMock()
+
+        result = await crud.authenticate_user(db, "user@example.com", "secret")
+
+        self.assertIs(result, user)
+        self.assertIn(f"${MIN_ROUNDS:02d}$", user.hashed_password)
+        db.commit.assert_awaited_once()
+
+    @patch("api.auth.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_failed_login_keeps_hash(self, mock_get_user):
+        """Test a failed login leaves the stored hash alone"""
+        old_hash = OLD_CONTEXT.hash("secret")
+        mock_get_user.return_value = Mock(hashed_password=old_hash)
+        db = AsyncMock()
+
+        result = await crud.authenticate_user(db, "user@example.com", "wrong")
+
+        self.assertIsNone(result)
+        db.commit.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import asyncio
+import contextvars
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from api.progress import PageProgress, ProgressReporter, progress_context, report_progress
+
+
+class TestProgressReporter(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for ProgressReporter and PageProgress"""
+
+    async def asyncSetUp(self):
+        """Collect sent notifications"""
+        self.sent = []
+
+    async def drain(self):
+        """Let queued notifications be delivered"""
+        await asyncio.sleep(0)
+
+    async def test_pages_report_progress_and_partial_results(self):
+        """Test each page reports the items so far and, when asked, the page itself"""
+        reporter = ProgressReporter(self.sent.append, "tok", partial_results=True)
+        progress = PageProgress()
+
+        with progress_context(reporter):
+            progress.page([1, 2])
+            progress.page([3])
+        await self.drain()
+
+        methods = [message["method"] for message in self.sent]
+        self.assertEqual(methods, ["notifications/progress", "notifications/tools/partial_result"] * 2)
+        self.assertEqual(self.sent[2]["params"], {"progressToken": "tok", "progress": 3, "message": "Fetched 2 pages, 3 items"})
+        self.assertEqual(self.sent[3]["params"]["content"][0]["text"], "[3]")
+
+    async def test_progress_only_increases(self):
+        """Test repeated or lower progress values are not sent"""
+        reporter = ProgressReporter(self.sent.append, 1)
+
+        reporter.report(5, total=10)
+        reporter.report(5)
+        reporter.report(4)
+        reporter.partial(["ignored"])
+        await self.drain()
+
+        self.assertEqual([message["params"]["progress"] for message in self.sent], [5])
+        self.assertEqual(self.sent[0]["params"]["total"], 10)
+
+    async def test_report_from_worker_thread(self):
+        """Test handlers running in a thread pool can report progress"""
+        reporter = ProgressReporter(self.sent.append, 1)
+
+        with progress_context(reporter), ThreadPoolExecutor(max_workers=1) as pool:
+            context = contextvars.copy_context()
+            await asyncio.get_running_loop().run_in_executor(pool, context.run, report_progress, 1)
+        await self.drain()
+
+        self.assertEqual(len(self.sent), 1)
+
+    async def test_no_reporter_is_a_no_op(self):
+        """Test reporting outside a call with a progress token does nothing"""
+        progress = PageProgress()
+        progress.page([1])
+        report_progress(1)
+
+        self.assertEqual(progress.items, 1)
@@ -0,0 +1,84 @@
+import unittest
+
+from api.tool_cache import ToolResultCache, canonical_parameters
+
+
+READ_TOOL = {"name": "list_repos", "read_only": True, "cache_ttl": 60}
+WRITE_TOOL = {"name": "create_issue", "read_only": False}
+
+
+class TestToolResultCache(unittest.TestCase):
+    """Unit tests for ToolResultCache"""
+
+    def setUp(self):
+        """Set up an enabled cache"""
+        self.cache = ToolResultCache(max_bytes=1024 * 1024, enabled=True)
+
+    def test_is_cacheable(self):
+        """Test only read-only tools with a TTL are cacheable"""
+        self.assertTrue(self.cache.is_cacheable(READ_TOOL))
+        self.assertFalse(self.cache.is_cacheable(WRITE_TOOL))
+        self.assertFalse(self.cache.is_cacheable({"read_only": True}))
+        self.assertFalse(self.cache.is_cacheable(None))
+
+    def test_canonical_parameters_ignores_key_order(self):
+        """Test equivalent parameters produce the same key"""
+        self.assertEqual(canonical_parameters({"a": 1, "b": 2}), canonical_parameters({"b": 2, "a": 1}))
+        self.assertEqual(canonical_parameters(None), canonical_parameters({}))
+
+    def test_set_and_get(self):
+        """Test a stored result is returned for the same call"""
+        key = self.cache.make_key(1, "github", "cred", "list_repos", {"max_items": 10})
+        self.cache.set(key, {"repositories": []}, ttl=60)
+
+        self.assertEqual(self.cache.get(key), {"repositories": []})
+        other = self.cache.make_key(1, "github", "other-cred", "list_repos", {"max_items": 10})
+        self.assertIsNone(self.cache.get(other))
+
+    def test_error_results_not_cached(self):
+        """Test results reporting an error are not stored"""
+        key = self.cache.make_key(1, "github", "cred", "list_repos", {})
+        self.cache.set(key, {"error": "Bad credentials"}, ttl=60)
+
+        self.assertIsNone(self.cache.get(key))
+
+    def test_expired_entries_are_misses(self):
+        """Test entries past their TTL are not returned"""
+        key = self.cache.make_key(1, "github", "cred", "list_repos", {})
+        self.cache.set(key, {"repositories": []}, ttl=0)
+
+        self.assertIsNone(self.cache.get(key))
+
+    def test_invalidate_by_user_and_app(self):
+        """Test invalidation only drops the given user's app results"""
+        github_key = self.cache.make_key(1, "github", "cred", "list_repos", {})
+        slack_key = self.cache.make_key(1, "slack", "cred", "list_channels", {})
+        other_user_key = self.cache.make_key(2, "github", "cred", "list_repos", {})
+        for key in (github_key, slack_key, other_user_key):
+            self.cache.set(key, {"ok": True}, ttl=60)
+
+        self.assertEqual(self.cache.invalidate(1, "github"), 1)
+        self.assertIsNone(self.cache.get(github_key))
+        self.assertIsNotNone(self.cache.get(slack_key))
+        self.assertIsNotNone(self.cache.get(other_user_key))
+
+    def test_disabled_cache_has_no_keys(self):
+        """Test a disabled cache never builds keys"""
+        cache = ToolResultCache(enabled=False)
+
+        self.assertIsNone(cache.make_key(1, "github", "cred", "list_repos", {}))
+
+    def test_size_budget_evicts(self):
+        """Test results beyond the byte budget evict older entries"""
+        cache = ToolResultCache(max_bytes=64, enabled=True)
+        first = cache.make_key(1, "github", "cred", "get_repo", {"repo": "a"})
+        second = cache.make_key(1, "github", "cred", "get_repo", {"repo": "b"})
+        cache.set(first, {"data": "x" * 30}, ttl=60)
+        cache.set(second, {"data": "y" * 30}, ttl=60)
+
+        self.assertIsNone(cache.get(first))
+        self.assertIsNotNone(cache.get(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import unittest
+
+from api.tool_catalog import ToolCatalog, input_schema
+
+GITHUB_TOOLS = {
+    "github.get_repo": {
+        "name": "github.get_repo",
+        "description": "Get a repository",
+        "read_only": True,
+        "parameters": {
+            "owner": {"type": "string", "description": "Repository owner"},
+            "page_size": {"type": "number", "description": "Page size", "optional": True}
+        }
+    }
+}
+
+SLACK_TOOLS = {
+    "slack.list_channels": {"name": "slack.list_channels", "description": "List channels", "parameters": {}}
+}
+
+
+class TestToolCatalog(unittest.TestCase):
+    """Unit tests for ToolCatalog"""
+
+    def setUp(self):
+        """Compile two apps"""
+        self.catalog = ToolCatalog()
+        self.catalog.compile("github", GITHUB_TOOLS)
+        self.catalog.compile("slack", SLACK_TOOLS)
+
+    def test_tools_list_joins_apps(self):
+        """Test a tools/list payload holds the tools of the given apps only"""
+        payload = self.catalog.tools_list(["github", "slack", "unknown"])
+
+        tools = json.loads(payload.data)["tools"]
+        self.assertEqual([tool["name"] for tool in tools], ["github.get_repo", "slack.list_channels"])
+        self.assertEqual(tools[0]["inputSchema"]["required"], ["owner"])
+        self.assertEqual(json.loads(self.catalog.tools_list([]).data), {"tools": []})
+
+    def test_tools_list_is_cached_by_app_set(self):
+        """Test the same apps share one payload until the registry changes"""
+        first = self.catalog.tools_list(["github"])
+
+        self.assertIs(self.catalog.tools_list(["github"]), first)
+        self.assertNotEqual(self.catalog.tools_list(["github", "slack"]).etag, first.etag)
+
+        self.catalog.compile("github", {**GITHUB_TOOLS, **SLACK_TOOLS})
+        changed = self.catalog.tools_list(["github"])
+        self.assertIsNot(changed, first)
+        self.assertNotEqual(changed.etag, first.etag)
+
+    def test_app_tools(self):
+        """Test the REST tool list of one app is pre-encoded with an ETag"""
+        payload = self.catalog.app_tools("github")
+
+        self.assertEqual(json.loads(payload.data), [{
+            "name": "github.get_repo",
+            "description": "Get a repository",
+            "parameters": GITHUB_TOOLS["github.get_repo"]["parameters"]
+        }])
+        self.assertTrue(payload.etag.startswith('"'))
+        self.assertIsNone(self.catalog.app_tools("unknown"))
+
+        self.catalog.remove("github")
+        self.assertIsNone(self.catalog.app_tools("github"))
+
+
+class TestInputSchema(unittest.TestCase):
+    """Unit tests for input_schema"""
+
+    def test_optional_parameters_are_not_required(self):
+        """Test parameter definitions become a JSON Schema object"""
+        schema = input_schema(GITHUB_TOOLS["github.get_repo"]["parameters"])
+
+        self.assertEqual(schema["type"], "object")
+        self.assertEqual(schema["required"], ["owner"])
+        self.assertNotIn("optional", schema["properties"]["page_size"])
@@ -0,0 +1,113 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.database import Base
+from api.models import App, MCPToken, Tool, User
+from api.apps.github.models import GitHubCredential  # noqa: F401 - registers the mapper
+from api.usage import UsageTracker
+
+
+class TestUsageTracker(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the write-behind usage tracker"""
+
+    async def asyncSetUp(self):
+        """Create an in-memory database with a token, an app and a tool"""
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        async with self.sessions() as db:
+            db.add(User(id=1, email="user@example.com", hashed_password="x"))
+            db.add(MCPToken(id=1, user_id=1, token_hash="a"))
+            db.add(MCPToken(id=2, user_id=1, token_hash="b"))
+            db.add(App(id=1, name="app", owner_id=1))
+            db.add(Tool(id=1, name="tool", app_id=1, parameters={}, action_definition={}))
+            await db.commit()
+
+        self.updates = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: self.updates.append(statement)
+                     if statement.startswith("UPDATE") else None)
+        self.tracker = UsageTracker(session_factory=self.sessions, interval=60)
+
+    async def asyncTearDown(self):
+        """Close the database"""
+        await self.engine.dispose()
+
+    async def column(self, model, column, row_id):
+        """Read a usage timestamp"""
+        async with self.sessions() as db:
+            result = await db.execute(select(getattr(model, column)).filter(model.id == row_id))
+            return result.scalar()
+
+    async def test_touches_coalesce_to_latest(self):
+        """Test repeated touches of a row write only its latest time"""
+        earlier = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        later = earlier + timedelta(minutes=5)
+        self.tracker.touch(MCPToken, 1, later)
+        self.tracker.touch(MCPToken, 1, earlier)
+
+        self.assertEqual(await self.tracker.flush(), 1)
+        stored = await self.column(MCPToken, "last_used_at", 1)
+        self.assertEqual(stored.replace(tzinfo=timezone.utc), later)
+
+    async def test_one_bulk_update_per_model(self):
+        """Test pending rows are written with one UPDATE per model"""
+        self.tracker.touch(MCPToken, 1)
+        self.tracker.touch(MCPToken, 2)
+        self.tracker.touch(Tool, 1)
+        self.tracker.touch(App, 1)
+
+        self.assertEqual(await self.tracker.flush(), 4)
+        self.assertEqual(len(self.updates), 3)
+        self.assertIsNotNone(await self.column(App, "last_accessed_at", 1))
+        self.assertIsNotNone(await self.column(Tool, "last_used_at", 1))
+        self.assertEqual(self.tracker.stats(), {"pending": 0})
+
+    async def test_tool_calls_touch_user_app_and_tool_by_name(self):
+        """Test tool calls update the user's matching app and tool rows only"""
+        async with self.sessions() as db:
+            db.add(User(id=2, email="other@example.com", hashed_password="x"))
+            db.add(App(id=2, name="app", owner_id=2))
+            db.add(Tool(id=2, name="tool", app_id=2, parameters={}, action_definition={}))
+            await db.commit()
+        self.tracker.touch_tool(1, "App", "app.tool")
+        self.tracker.touch_tool(1, "App", "app.tool")
+        self.tracker.touch_tool(1, "app", "app.other")
+
+        self.assertEqual(await self.tracker.flush(), 2)
+        self.assertIsNotNone(await self.column(App, "last_accessed_at", 1))
+        self.assertIsNotNone(await self.column(Tool, "last_used_at", 1))
+        self.assertIsNone(await self.column(App, "last_accessed_at", 2))
+        self.assertIsNone(await self.column(Tool, "last_used_at", 2))
+
+    async def test_stop_flushes_pending(self):
+        """Test pending touches are written on shutdown"""
+        self.tracker.start()
+        self.tracker.touch(MCPToken, 2)
+
+        await self.tracker.stop()
+
+        self.assertIsNotNone(await self.column(MCPToken, "last_used_at", 2))
+
+    async def test_failed_flush_keeps_touches(self):
+        """Test touches survive a failed write"""
+        self.tracker.touch(MCPToken, 1)
+
+        with patch.object(self.tracker, "session_factory", side_effect=Exception("db down")):
+            self.assertEqual(await self.tracker.flush(), 0)
+
+        self.assertEqual(self.tracker.stats(), {"pending": 1})
+
+    def test_unknown_model_rejected(self):
+        """Test touching a model without a usage timestamp fails"""
+        with self.assertRaises(ValueError):
+            self.tracker.touch(User, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
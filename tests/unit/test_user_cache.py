@@ -0,0 +1,175 @@
+import time
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi import HTTPException
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.auth import crud
+from api.auth.user_cache import UserSnapshot, cache_user, check_due, sync_users, user_cache
+from api.database import Base
+from api.models import User
+from api.apps.github.models import GitHubCredential  # noqa: F401 - registers the mapper
+from api.dependencies import get_current_user
+
+
+def make_user(**overrides):
+    """Build a stand-in User row"""
+    fields = {"id": 1, "email": "user@example.com", "is_active": True, "is_admin": False,
+              "created_at": None, "updated_at": None}
+    fields.update(overrides)
+    return Mock(**fields)
+
+
+class TestUserSnapshotCache(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the user snapshot cache in get_current_user"""
+
+    def setUp(self):
+        """Start each test with an empty cache"""
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        # Keep the cross-process staleness check out of these tests
+        patcher = patch("api.auth.user_cache._last_check", time.monotonic())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("api.dependencies.utils.verify_token")
+    @patch("api.dependencies.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_second_request_skips_database(self, mock_get_user, mock_verify):
+        """Test a cached snapshot is returned without a lookup"""
+        mock_verify.return_value = {"sub": "user@example.com", "exp": time.time() + 600}
+        mock_get_user.return_value = make_user()
+
+        first = await get_current_user("token", AsyncMock())
+        second = await get_current_user("token", AsyncMock())
+
+        mock_get_user.assert_called_once()
+        self.assertIsInstance(first, UserSnapshot)
+        self.assertEqual(second, first)
+        self.assertEqual(second.id, 1)
+
+    @patch("api.dependencies.utils.verify_token")
+    @patch("api.dependencies.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_expired_token_not_cached(self, mock_get_user, mock_verify):
+        """Test snapshots never outlive the token's exp"""
+        mock_verify.return_value = {"sub": "user@example.com", "exp": time.time() - 1}
+        mock_get_user.return_value = make_user()
+
+        await get_current_user("token", AsyncMock())
+        await get_current_user("token", AsyncMock())
+
+        self.assertEqual(mock_get_user.call_count, 2)
+
+    @patch("api.dependencies.utils.verify_token")
+    @patch("api.dependencies.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_unknown_user_rejected(self, mock_get_user, mock_verify):
+        """Test a token for a missing user is rejected"""
+        mock_verify.return_value = {"sub": "gone@example.com"}
+        mock_get_user.return_value = None
+
+        with self.assertRaises(HTTPException) as context:
+            await get_current_user("token", AsyncMock())
+        self.assertEqual(context.exception.status_code, 401)
+
+    @patch("api.auth.crud.mcp_token_validator.revoke_user_tokens", new_callable=AsyncMock)
+    @patch("api.dependencies.utils.verify_token")
+    @patch("api.dependencies.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_update_user_invalidates(self, mock_get_user, mock_verify, mock_revoke):
+        """Test deactivating a user takes effect on the next request"""
+        mock_verify.return_value = {"sub": "user@example.com", "exp": time.time() + 600}
+        mock_get_user.return_value = make_user()
+        await get_current_user("token", AsyncMock())
+
+        await crud.update_user(AsyncMock(), make_user(), is_active=False)
+        mock_revoke.assert_awaited_once()
+        mock_get_user.return_value = make_user(is_active=False)
+
+        self.assertFalse((await get_current_user("token", AsyncMock())).is_active)
+        self.assertEqual(mock_get_user.call_count, 2)
+
+    @patch("api.dependencies.utils.verify_token")
+    @patch("api.dependencies.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_cache_hit_checks_for_changes_when_due(self, mock_get_user, mock_verify):
+        """Test a snapshot dropped by the periodic check is reloaded from the database"""
+        mock_verify.return_value = {"sub": "user@example.com", "exp": time.time() + 600}
+        mock_get_user.return_value = make_user()
+        await get_current_user("token", AsyncMock())
+
+        async def deactivated_elsewhere(db):
+            user_cache.pop("user@example.com")
+            return 1
+
+        mock_get_user.return_value = make_user(is_active=False)
+        with patch("api.dependencies.user_cache.check_due", return_value=True), \
+                patch("api.dependencies.user_cache.sync_users", side_effect=deactivated_elsewhere) as mock_sync:
+            user = await get_current_user("token", AsyncMock())
+
+        mock_sync.assert_awaited_once()
+        self.assertFalse(user.is_active)
+
+    @patch("api.auth.crud.mcp_token_validator.revoke_user_tokens", new_callable=AsyncMock)
+    @patch("api.dependencies.utils.verify_token")
+    @patch("api.dependencies.crud.get_user_by_email", new_callable=AsyncMock)
+    async def test_delete_user_invalidates(self, mock_get_user, mock_verify, mock_revoke):
+        """Test a deleted user is rejected on the next request"""
+        mock_verify.return_value = {"sub": "user@example.com", "exp": time.time() + 600}
+        mock_get_user.return_value = make_user()
+        await get_current_user("token", AsyncMock())
+
+        await crud.delete_user(AsyncMock(), make_user())
+        mock_revoke.assert_awaited_once()
+        mock_get_user.return_value = None
+
+        with self.assertRaises(HTTPException):
+            await get_current_user("token", AsyncMock())
+
+
+
+class TestSyncUsers(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for picking up user changes made by other processes"""
+
+    async def asyncSetUp(self):
+        """Create an in-memory database with two cached users"""
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)()
+        users = [
+            User(id=1, email="a@example.com", hashed_password="x", is_active=True, is_admin=True),
+            User(id=2, email="b@example.com", hashed_password="x", is_active=True, is_admin=False),
+            User(id=3, email="c@example.com", hashed_password="x", is_active=True, is_admin=False),
+        ]
+        self.session.add_all(users)
+        await self.session.commit()
+        for user in users:
+            cache_user(user.email, user)
+
+    async def asyncTearDown(self):
+        """Close the database"""
+        await self.session.close()
+        await self.engine.dispose()
+
+    async def test_changed_and_deleted_users_dropped(self):
+        """Test deactivated, demoted and deleted users are dropped; unchanged ones stay cached"""
+        await self.session.execute(update(User).where(User.id == 1).values(is_admin=False))
+        await self.session.execute(update(User).where(User.id == 2).values(is_active=False))
+        await self.session.delete(await self.session.get(User, 3))
+        await self.session.commit()
+        cache_user("d@example.com", User(id=4, email="d@example.com", is_active=True, is_admin=False))
+
+        self.assertEqual(await sync_users(self.session), 4)
+        self.assertEqual(len(user_cache), 0)
+        self.assertFalse(check_due())
+
+    async def test_unchanged_users_kept(self):
+        """Test snapshots matching their rows survive the check"""
+        self.assertEqual(await sync_users(self.session), 0)
+        self.assertEqual(len(user_cache), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()